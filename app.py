@@ -1,48 +1,43 @@
-import json
 import os
 import secrets
+import time
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import plotly.utils
 from flask import Flask, render_template, request, session, abort, jsonify, redirect, url_for
 from werkzeug.exceptions import RequestEntityTooLarge
-from flask_caching import Cache
 
 from tseapy.core.analysis_backends import AnalysisBackend
+from tseapy.core.backend_registry import build_tasks_registry
+from tseapy.core.downsampling import downsample_figure, downsample_series, points_for_width
+from tseapy.core.jobs import JobManager, JOB_DONE
+from tseapy.core.result_cache import ResultCache
+from tseapy.core.serialization import compress_response, dumps, encode_values, figure_to_json
 from tseapy.core.tasks import Task, TasksList
+from tseapy.core.warmup import WarmupManager
+from tseapy.data.chunked import ChunkOffsetError, ChunkedUploadStore
+from tseapy.data.datetimes import parse_datetimes
 from tseapy.data.examples import get_air_quality_uci
-from tseapy.data.upload import CSVUploadError, parse_csv_upload
-from tseapy.tasks.change_in_mean import ChangeInMean
-from tseapy.tasks.change_in_mean.pelt_l2 import PeltL2
-from tseapy.tasks.change_in_mean.sliding_window_l2 import SlidingWindowL2
-from tseapy.tasks.pattern_recognition import PatternRecognition
-from tseapy.tasks.pattern_recognition.mass import Mass
-from tseapy.tasks.motif_detection import MotifDetection
-from tseapy.tasks.motif_detection.matrixprofile import Matrixprofile
-from tseapy.tasks.motif_detection.pan_matrixprofile import PanMatrixprofile
-from tseapy.tasks.smoothing import Smoothing
-from tseapy.tasks.smoothing.moving_average import MovingAverage
-from tseapy.tasks.forecasting import Forecasting
-from tseapy.tasks.forecasting.auto_arima import AutoArimaBackend
-from tseapy.tasks.forecasting.auto_ets import AutoEtsBackend
-from tseapy.tasks.forecasting.auto_theta import AutoThetaBackend
-from tseapy.tasks.forecasting.naive import NaiveBackend
-from tseapy.tasks.forecasting.seasonal_naive import SeasonalNaiveBackend
-from tseapy.tasks.forecasting.historic_average import HistoricAverageBackend
-from tseapy.tasks.forecasting.lightgbm_mlforecast import LightGBMMLForecastBackend
-from tseapy.tasks.forecasting.xgboost_mlforecast import XGBoostMLForecastBackend
-from tseapy.tasks.forecasting.comparison import ForecastComparisonBackend
-from tseapy.tasks.decomposition import Decomposition
-from tseapy.tasks.decomposition.stl import STLBackend
-from tseapy.tasks.decomposition.classical import ClassicalDecompositionBackend
-from tseapy.tasks.frequency_analysis import FrequencyAnalysis
-from tseapy.tasks.frequency_analysis.welch import WelchBackend
-from tseapy.tasks.frequency_analysis.lomb_scargle import LombScargleBackend
-from tseapy.tasks.frequency_analysis.stft import STFTBackend
+from tseapy.data.profile import DatasetProfile, profile_frame
+from tseapy.data.pyramid import Pyramid, build_pyramids
+from tseapy.data.registry import DatasetEntry, DatasetRegistry
+from tseapy.data.workspace import workspace_config
+from tseapy.data.upload import (
+    UPLOAD_FORMATS,
+    UploadError,
+    content_digest,
+    parse_upload,
+    parse_upload_file,
+    upload_format,
+)
 from tseapy.core.parameters import NumberParameter, BooleanParameter, ListParameter, RangeParameter
 
-cache = Cache()
+datasets = DatasetRegistry()
+result_cache = ResultCache()
+jobs = JobManager()
+chunked_uploads = ChunkedUploadStore()
+warmup = WarmupManager()
 tasks = TasksList()
 
 
@@ -53,52 +48,6 @@ def _env_bool(name: str, default: bool = False) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "on"}
 
 
-def _build_tasks_registry() -> TasksList:
-    pattern_recognition = PatternRecognition()
-    pattern_recognition.add_analysis_backend(Mass())
-
-    change_in_mean = ChangeInMean()
-    change_in_mean.add_analysis_backend(PeltL2())
-    change_in_mean.add_analysis_backend(SlidingWindowL2())
-
-    smoothing = Smoothing()
-    smoothing.add_analysis_backend(MovingAverage())
-
-    motif_detection = MotifDetection()
-    motif_detection.add_analysis_backend(Matrixprofile())
-    motif_detection.add_analysis_backend(PanMatrixprofile())
-
-    forecasting = Forecasting()
-    forecasting.add_analysis_backend(AutoArimaBackend())
-    forecasting.add_analysis_backend(AutoEtsBackend())
-    forecasting.add_analysis_backend(AutoThetaBackend())
-    forecasting.add_analysis_backend(NaiveBackend())
-    forecasting.add_analysis_backend(SeasonalNaiveBackend())
-    forecasting.add_analysis_backend(HistoricAverageBackend())
-    forecasting.add_analysis_backend(LightGBMMLForecastBackend())
-    forecasting.add_analysis_backend(XGBoostMLForecastBackend())
-    forecasting.add_analysis_backend(ForecastComparisonBackend())
-
-    decomposition = Decomposition()
-    decomposition.add_analysis_backend(STLBackend())
-    decomposition.add_analysis_backend(ClassicalDecompositionBackend())
-
-    frequency_analysis = FrequencyAnalysis()
-    frequency_analysis.add_analysis_backend(WelchBackend())
-    frequency_analysis.add_analysis_backend(LombScargleBackend())
-    frequency_analysis.add_analysis_backend(STFTBackend())
-
-    tasks_registry = TasksList()
-    tasks_registry.add_task(pattern_recognition)
-    tasks_registry.add_task(change_in_mean)
-    tasks_registry.add_task(motif_detection)
-    tasks_registry.add_task(smoothing)
-    tasks_registry.add_task(forecasting)
-    tasks_registry.add_task(decomposition)
-    tasks_registry.add_task(frequency_analysis)
-    return tasks_registry
-
-
 def create_app(config: dict | None = None) -> Flask:
     package_root = Path(__file__).resolve().parent / "tseapy"
     flask_app = Flask(
@@ -108,64 +57,98 @@ def create_app(config: dict | None = None) -> Flask:
     )
 
     max_upload_mb = int(os.getenv("TSEAPY_MAX_UPLOAD_MB", "10"))
+    workspace_dir = os.getenv("TSEAPY_WORKSPACE_DIR") or None
+    workspace = workspace_config(workspace_dir) if workspace_dir else {}
     flask_app.config.from_mapping(
-        SECRET_KEY=os.getenv("TSEAPY_SECRET_KEY", secrets.token_hex()),
+        SECRET_KEY=os.getenv("TSEAPY_SECRET_KEY") or workspace.get("SECRET_KEY") or secrets.token_hex(),
         DEBUG=_env_bool("TSEAPY_DEBUG", False),
         MAX_CONTENT_LENGTH=max_upload_mb * 1024 * 1024,
-        CACHE_TYPE=os.getenv("TSEAPY_CACHE_TYPE", "SimpleCache"),
-        CACHE_DEFAULT_TIMEOUT=int(os.getenv("TSEAPY_CACHE_DEFAULT_TIMEOUT", "3600")),
+        MAX_DECOMPRESSED_MB=int(os.getenv("TSEAPY_MAX_DECOMPRESSED_MB", str(10 * max_upload_mb))),
+        CHUNKED_UPLOAD_MAX_MB=int(os.getenv("TSEAPY_CHUNKED_UPLOAD_MAX_MB", "4096")),
+        CHUNKED_UPLOAD_DIR=os.getenv("TSEAPY_CHUNKED_UPLOAD_DIR") or workspace.get("CHUNKED_UPLOAD_DIR"),
+        UPLOAD_CHUNK_MB=int(os.getenv("TSEAPY_UPLOAD_CHUNK_MB", "8")),
+        CSV_ENGINE=os.getenv("TSEAPY_CSV_ENGINE", "auto"),
+        MAX_PLOT_POINTS=int(os.getenv("TSEAPY_MAX_PLOT_POINTS", "4000")),
+        COMPRESS_RESPONSES=_env_bool("TSEAPY_COMPRESS", True),
+        DATASET_TTL=int(os.getenv("TSEAPY_CACHE_DEFAULT_TIMEOUT", "3600")),
+        DATASET_MEMORY_MB=int(os.getenv("TSEAPY_DATASET_MEMORY_MB", "1024")),
+        DATASET_SPILL_DIR=os.getenv("TSEAPY_DATASET_SPILL_DIR") or None,
+        DATASET_COMPRESSION=os.getenv("TSEAPY_DATASET_COMPRESSION", "off"),
+        WORKSPACE_DIR=workspace_dir,
+        DATASET_STORE_DIR=os.getenv("TSEAPY_DATASET_STORE_DIR") or workspace.get("DATASET_STORE_DIR"),
+        JOB_WORKERS=int(os.getenv("TSEAPY_JOB_WORKERS", "2")),
+        JOB_EXECUTOR=os.getenv("TSEAPY_JOB_EXECUTOR", "process"),
+        JOB_TIMEOUT=float(os.getenv("TSEAPY_JOB_TIMEOUT", "900")),
+        JOB_PRELOAD=os.getenv("TSEAPY_JOB_PRELOAD", "stumpy,statsforecast,statsmodels.tsa.seasonal,ruptures"),
+        RESULT_CACHE_MAX_MB=int(os.getenv("TSEAPY_RESULT_CACHE_MB", "128")),
+        RESULT_CACHE_DIR=os.getenv("TSEAPY_RESULT_CACHE_DIR") or workspace.get("RESULT_CACHE_DIR"),
+        RESULT_CACHE_DISK_MAX_MB=int(os.getenv("TSEAPY_RESULT_CACHE_DISK_MB", "1024")),
+        WARMUP=_env_bool("TSEAPY_WARMUP", False),
+        JIT_CACHE_DIR=os.getenv("TSEAPY_JIT_CACHE_DIR") or workspace.get("JIT_CACHE_DIR"),
     )
     if config:
         flask_app.config.update(config)
 
-    cache.init_app(flask_app)
+    datasets.init_app(flask_app)
+    result_cache.init_app(flask_app)
+    chunked_uploads.init_app(flask_app)
+    jobs.init_app(flask_app, registry_factory=build_tasks_registry)
+    warmup.init_app(flask_app, jobs)
     global tasks
-    tasks = _build_tasks_registry()
+    tasks = build_tasks_registry()
     return flask_app
 
-ALLOWED_EXTENSIONS = {"csv"}
+ALLOWED_EXTENSIONS = tuple(UPLOAD_FORMATS)
+#: Dataset id of the built-in demo data, shared by every session that selects it.
+DEMO_DATASET_ID = "demo-air-quality-uci"
+#: Workspace that holds preloaded datasets while they are stored.
+PRELOAD_WORKSPACE_ID = "preload"
 UPLOAD_STEPS = ("upload", "preview", "configure", "analysis")
 app = create_app()
 
 
 def allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
-
-
-def infer_column_type(series: pd.Series) -> str:
-    if pd.api.types.is_numeric_dtype(series):
-        return "numeric"
-    if pd.api.types.is_datetime64_any_dtype(series):
-        return "date"
-    sample = series.dropna().head(50)
-    if sample.empty:
-        return "text"
-    parsed = pd.to_datetime(sample, errors="coerce", format="mixed")
-    if parsed.notna().mean() >= 0.8:
-        return "date"
-    return "text"
-
-
-def build_preview_context(dataframe: pd.DataFrame, message: str = "") -> dict:
-    column_types = {column: infer_column_type(dataframe[column]) for column in dataframe.columns}
-    numeric_columns = [column for column, kind in column_types.items() if kind == "numeric"]
-    date_columns = [column for column, kind in column_types.items() if kind == "date"]
+    return upload_format(filename) is not None
+
+
+def load_demo_frame() -> pd.DataFrame:
+    return get_air_quality_uci().reset_index()
+
+
+def preload_demo_dataset() -> DatasetEntry:
+    """
+    Parse and profile the demo dataset ahead of the first request that selects it.
+
+    The entry is left unreferenced in the registry, where it stays cached until idle
+    for the dataset TTL; a server that preloads before forking shares it with every worker.
+    """
+    datasets.put_shared(PRELOAD_WORKSPACE_ID, 'raw', DEMO_DATASET_ID, load_demo_frame)
+    entry, frame = datasets.resolve(PRELOAD_WORKSPACE_ID, 'raw')
+    get_profile(entry, frame)
+    datasets.discard(PRELOAD_WORKSPACE_ID, 'raw')
+    return entry
+
+
+def get_profile(entry: DatasetEntry, frame: pd.DataFrame) -> DatasetProfile:
+    """Return the column profile of a raw dataset (``frame``, from :meth:`DatasetRegistry.resolve`), computed once."""
+    return datasets.artifact(entry, 'profile', lambda: profile_frame(frame))
+
+
+def build_preview_context(entry: DatasetEntry, frame: pd.DataFrame, message: str = "") -> dict:
+    profile = get_profile(entry, frame)
     date_summary = "Not available"
-    if date_columns:
-        parsed = pd.to_datetime(dataframe[date_columns[0]], errors="coerce", format="mixed")
-        parsed = parsed.dropna()
-        if not parsed.empty:
-            date_summary = f"{parsed.min().strftime('%Y-%m-%d')} to {parsed.max().strftime('%Y-%m-%d')}"
+    if profile.date_range is not None:
+        first, last = profile.date_range
+        date_summary = f"{first.strftime('%Y-%m-%d')} to {last.strftime('%Y-%m-%d')}"
+    head = frame.head(10)
     return {
-        "preview_table": dataframe.head(10).to_html(
-            classes="table table-striped table-sm table-bordered align-middle mb-0",
-            index=False,
-            border=0
-        ),
-        "columns": dataframe.columns.tolist(),
-        "column_types": column_types,
-        "numeric_columns": numeric_columns,
-        "row_count": len(dataframe),
+        "preview_columns": head.columns.tolist(),
+        "preview_rows": head.itertuples(index=False, name=None),
+        "profile": profile,
+        "columns": frame.columns.tolist(),
+        "column_types": profile.kinds(),
+        "numeric_columns": profile.names("numeric"),
+        "row_count": profile.row_count,
         "date_summary": date_summary,
         "message": message,
         "steps": UPLOAD_STEPS,
@@ -173,12 +156,57 @@ def build_preview_context(dataframe: pd.DataFrame, message: str = "") -> dict:
     }
 
 
-def get_data_or_abort() -> pd.DataFrame:
-    """Retrieve cached data or abort with HTTP 400."""
-    data = cache.get('data')
-    if data is None:
+def build_configured_frame(dataframe: pd.DataFrame, parsed_index, value_columns: list) -> pd.DataFrame:
+    """
+    Return the selected value columns as float64 columns on one sorted datetime index.
+
+    Rows without a timestamp, or without a value in any selected column, are dropped;
+    other gaps stay as NaN and backends skip them in the column they analyse. Each column is stored as one contiguous array so switching the displayed feature
+    needs no further conversion.
+    """
+    index = pd.DatetimeIndex(parsed_index)
+    values = {
+        column: pd.to_numeric(dataframe[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        for column in value_columns
+    }
+    keep = np.asarray(index.notna())
+    keep &= ~np.logical_and.reduce([np.isnan(column_values) for column_values in values.values()])
+    rows = np.flatnonzero(keep)
+    rows = rows[np.argsort(index.asi8[rows], kind="stable")]
+    return pd.DataFrame(
+        {column: np.ascontiguousarray(column_values[rows]) for column, column_values in values.items()},
+        index=index[rows],
+    )
+
+
+def get_workspace_id() -> str:
+    workspace_id = session.get('workspace_id')
+    if workspace_id is None:
+        workspace_id = DatasetRegistry.new_workspace_id()
+        session['workspace_id'] = workspace_id
+    return workspace_id
+
+
+def get_raw_dataset() -> tuple:
+    """Return the session's raw dataset as ``(entry, frame)``, or ``(None, None)``."""
+    return datasets.resolve(get_workspace_id(), 'raw')
+
+
+def get_dataset_or_abort() -> tuple:
+    """
+    Retrieve the session's active dataset as ``(entry, frame)`` or abort with HTTP 400.
+
+    Handlers use the returned frame throughout: ``entry.frame`` is cleared when
+    another session's upload evicts the entry.
+    """
+    entry, frame = datasets.resolve(get_workspace_id(), 'active')
+    if entry is None:
         abort(400, description='No dataset loaded. Please load data first.')
-    return data
+    return entry, frame
+
+
+def get_data_or_abort() -> pd.DataFrame:
+    return get_dataset_or_abort()[1]
 
 
 def get_task_or_abort(task_name: str) -> Task:
@@ -195,29 +223,40 @@ def get_backend_or_abort(task_obj: Task, algo_name: str) -> AnalysisBackend:
         abort(404, description=str(exc))
 
 
-def get_feature_to_display():
-    data = get_data_or_abort()
+def get_feature_to_display(data: pd.DataFrame | None = None):
+    if data is None:
+        data = get_data_or_abort()
     return session.get('feature_to_display', data.columns[0])
 
 
+def get_max_plot_points():
+    """Return how many points to send for the chart width given by the ``plot_width`` query parameter."""
+    return points_for_width(request.args.get('plot_width'), app.config.get('MAX_PLOT_POINTS', 0))
+
+
 def render_algo_template(t: Task, a: AnalysisBackend):
     """
     Utility function to render a specific algorithm template
     """
     data: pd.DataFrame = get_data_or_abort()
-    data_view = t.get_visualization_view(data=data, feature_to_display=get_feature_to_display())
+    data_view = t.get_visualization_view(
+        data=data,
+        feature_to_display=get_feature_to_display(data),
+        max_points=app.config.get('MAX_PLOT_POINTS'),
+    )
     interaction_script = t.get_interaction_script(algo=a.name)
     interaction_view = t.get_interaction_view(algo=a.name)
     parameter_script = t.get_parameter_script(
         algo=a.name,
         analysis_url=url_for("perform_analysis", task=t.name, algo=a.name),
         extra_query_params=a.required_query_params,
+        jobs_url=url_for("submit_analysis_job", task=t.name, algo=a.name) if jobs.enabled else None,
     )
     html = render_template(
         'algo.html',
         task=t.name,
         algo=a.name,
-        graphJSON=json.dumps(data_view, cls=plotly.utils.PlotlyJSONEncoder),
+        graphJSON=figure_to_json(data_view),
         features=data.columns.tolist(),
         interactionScript=interaction_script,
         interactionView=interaction_view,
@@ -227,15 +266,32 @@ def render_algo_template(t: Task, a: AnalysisBackend):
     return html
 
 
+@app.after_request
+def compress_json_responses(response):
+    if app.config.get('COMPRESS_RESPONSES'):
+        return compress_response(response, request.headers.get('Accept-Encoding', ''))
+    return response
+
+
 @app.route('/healthz')
 def healthz():
     return jsonify({"status": "ok"}), 200
 
 
+@app.route('/readyz')
+def readyz():
+    # A server process forked after startup (e.g. a preloading worker) warms up on its first probe.
+    warmup.start(tasks)
+    status = warmup.to_dict()
+    if not warmup.ready:
+        return jsonify({"status": "warming", "warmup": status}), 503
+    return jsonify({"status": "ready", "warmup": status}), 200
+
+
 # create index page function
 @app.route('/')
 def index():
-    if cache.get("data") is None:
+    if datasets.get(get_workspace_id(), 'active') is None:
         return redirect(url_for("upload"))
 
     upload_notice = session.pop("upload_notice", None)
@@ -257,21 +313,23 @@ def upload():
             error=error,
             message=message,
             max_upload_mb=app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024),
+            accepted_extensions=",".join(ALLOWED_EXTENSIONS),
+            chunked_upload_url=url_for("create_chunked_upload") if chunked_uploads.enabled else None,
             steps=UPLOAD_STEPS,
             current_step="upload"
         )
 
     if request.form.get("use_demo_dataset"):
-        demo_data = get_air_quality_uci().reset_index()
-        cache.set("raw_data", demo_data)
+        datasets.put_shared(get_workspace_id(), 'raw', DEMO_DATASET_ID, load_demo_frame)
         return redirect(url_for("upload_preview"))
 
     uploaded_file = request.files.get("file")
     if uploaded_file is None or uploaded_file.filename is None or uploaded_file.filename == "":
         return render_template(
             "upload.html",
-            error="Please choose a CSV file first.",
+            error="Please choose a file first.",
             max_upload_mb=app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024),
+            accepted_extensions=",".join(ALLOWED_EXTENSIONS),
             steps=UPLOAD_STEPS,
             current_step="upload"
         ), 400
@@ -279,78 +337,178 @@ def upload():
     if not allowed_file(uploaded_file.filename):
         return render_template(
             "upload.html",
-            error="Invalid file type. Please upload a .csv file.",
+            error=f"Invalid file type. Please upload a {', '.join(ALLOWED_EXTENSIONS)} file.",
             max_upload_mb=app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024),
+            accepted_extensions=",".join(ALLOWED_EXTENSIONS),
             steps=UPLOAD_STEPS,
             current_step="upload"
         ), 400
 
     try:
-        dataframe = parse_csv_upload(uploaded_file)
-    except CSVUploadError as exc:
+        # Identical bytes map to the same dataset, so a re-upload reuses the parsed, profiled frame.
+        datasets.put_shared(
+            get_workspace_id(),
+            'raw',
+            content_digest(uploaded_file.stream),
+            lambda: parse_upload(
+                uploaded_file,
+                engine=app.config.get("CSV_ENGINE", "auto"),
+                max_decompressed_bytes=app.config["MAX_DECOMPRESSED_MB"] * 1024 * 1024,
+            ),
+        )
+    except UploadError as exc:
         return render_template(
             "upload.html",
             error=str(exc),
             max_upload_mb=app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024),
+            accepted_extensions=",".join(ALLOWED_EXTENSIONS),
             steps=UPLOAD_STEPS,
             current_step="upload"
         ), 400
 
-    cache.set("raw_data", dataframe)
     return redirect(url_for("upload_preview"))
 
 
+def _chunked_upload_response(upload, status_code=200):
+    body = upload.to_dict()
+    body['chunk_size'] = chunked_uploads.chunk_bytes
+    body['upload_url'] = url_for('chunked_upload', upload_id=upload.upload_id)
+    body['complete_url'] = url_for('complete_chunked_upload', upload_id=upload.upload_id)
+    return jsonify(body), status_code
+
+
+def get_chunked_upload_or_abort(upload_id: str):
+    upload = chunked_uploads.get(upload_id, owner=get_workspace_id())
+    if upload is None:
+        abort(404, description=f'Upload "{upload_id}" is unknown or has expired')
+    return upload
+
+
+@app.route('/upload/chunked', methods=['POST'])
+def create_chunked_upload():
+    """Announce a file that will be sent in chunks; returns the upload id and chunk size."""
+    if not chunked_uploads.enabled:
+        abort(404, description='Chunked uploads are disabled on this server.')
+    payload = request.get_json(silent=True) or request.form
+    try:
+        size = int(payload.get('size', 0))
+        upload = chunked_uploads.create(get_workspace_id(), str(payload.get('filename', '')), size)
+    except (TypeError, ValueError) as exc:
+        abort(400, description=str(exc))
+    return _chunked_upload_response(upload, 201)
+
+
+@app.route('/upload/chunked/<upload_id>', methods=['GET'])
+def chunked_upload(upload_id):
+    return _chunked_upload_response(get_chunked_upload_or_abort(upload_id))
+
+
+@app.route('/upload/chunked/<upload_id>', methods=['PUT'])
+def append_chunked_upload(upload_id):
+    """Store one chunk sent as the raw request body at the ``offset`` query parameter."""
+    upload = get_chunked_upload_or_abort(upload_id)
+    try:
+        offset = int(request.args.get('offset', ''))
+    except ValueError:
+        abort(400, description='Parameter "offset" must be an integer')
+    try:
+        chunked_uploads.append(upload, offset, request.stream, length=request.content_length)
+    except ChunkOffsetError as exc:
+        return jsonify({'error': str(exc), 'received': exc.received}), 409
+    except UploadError as exc:
+        abort(400, description=str(exc))
+    return _chunked_upload_response(upload)
+
+
+@app.route('/upload/chunked/<upload_id>', methods=['DELETE'])
+def discard_chunked_upload(upload_id):
+    chunked_uploads.discard(get_chunked_upload_or_abort(upload_id))
+    return '', 204
+
+
+@app.route('/upload/chunked/<upload_id>/complete', methods=['POST'])
+def complete_chunked_upload(upload_id):
+    """Parse a fully received upload from its spool file and continue with the preview step."""
+    upload = get_chunked_upload_or_abort(upload_id)
+    if not upload.complete:
+        return jsonify({'error': 'Upload is not complete yet.', 'received': upload.received}), 409
+    try:
+        datasets.put_shared(
+            get_workspace_id(),
+            'raw',
+            content_digest(upload.path),
+            lambda: parse_upload_file(
+                upload.path,
+                upload.filename,
+                engine=app.config.get("CSV_ENGINE", "auto"),
+                # Decompression goes to disk here, so the larger chunked-upload limit applies.
+                max_decompressed_bytes=max(app.config["MAX_DECOMPRESSED_MB"] * 1024 * 1024, chunked_uploads.max_bytes),
+            ),
+        )
+    except UploadError as exc:
+        abort(400, description=str(exc))
+    finally:
+        chunked_uploads.discard(upload)
+    return jsonify({'redirect_url': url_for('upload_preview')}), 200
+
+
 @app.route('/upload/preview', methods=['GET'])
 def upload_preview():
-    dataframe = cache.get("raw_data")
-    if dataframe is None:
+    entry, frame = get_raw_dataset()
+    if entry is None:
         return redirect(url_for("upload", error="Session expired. Upload a CSV file again."))
 
-    return render_template("upload_preview.html", **build_preview_context(dataframe))
+    return render_template("upload_preview.html", **build_preview_context(entry, frame))
 
 
 @app.route('/upload/configure', methods=['POST'])
 def upload_configure():
-    dataframe = cache.get("raw_data")
-    if dataframe is None:
+    raw, dataframe = get_raw_dataset()
+    if raw is None:
         return redirect(url_for("upload", error="Session expired. Upload a CSV file again."))
 
     time_column = request.form.get("time_column", "").strip()
-    value_column = request.form.get("value_column", "").strip()
+    # ``value_column`` is the single-select field of earlier versions of the form.
+    value_columns = request.form.getlist("value_columns") or request.form.getlist("value_column")
+    value_columns = list(dict.fromkeys(column.strip() for column in value_columns if column.strip()))
     confirmation = request.form.get("confirm_selection")
 
-    if time_column not in dataframe.columns or value_column not in dataframe.columns:
-        context = build_preview_context(dataframe, message="Please choose valid columns from the dropdown lists.")
+    if (time_column not in dataframe.columns or not value_columns
+            or any(column not in dataframe.columns for column in value_columns)):
+        context = build_preview_context(raw, dataframe, message="Please choose valid columns from the dropdown lists.")
         return render_template("upload_preview.html", error="Selected columns are invalid.", **context), 400
 
     if confirmation != "on":
-        context = build_preview_context(dataframe, message="Confirm your selections before proceeding.")
+        context = build_preview_context(raw, dataframe, message="Confirm your selections before proceeding.")
         return render_template("upload_preview.html", error="Please confirm your selections.", **context), 400
 
-    parsed_index = pd.to_datetime(dataframe[time_column], errors="coerce", format="mixed")
+    # The profile remembers the format inferred for date columns during the preview.
+    parsed_index = parse_datetimes(dataframe[time_column], get_profile(raw, dataframe).columns[time_column].datetime_format)
     if parsed_index.notna().sum() == 0:
-        context = build_preview_context(dataframe, message="The selected time column cannot be parsed as datetime.")
+        context = build_preview_context(raw, dataframe, message="The selected time column cannot be parsed as datetime.")
         return render_template("upload_preview.html", error="Invalid datetime column.", **context), 400
 
-    parsed_value = pd.to_numeric(dataframe[value_column], errors="coerce")
-    configured = pd.DataFrame({value_column: parsed_value.to_numpy()}, index=parsed_index)
-    total_rows = len(configured)
-    configured = configured.dropna(axis=0, how="any").sort_index()
-    removed_rows = total_rows - len(configured)
+    configured = build_configured_frame(dataframe, parsed_index, value_columns)
+    removed_rows = len(dataframe) - len(configured)
     if configured.empty:
         context = build_preview_context(
+            raw,
             dataframe,
             message="No valid rows remained after parsing datetime and numeric values."
         )
         return render_template("upload_preview.html", error="Configuration produced an empty dataset.", **context), 400
 
-    cache.set("data", configured)
-    cache.delete("raw_data")
-    session["feature_to_display"] = value_column
+    entry = datasets.put(get_workspace_id(), 'active', configured)
+    datasets.set_artifact(entry, 'pyramids', build_pyramids(configured))
+    datasets.discard(get_workspace_id(), 'raw')
+    session["feature_to_display"] = value_columns[0]
+    missing_values = int(configured.isna().sum().sum())
+    notices = []
     if removed_rows > 0:
-        session["upload_notice"] = f"{removed_rows} rows were removed due to missing values."
-    else:
-        session["upload_notice"] = "Dataset loaded successfully."
+        notices.append(f"{removed_rows} rows were removed due to missing values.")
+    if missing_values > 0:
+        notices.append(f"{missing_values} missing values remain in individual columns and are skipped by analyses.")
+    session["upload_notice"] = " ".join(notices) or "Dataset loaded successfully."
 
     return redirect(url_for("index"))
 
@@ -379,27 +537,66 @@ def display_algo(task, algo):
 
 
 def _expected_params(backend: AnalysisBackend):
-    params = [p.name for p in backend.parameters]
+    params = [p.name for p in backend.parameters if p.required]
     for name in backend.required_query_params:
         if name not in params:
             params.append(name)
     return params
 
 
-@app.route('/<task>/<algo>/compute', methods=['GET'])
-def perform_analysis(task, algo):
+def _prepare_analysis(task, algo, reserved=()):
+    """Validate a compute request and return everything needed to run or look it up."""
     t: Task = get_task_or_abort(task)
     backend = get_backend_or_abort(t, algo)
-    data = get_data_or_abort()
+    dataset, data = get_dataset_or_abort()
     expected = _expected_params(backend)
     missing = [p for p in expected if p not in request.args]
     if missing:
         abort(400, description=f"Missing query parameter(s): {', '.join(missing)}")
-    feature = request.args.get('feature', get_feature_to_display())
+    feature = request.args.get('feature', get_feature_to_display(data))
     if feature not in data.columns:
         abort(400, description='Unknown feature column')
     analysis_kwargs = dict(request.args)
     analysis_kwargs.pop("feature", None)
+    for name in ('plot_width',) + tuple(reserved):
+        analysis_kwargs.pop(name, None)
+    max_points = get_max_plot_points()
+
+    cache_key = None
+    if result_cache.enabled:
+        cache_key = result_cache.make_key(
+            dataset.fingerprint_of(data), t.name, backend.name, feature, dict(analysis_kwargs, plot_points=max_points)
+        )
+    return t, backend, dataset, data, feature, analysis_kwargs, max_points, cache_key
+
+
+def _cache_result(cache_key):
+    def store(payload, cost):
+        if cache_key is not None:
+            result_cache.set(cache_key, payload, cost=cost)
+    return store
+
+
+def _json_response(payload: str, cache_status: str | None = None):
+    response = app.response_class(
+        response=payload,
+        status=200,
+        mimetype='application/json'
+    )
+    if cache_status is not None:
+        response.headers['X-Tseapy-Cache'] = cache_status
+    return response
+
+
+@app.route('/<task>/<algo>/compute', methods=['GET'])
+def perform_analysis(task, algo):
+    t, backend, dataset, data, feature, analysis_kwargs, max_points, cache_key = _prepare_analysis(task, algo)
+    if cache_key is not None:
+        payload = result_cache.get(cache_key)
+        if payload is not None:
+            return _json_response(payload, cache_status='hit')
+
+    started = time.perf_counter()
     try:
         fig = t.get_analysis_results(data=data, feature=feature, algo=algo, **analysis_kwargs)
     except ValueError as exc:
@@ -407,12 +604,124 @@ def perform_analysis(task, algo):
     except (TypeError, IndexError, RuntimeError) as exc:
         abort(400, description=f"Algorithm input error: {exc}")
 
-    response = app.response_class(
-        response=json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder),
-        status=200,
-        mimetype='application/json'
+    downsample_figure(fig, max_points)
+    payload = figure_to_json(fig)
+    _cache_result(cache_key)(payload, time.perf_counter() - started)
+    return _json_response(payload, cache_status='miss')
+
+
+@app.route('/<task>/<algo>/batch', methods=['POST'])
+def perform_batch_analysis(task, algo):
+    """
+    Run one analysis per query for a JSON body ``{"queries": [...], "feature": ..., <parameters>}``.
+
+    The backend parameters travel in the body next to the queries; per-query
+    parameters (e.g. a pattern's ``start`` and ``end``) belong in each query.
+    """
+    t: Task = get_task_or_abort(task)
+    backend = get_backend_or_abort(t, algo)
+    dataset, data = get_dataset_or_abort()
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not isinstance(body.get('queries'), list):
+        abort(400, description='Expected a JSON object with a "queries" list')
+    missing = [p.name for p in backend.parameters if p.required and p.name not in body]
+    if missing:
+        abort(400, description=f"Missing parameter(s): {', '.join(missing)}")
+    feature = body.get('feature', get_feature_to_display(data))
+    if feature not in data.columns:
+        abort(400, description='Unknown feature column')
+    queries = body['queries']
+    analysis_kwargs = {p.name: body[p.name] for p in backend.parameters if p.name in body}
+
+    cache_key = None
+    if result_cache.enabled:
+        cache_key = result_cache.make_key(
+            dataset.fingerprint_of(data), t.name, f'{backend.name}/batch', feature, dict(analysis_kwargs, queries=dumps(queries))
+        )
+        payload = result_cache.get(cache_key)
+        if payload is not None:
+            return _json_response(payload, cache_status='hit')
+
+    started = time.perf_counter()
+    try:
+        results = t.get_batch_results(data=data, feature=feature, algo=algo, queries=queries,
+                                      **analysis_kwargs)
+    except ValueError as exc:
+        abort(400, description=str(exc))
+    except (TypeError, IndexError, RuntimeError) as exc:
+        abort(400, description=f"Algorithm input error: {exc}")
+
+    payload = dumps(results)
+    _cache_result(cache_key)(payload, time.perf_counter() - started)
+    return _json_response(payload, cache_status='miss' if cache_key is not None else None)
+
+
+def _job_response(job, status_code=200):
+    body = job.to_dict()
+    body['status_url'] = url_for('job_status', job_id=job.job_id)
+    body['result_url'] = url_for('job_result', job_id=job.job_id)
+    return jsonify(body), status_code
+
+
+def get_job_or_abort(job_id: str):
+    job = jobs.get(job_id, owner=get_workspace_id())
+    if job is None:
+        abort(404, description=f'Job "{job_id}" is unknown')
+    return job
+
+
+@app.route('/<task>/<algo>/jobs', methods=['POST'])
+def submit_analysis_job(task, algo):
+    if not jobs.enabled:
+        abort(404, description='Background jobs are disabled on this server.')
+    t, backend, dataset, data, feature, analysis_kwargs, max_points, cache_key = _prepare_analysis(
+        task, algo, reserved=('job_timeout',)
     )
-    return response
+    try:
+        timeout = float(request.args.get('job_timeout', 0))
+    except ValueError:
+        abort(400, description='job_timeout must be a number of seconds.')
+
+    if cache_key is not None:
+        payload = result_cache.get(cache_key)
+        if payload is not None:
+            job = jobs.add_finished(get_workspace_id(), t.name, backend.name, payload)
+            return _job_response(job, 200)
+
+    job = jobs.submit(
+        owner=get_workspace_id(),
+        task=t.name,
+        algo=backend.name,
+        # With a shared dataset store the worker maps the dataset file instead of receiving a pickled frame.
+        data=dataset.reference if dataset.reference is not None else data,
+        feature=feature,
+        kwargs=analysis_kwargs,
+        timeout=timeout,
+        on_success=_cache_result(cache_key),
+        max_points=max_points,
+    )
+    return _job_response(job, 202)
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    return _job_response(get_job_or_abort(job_id))
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    get_job_or_abort(job_id)
+    return _job_response(jobs.cancel(job_id, owner=get_workspace_id()))
+
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = get_job_or_abort(job_id)
+    if job.status == JOB_DONE:
+        return _json_response(job.result)
+    if job.finished:
+        abort(400, description=job.error or f'Job {job.status}.')
+    return jsonify({'error': 'Job has not finished yet.', 'status': job.status}), 409
 
 
 @app.route('/<task>/<algo>/display-feature', methods=['GET'])
@@ -427,22 +736,72 @@ def display_feature(task, algo):
     if feature_to_display not in data.columns:
         abort(400, description='Unknown feature column')
     session['feature_to_display'] = feature_to_display
+    series = downsample_series(data[feature_to_display], get_max_plot_points())
+    x, x_is_date = encode_values(series.index)
+    layout = {'yaxis': {'title': {'text': feature_to_display}}}
+    if x_is_date:
+        layout['xaxis.type'] = 'date'
+    return _json_response(dumps({'data': {'x': [x], 'y': [encode_values(series.to_numpy())[0]]}, 'layout': layout}))
+
+
+def get_pyramid(dataset: DatasetEntry, data: pd.DataFrame, feature: str) -> Pyramid:
+    """Return the zoom pyramid of one column of ``data``, building it for datasets that were stored without one."""
+    pyramids = datasets.artifact(dataset, 'pyramids', dict)
+    if feature not in pyramids:
+        pyramids = dict(pyramids)
+        pyramids[feature] = Pyramid(data[feature].to_numpy(dtype=float, na_value=float('nan')))
+        datasets.set_artifact(dataset, 'pyramids', pyramids)
+    return pyramids[feature]
+
+
+def _parse_range_bound(name: str, index: pd.Index):
+    raw = request.args.get(name)
+    if raw in (None, '', 'null', 'undefined'):
+        return None
+    if not isinstance(index, pd.DatetimeIndex):
+        try:
+            return float(raw)
+        except ValueError:
+            abort(400, description=f'Parameter "{name}" must be a number')
+    try:
+        bound = pd.Timestamp(raw)
+    except ValueError:
+        abort(400, description=f'Parameter "{name}" must be a date')
+    if index.tz is not None and bound.tzinfo is None:
+        bound = bound.tz_localize(index.tz)
+    return bound
 
-    response = app.response_class(
-        response=json.dumps(
-            {
-                'data': {
-                    'x': [data[feature_to_display].index.strftime("%Y-%m-%d %H:%M:%S").tolist()],
-                    'y': [data[feature_to_display].to_list()]
-                },
-                'layout': {
-                    'yaxis': {'title': {'text': feature_to_display}}
-                }
-            }),
-        status=200,
-        mimetype='application/json'
-    )
-    return response
+
+@app.route('/<task>/<algo>/range', methods=['GET'])
+def feature_range(task, algo):
+    """Return the displayed feature between ``start`` and ``end`` at a resolution matching ``plot_width``."""
+    t: Task = get_task_or_abort(task)
+    get_backend_or_abort(t, algo)
+    dataset, data = get_dataset_or_abort()
+    feature = request.args.get('feature') or get_feature_to_display(data)
+    if feature not in data.columns:
+        abort(400, description='Unknown feature column')
+    if not pd.api.types.is_numeric_dtype(data[feature]):
+        abort(400, description='Feature column must be numeric')
+    start = _parse_range_bound('start', data.index)
+    end = _parse_range_bound('end', data.index)
+    try:
+        x, y, bucket_size = get_pyramid(dataset, data, feature).query(
+            data.index,
+            data[feature].to_numpy(),
+            start=start,
+            end=end,
+            max_points=get_max_plot_points() or len(data),
+            stat=request.args.get('stat', 'minmax'),
+        )
+    except ValueError as exc:
+        abort(400, description=str(exc))
+
+    return _json_response(dumps({
+        'x': encode_values(x)[0],
+        'y': encode_values(y)[0],
+        'bucket_size': int(bucket_size),
+    }))
 
 
 @app.route('/<task>/<algo>/export', methods=['GET'])
@@ -481,6 +840,7 @@ def file_too_large(_error):
         "upload.html",
         error=f"File is too large. Maximum size is {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB.",
         max_upload_mb=app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024),
+        accepted_extensions=",".join(ALLOWED_EXTENSIONS),
         steps=UPLOAD_STEPS,
         current_step="upload"
     ), 413
@@ -495,6 +855,7 @@ def main(host: str | None = None, port: int | None = None, debug: bool | None =
     run_host = host or os.getenv("TSEAPY_HOST", "127.0.0.1")
     run_port = int(port if port is not None else os.getenv("TSEAPY_PORT", "5000"))
     run_debug = bool(app.config.get("DEBUG", False)) if debug is None else debug
+    warmup.start(tasks)
     app.run(host=run_host, port=run_port, debug=run_debug)
 
 
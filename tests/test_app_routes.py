@@ -1,12 +1,33 @@
 import io
+import time
 
+import base64
+import gzip
+
+import numpy as np
 import pandas as pd
-from app import app, cache
+import pytest
+from app import app, datasets, result_cache
+
+WORKSPACE_ID = 'test-workspace'
+
+
+def decode(values):
+    """Decode a Plotly typed-array spec (``{"dtype": ..., "bdata": ...}``) into a list."""
+    if isinstance(values, dict):
+        return np.frombuffer(base64.b64decode(values['bdata']), dtype='<' + values['dtype']).tolist()
+    return values
 
 
 def reset_cache_state():
-    cache.delete('data')
-    cache.delete('raw_data')
+    datasets.clear()
+    result_cache.clear()
+
+
+def load_dataset(client, dataframe, slot='active'):
+    with client.session_transaction() as sess:
+        sess['workspace_id'] = WORKSPACE_ID
+    datasets.put(WORKSPACE_ID, slot, dataframe)
 
 
 def test_index_redirects_to_upload_without_data():
@@ -33,10 +54,18 @@ def test_healthz_is_available_without_dataset():
         assert resp.get_json() == {"status": "ok"}
 
 
+def test_readyz_reports_ready_when_warm_up_is_disabled():
+    with app.test_client() as client:
+        resp = client.get('/readyz')
+        assert resp.status_code == 200
+        assert resp.get_json()['status'] == 'ready'
+        assert resp.get_json()['warmup']['state'] == 'disabled'
+
+
 def test_index_lists_new_tasks():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': [1, 2, 3]}, index=pd.date_range('2020-01-01', periods=3, freq='D')))
+        load_dataset(client, pd.DataFrame({'f': [1, 2, 3]}, index=pd.date_range('2020-01-01', periods=3, freq='D')))
         resp = client.get('/')
         assert resp.status_code == 200
         assert b'decomposition' in resp.data
@@ -54,7 +83,7 @@ def test_new_task_pages_available():
 def test_forecasting_comparison_page_available():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': list(range(60))}, index=pd.date_range('2020-01-01', periods=60, freq='D')))
+        load_dataset(client, pd.DataFrame({'f': list(range(60))}, index=pd.date_range('2020-01-01', periods=60, freq='D')))
         resp = client.get('/forecasting/forecast-comparison')
         assert resp.status_code == 200
         assert b'forecast-comparison' in resp.data
@@ -84,12 +113,80 @@ def test_upload_preview_roundtrip():
         assert b'value (numeric)' in preview.data
 
 
+def test_upload_accepts_parquet():
+    pytest.importorskip('pyarrow')
+    with app.test_client() as client:
+        reset_cache_state()
+        buffer = io.BytesIO()
+        pd.DataFrame({'time': pd.date_range('2024-01-01', periods=3), 'value': [1.0, 2.0, 3.0]}).to_parquet(buffer)
+        data = {'file': (io.BytesIO(buffer.getvalue()), 'sample.parquet')}
+        resp = client.post('/upload', data=data, content_type='multipart/form-data')
+        assert resp.status_code == 302
+        preview = client.get('/upload/preview')
+        assert b'value (numeric)' in preview.data
+
+
+def test_chunked_upload_resumes_and_completes():
+    body = b'time,value\n' + b''.join(b'2024-01-%02d,%d\n' % (day, day) for day in range(1, 29))
+    with app.test_client() as client:
+        reset_cache_state()
+        resp = client.post('/upload/chunked', json={'filename': 'big.csv', 'size': len(body)})
+        assert resp.status_code == 201
+        upload = resp.get_json()
+        assert upload['received'] == 0
+
+        half = len(body) // 2
+        assert client.put(f"{upload['upload_url']}?offset=0", data=body[:half]).status_code == 200
+        resp = client.put(f"{upload['upload_url']}?offset=0", data=body[:half])
+        assert resp.status_code == 409
+        assert resp.get_json()['received'] == half
+        assert client.post(upload['complete_url']).status_code == 409
+
+        resp = client.put(f"{upload['upload_url']}?offset={half}", data=body[half:])
+        assert resp.get_json()['complete'] is True
+        resp = client.post(upload['complete_url'])
+        assert resp.status_code == 200
+        assert resp.get_json()['redirect_url'].endswith('/upload/preview')
+        assert b'value (numeric)' in client.get('/upload/preview').data
+        assert client.get(upload['upload_url']).status_code == 404
+
+
+def test_identical_uploads_share_one_parsed_dataset():
+    reset_cache_state()
+    content = b'time,value\n2024-01-01,1\n2024-01-02,2\n'
+    entries = []
+    for workspace in ('first', 'second'):
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess['workspace_id'] = workspace
+            data = {'file': (io.BytesIO(content), 'sample.csv')}
+            assert client.post('/upload', data=data, content_type='multipart/form-data').status_code == 302
+            entries.append(datasets.get(workspace, 'raw'))
+    assert entries[0] is entries[1]
+    assert datasets.stats()['datasets'] == 1
+
+
 def test_demo_dataset_flow():
     with app.test_client() as client:
         reset_cache_state()
         resp = client.post('/upload', data={'use_demo_dataset': '1'})
         assert resp.status_code == 302
         assert resp.headers['Location'].endswith('/upload/preview')
+    with app.test_client() as other:
+        assert other.post('/upload', data={'use_demo_dataset': '1'}).status_code == 302
+    assert datasets.stats()['datasets'] == 1
+
+
+def test_upload_preview_reuses_cached_profile():
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({'t': ['2024-01-01', '2024-01-02'], 'v': [1.5, 2.5]}), slot='raw')
+        resp = client.get('/upload/preview')
+        assert b'<td>1.5</td>' in resp.data
+        assert b'2024-01-01 to 2024-01-02' in resp.data
+        profile = datasets.get(WORKSPACE_ID, 'raw').artifacts['profile']
+        client.post('/upload/configure', data={'time_column': 't', 'value_columns': 'v'})
+        assert datasets.get(WORKSPACE_ID, 'raw').artifacts['profile'] is profile
 
 
 def test_upload_preview_requires_raw_data():
@@ -103,7 +200,7 @@ def test_upload_preview_requires_raw_data():
 def test_upload_configure_invalid_datetime():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('raw_data', pd.DataFrame({'t': ['abc', 'def'], 'v': [1, 2]}))
+        load_dataset(client, pd.DataFrame({'t': ['abc', 'def'], 'v': [1, 2]}), slot='raw')
         resp = client.post('/upload/configure', data={
             'time_column': 't',
             'value_column': 'v',
@@ -116,7 +213,7 @@ def test_upload_configure_invalid_datetime():
 def test_upload_configure_success_sets_data():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('raw_data', pd.DataFrame({'t': ['2024-01-01', '2024-01-02'], 'v': ['1', '2']}))
+        load_dataset(client, pd.DataFrame({'t': ['2024-01-01', '2024-01-02'], 'v': ['1', '2']}), slot='raw')
         resp = client.post('/upload/configure', data={
             'time_column': 't',
             'value_column': 'v',
@@ -124,9 +221,81 @@ def test_upload_configure_success_sets_data():
         })
         assert resp.status_code == 302
         assert resp.headers['Location'].endswith('/')
-        configured = cache.get('data')
+        configured = datasets.get(WORKSPACE_ID, 'active')
         assert configured is not None
-        assert configured.columns.tolist() == ['v']
+        assert configured.frame.columns.tolist() == ['v']
+        assert datasets.get(WORKSPACE_ID, 'raw') is None
+
+
+def test_upload_configure_keeps_selected_columns():
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({
+            't': ['2024-01-03', '2024-01-01', 'bad', '2024-01-02', '2024-01-04'],
+            'a': [3, 1, 9, None, None],
+            'b': ['3.5', '1.5', '9', '2.5', 'x'],
+            'c': [0, 0, 0, 0, 0],
+        }), slot='raw')
+        resp = client.post('/upload/configure', data={
+            'time_column': 't',
+            'value_columns': ['a', 'b'],
+            'confirm_selection': 'on'
+        })
+        assert resp.status_code == 302
+        frame = datasets.get(WORKSPACE_ID, 'active').frame
+        assert frame.columns.tolist() == ['a', 'b']
+        assert frame.index.is_monotonic_increasing
+        assert frame['a'].dtype == np.float64 and frame['b'].to_numpy().flags['C_CONTIGUOUS']
+        assert frame['b'].tolist() == [1.5, 2.5, 3.5]
+        assert np.isnan(frame['a'].iloc[1])
+        resp = client.get('/pattern-recognition/mass/display-feature?feature=b')
+        assert resp.status_code == 200
+
+
+def test_analyses_skip_gaps_in_one_of_two_columns():
+    pytest.importorskip('ruptures')
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2024-01-01', periods=200, freq='h')
+    a = np.concatenate([np.zeros(100), np.full(100, 5.0)]) + rng.normal(scale=0.1, size=200)
+    a[40:60] = np.nan
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({'a': a, 'b': rng.normal(size=200)}, index=index))
+        for url in ('/change-in-mean/pelt-l2/compute?penalty=1&min_size=10&jump=5&feature=a',
+                    '/change-in-mean/sliding-window-l2/compute?penalty=10&width=30&min_size=10&jump=5&feature=a',
+                    '/smoothing/moving-average/compute?window=5&feature=a'):
+            resp = client.get(url)
+            assert resp.status_code == 200, url
+        resp = client.get('/smoothing/moving-average/compute?window=5&feature=a')
+        smoothed = resp.get_json()['data'][1]
+        assert not np.isnan(decode(smoothed['y'])).any()
+
+
+def test_upload_notice_counts_gaps_in_single_columns():
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({
+            't': ['2024-01-01', '2024-01-02', '2024-01-03'],
+            'a': ['1', None, None],
+            'b': ['1', '2', None],
+        }), slot='raw')
+        client.post('/upload/configure', data={'time_column': 't', 'value_columns': ['a', 'b'],
+                                               'confirm_selection': 'on'})
+        with client.session_transaction() as sess:
+            assert sess['upload_notice'] == ("1 rows were removed due to missing values. "
+                                             "1 missing values remain in individual columns and are skipped by analyses.")
+
+
+def test_datasets_are_isolated_per_session():
+    reset_cache_state()
+    frame = pd.DataFrame({'f': [1, 2, 3]}, index=pd.date_range('2020-01-01', periods=3, freq='D'))
+    with app.test_client() as owner:
+        load_dataset(owner, frame)
+        assert owner.get('/').status_code == 200
+    with app.test_client() as other:
+        resp = other.get('/')
+        assert resp.status_code == 302
+        assert resp.headers['Location'].endswith('/upload')
 
 
 def test_favicon_is_not_routed_as_task():
@@ -145,16 +314,54 @@ def test_unknown_task_returns_404():
 def test_pattern_recognition_requires_selected_range():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': [1, 2, 3, 4]}, index=pd.date_range('2020-01-01', periods=4, freq='D')))
+        load_dataset(client, pd.DataFrame({'f': [1, 2, 3, 4]}, index=pd.date_range('2020-01-01', periods=4, freq='D')))
         resp = client.get('/pattern-recognition/mass/compute?start=0&end=0&normalize=true&p=2.0&nb_similar_patterns=2&feature=f')
         assert resp.status_code == 400
         assert b'Select a date range on the main chart' in resp.data
 
 
+def test_pattern_recognition_batch_reports_matches_per_query():
+    pytest.importorskip('stumpy')
+    rng = np.random.default_rng(0)
+    values = rng.normal(scale=0.05, size=400)
+    bump = np.sin(np.linspace(0, np.pi, 20))
+    for start in (40, 150, 300):
+        values[start:start + 20] += bump
+    index = pd.date_range('2024-01-01', periods=400, freq='h')
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({'f': values}, index=index))
+        body = {
+            'feature': 'f', 'normalize': True, 'p': 2.0, 'nb_similar_patterns': 2, 'max_distance': 0,
+            'queries': [
+                {'start': index[40].isoformat(), 'end': index[59].isoformat()},
+                {'values': bump.tolist()},
+                {'start': index[200].isoformat(), 'end': index[229].isoformat()},
+            ],
+        }
+        resp = client.post('/pattern-recognition/mass/batch', json=body)
+        assert resp.status_code == 200
+        results = resp.get_json()['results']
+        assert [result['length'] for result in results] == [20, 20, 30]
+        assert sorted(match['start'] for match in results[0]['matches']) == [index[150].isoformat(),
+                                                                             index[300].isoformat()]
+        first = results[0]['matches'][0]
+        assert pd.Timestamp(first['end']) - pd.Timestamp(first['start']) == pd.Timedelta(hours=19)
+        assert first['distance'] < results[0]['matches'][1]['distance'] + 1e-9
+        assert 'start' not in results[1] and len(results[1]['matches']) == 2
+        assert len(results[2]['matches']) == 2
+
+        resp = client.post('/pattern-recognition/mass/batch', json=dict(body, queries=[{'start': '0', 'end': '0'}]))
+        assert resp.status_code == 400
+        resp = client.post('/pattern-recognition/mass/batch', json={'queries': body['queries']})
+        assert resp.status_code == 400
+        assert b'Missing parameter(s)' in resp.data
+
+
 def test_matrixprofile_oversized_width_is_clamped():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': list(range(20))}, index=pd.date_range('2020-01-01', periods=20, freq='D')))
+        load_dataset(client, pd.DataFrame({'f': list(range(20))}, index=pd.date_range('2020-01-01', periods=20, freq='D')))
         resp = client.get('/motif-detection/matrixprofile/compute?penalty=0.4&width=100&feature=f')
         assert resp.status_code == 200
 
@@ -162,7 +369,7 @@ def test_matrixprofile_oversized_width_is_clamped():
 def test_panmatrixprofile_invalid_bounds_returns_400():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': list(range(20))}, index=pd.date_range('2020-01-01', periods=20, freq='D')))
+        load_dataset(client, pd.DataFrame({'f': list(range(20))}, index=pd.date_range('2020-01-01', periods=20, freq='D')))
         resp = client.get('/motif-detection/panmatrixprofile/compute?penalty=10&minimum_width=50&maximum_width=150&percentage=2&feature=f')
         assert resp.status_code == 400
         assert b'minimum_width must be less than' in resp.data
@@ -179,7 +386,7 @@ def test_compute_without_data():
 def test_compute_missing_params():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': [1, 2, 3]}, index=pd.date_range('2020', periods=3)))
+        load_dataset(client, pd.DataFrame({'f': [1, 2, 3]}, index=pd.date_range('2020', periods=3)))
         resp = client.get('/change-in-mean/pelt-l2/compute?penalty=1&min_size=10')
         assert resp.status_code == 400
         assert b'Missing query parameter' in resp.data
@@ -188,7 +395,7 @@ def test_compute_missing_params():
 def test_forecasting_comparison_compute_with_baselines():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': list(range(60))}, index=pd.date_range('2020-01-01', periods=60, freq='D')))
+        load_dataset(client, pd.DataFrame({'f': list(range(60))}, index=pd.date_range('2020-01-01', periods=60, freq='D')))
         resp = client.get(
             '/forecasting/forecast-comparison/compute'
             '?horizon=5&season_length=3'
@@ -200,10 +407,122 @@ def test_forecasting_comparison_compute_with_baselines():
         assert resp.status_code == 200
 
 
+def test_compute_reuses_cached_result_for_same_parameters():
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({'f': list(range(20))}, index=pd.date_range('2020-01-01', periods=20, freq='D')))
+        first = client.get('/smoothing/moving-average/compute?window=3&feature=f')
+        second = client.get('/smoothing/moving-average/compute?window=3.0&feature=f')
+        assert first.status_code == 200
+        assert first.headers['X-Tseapy-Cache'] == 'miss'
+        assert second.headers['X-Tseapy-Cache'] == 'hit'
+        assert second.data == first.data
+
+
+def test_compute_downsamples_to_plot_width():
+    with app.test_client() as client:
+        reset_cache_state()
+        size = 20_000
+        load_dataset(client, pd.DataFrame({'f': range(size)}, index=pd.date_range('2020-01-01', periods=size, freq='min')))
+        resp = client.get('/smoothing/moving-average/compute?window=3&feature=f&plot_width=500')
+        assert resp.status_code == 200
+        traces = resp.get_json()['data']
+        assert [len(decode(trace['y'])) for trace in traces] == [1024, 1024]
+
+        feature = client.get('/smoothing/moving-average/display-feature?feature=f&plot_width=500')
+        assert len(decode(feature.get_json()['data']['y'][0])) == 1024
+
+
+def test_range_returns_detail_for_zoomed_window():
+    with app.test_client() as client:
+        reset_cache_state()
+        size = 50_000
+        index = pd.date_range('2020-01-01', periods=size, freq='s')
+        load_dataset(client, pd.DataFrame({'f': range(size)}, index=index))
+        overview = client.get('/smoothing/moving-average/range?feature=f&plot_width=500').get_json()
+        assert overview['bucket_size'] > 1
+        assert len(decode(overview['x'])) <= 1024
+
+        zoomed = client.get('/smoothing/moving-average/range?feature=f&plot_width=500'
+                            f'&start={index[100]}&end={index[599]}').get_json()
+        assert zoomed['bucket_size'] == 1
+        assert decode(zoomed['y']) == list(range(100, 600))
+        assert decode(zoomed['x'])[0] == index[100].value / 1e6
+
+        bad = client.get('/smoothing/moving-average/range?feature=f&start=not-a-date')
+        assert bad.status_code == 400
+
+
+def test_json_responses_are_compressed_when_accepted():
+    with app.test_client() as client:
+        reset_cache_state()
+        size = 5_000
+        load_dataset(client, pd.DataFrame({'f': range(size)}, index=pd.date_range('2020-01-01', periods=size, freq='min')))
+        plain = client.get('/smoothing/moving-average/compute?window=3&feature=f')
+        assert 'Content-Encoding' not in plain.headers
+        assert 'Accept-Encoding' in plain.headers['Vary']
+        compressed = client.get('/smoothing/moving-average/compute?window=3&feature=f',
+                                headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(compressed.data) == plain.data
+        figure = plain.get_json()
+        assert figure['layout']['xaxis']['type'] == 'date'
+        assert figure['data'][0]['x']['dtype'] == 'f8'
+
+
+def wait_for_job(client, status_url, deadline=60):
+    end = time.time() + deadline
+    while time.time() < end:
+        body = client.get(status_url).get_json()
+        if body['status'] not in ('queued', 'running'):
+            return body
+        time.sleep(0.1)
+    raise AssertionError('job did not finish')
+
+
+def test_analysis_job_lifecycle():
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({'f': list(range(20))}, index=pd.date_range('2020-01-01', periods=20, freq='D')))
+        submitted = client.post('/smoothing/moving-average/jobs?window=4&feature=f')
+        assert submitted.status_code == 202
+        job = submitted.get_json()
+        assert wait_for_job(client, job['status_url'])['status'] == 'done'
+        result = client.get(job['result_url'])
+        assert result.status_code == 200
+        assert 'data' in result.get_json()
+
+        compute = client.get('/smoothing/moving-average/compute?window=4&feature=f')
+        assert compute.headers['X-Tseapy-Cache'] == 'hit'
+        resubmitted = client.post('/smoothing/moving-average/jobs?window=4&feature=f')
+        assert resubmitted.status_code == 200
+        assert resubmitted.get_json()['status'] == 'done'
+
+
+def test_analysis_job_reports_algorithm_errors():
+    with app.test_client() as client:
+        reset_cache_state()
+        load_dataset(client, pd.DataFrame({'f': list(range(20))}, index=pd.date_range('2020-01-01', periods=20, freq='D')))
+        submitted = client.post('/motif-detection/panmatrixprofile/jobs'
+                                '?penalty=10&minimum_width=50&maximum_width=150&percentage=2&feature=f')
+        job = submitted.get_json()
+        assert wait_for_job(client, job['status_url'])['status'] == 'failed'
+        result = client.get(job['result_url'])
+        assert result.status_code == 400
+        assert b'minimum_width must be less than' in result.data
+
+
+def test_unknown_job_returns_404():
+    with app.test_client() as client:
+        reset_cache_state()
+        assert client.get('/jobs/does-not-exist').status_code == 404
+        assert client.delete('/jobs/does-not-exist').status_code == 404
+
+
 def test_display_feature_missing_param():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': [1, 2]}, index=pd.date_range('2020', periods=2)))
+        load_dataset(client, pd.DataFrame({'f': [1, 2]}, index=pd.date_range('2020', periods=2)))
         resp = client.get('/pattern-recognition/mass/display-feature')
         assert resp.status_code == 400
         assert b'Parameter \\"feature\\" is required' in resp.data
@@ -212,7 +531,7 @@ def test_display_feature_missing_param():
 def test_display_feature_invalid_feature():
     with app.test_client() as client:
         reset_cache_state()
-        cache.set('data', pd.DataFrame({'f': [1, 2]}, index=pd.date_range('2020', periods=2)))
+        load_dataset(client, pd.DataFrame({'f': [1, 2]}, index=pd.date_range('2020', periods=2)))
         resp = client.get('/pattern-recognition/mass/display-feature?feature=x')
         assert resp.status_code == 400
         assert b'Unknown feature column' in resp.data
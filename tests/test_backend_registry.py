@@ -0,0 +1,50 @@
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+from tseapy.core import backend_registry
+from tseapy.core.backend_registry import build_tasks_registry, format_import_report, measure_import_cost
+from tseapy.tasks.smoothing import SmoothingBackend
+
+
+class ExtraSmoothing(SmoothingBackend):
+    def __init__(self):
+        super().__init__('extra-smoothing', 'Plugin backend', '', "'/smoothing/extra-smoothing/compute'", [])
+
+    def do_analysis(self, data, feature, **kwargs):
+        return data[feature]
+
+
+def test_builtin_registry_lists_every_task():
+    registry = build_tasks_registry(include_plugins=False)
+    names = [task.name for task in registry.iter_tasks()]
+    assert names[:2] == ['pattern-recognition', 'change-in-mean']
+    mass = registry.get_tasks('pattern-recognition').get_analysis_backend('mass')
+    assert mass.requires == ('stumpy',)
+
+
+def test_app_import_defers_heavy_backend_dependencies():
+    script = "import sys, app; print(sorted(m for m in ('stumpy', 'ruptures', 'statsforecast', 'sklearn') if m in sys.modules))"
+    completed = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == '[]'
+
+
+def test_plugins_are_loaded_from_entry_points(monkeypatch, caplog):
+    plugins = [
+        EntryPoint('smoothing.extra-smoothing', f'{__name__}:ExtraSmoothing', backend_registry.ENTRY_POINT_GROUP),
+        EntryPoint('unknown-task.broken', f'{__name__}:ExtraSmoothing', backend_registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(backend_registry, 'entry_points', lambda group: plugins)
+    registry = build_tasks_registry()
+    backend = registry.get_tasks('smoothing').get_analysis_backend('extra-smoothing')
+    assert isinstance(backend, ExtraSmoothing)
+    assert 'unknown-task.broken' in caplog.text
+
+
+def test_import_report_measures_in_a_fresh_interpreter():
+    cost = measure_import_cost(['json'], baseline=('os',))
+    assert cost['seconds'] >= 0
+    failed = measure_import_cost(['tseapy_no_such_module'])
+    assert failed['seconds'] is None and 'ModuleNotFoundError' in failed['error']
+    report = format_import_report([dict(task='t', backend='b', module='m', requires=['x'], **failed)])
+    assert 'failed' in report
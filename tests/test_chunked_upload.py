@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from tseapy.data.chunked import ChunkOffsetError, ChunkedUploadStore
+from tseapy.data.upload import UploadError
+
+
+def make_store(tmp_path, **kwargs):
+    kwargs.setdefault('chunk_bytes', 4)
+    return ChunkedUploadStore(directory=tmp_path, **kwargs)
+
+
+def test_append_in_order_and_resume(tmp_path):
+    store = make_store(tmp_path)
+    upload = store.create('owner', 'data.csv', 10)
+    assert store.append(upload, 0, io.BytesIO(b'a,b\n')) == 4
+    with pytest.raises(ChunkOffsetError) as excinfo:
+        store.append(upload, 0, io.BytesIO(b'1,2\n'))
+    assert excinfo.value.received == 4
+    store.append(upload, 4, io.BytesIO(b'1,2\n'))
+    store.append(upload, 8, io.BytesIO(b'3\n'))
+    assert store.get(upload.upload_id, owner='owner').complete
+    assert upload.path.read_bytes() == b'a,b\n1,2\n3\n'
+
+
+def test_rejects_oversized_chunks_and_files(tmp_path):
+    store = make_store(tmp_path, max_bytes=100)
+    with pytest.raises(UploadError):
+        store.create('owner', 'data.csv', 101)
+    with pytest.raises(UploadError):
+        store.create('owner', 'data.exe', 10)
+    upload = store.create('owner', 'data.csv', 6)
+    with pytest.raises(UploadError):
+        store.append(upload, 0, io.BytesIO(b'12345'))
+    store.append(upload, 0, io.BytesIO(b'1234'))
+    with pytest.raises(UploadError):
+        store.append(upload, 4, io.BytesIO(b'567'))
+    assert upload.received == 4
+
+
+def test_get_checks_owner_and_discard(tmp_path):
+    store = make_store(tmp_path)
+    upload = store.create('owner', 'data.csv', 4)
+    assert store.get(upload.upload_id, owner='someone-else') is None
+    assert store.get('../escape') is None
+    store.discard(upload)
+    assert store.get(upload.upload_id) is None
+    assert not upload.path.exists()
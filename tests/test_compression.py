@@ -0,0 +1,41 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tseapy.data.compression import CODECS, CompressedFrame, resolve_codec, shuffle_bytes, unshuffle_bytes
+
+
+def test_byte_shuffle_round_trips():
+    values = np.linspace(-1.0, 1.0, 7)
+    shuffled = shuffle_bytes(values)
+    assert shuffled[:7] == values.view(np.uint8)[::8].tobytes()
+    np.testing.assert_array_equal(unshuffle_bytes(shuffled, values.dtype), values)
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_compressed_frames_round_trip(codec):
+    try:
+        codec = resolve_codec(codec)
+    except RuntimeError:
+        pytest.skip(f'{codec} is not installed')
+    frame = pd.DataFrame({
+        'value': np.round(np.sin(np.arange(500) / 20), 3),
+        'count': np.arange(500),
+        'label': ['a', None] * 250,
+        'flag': np.arange(500) % 3 == 0,
+    }, index=pd.date_range('2024-01-01', periods=500, freq='min', tz='UTC', name='time'))
+    frame.attrs['source'] = 'sensor'
+
+    compressed = pickle.loads(pickle.dumps(CompressedFrame(frame, codec)))
+    restored = compressed.decompress()
+    pd.testing.assert_frame_equal(restored, frame)
+    assert restored.index.freq == frame.index.freq
+    assert restored.attrs == {'source': 'sensor'}
+
+
+def test_auto_and_off_select_a_codec():
+    assert resolve_codec('off') is None
+    assert resolve_codec(None) is None
+    assert resolve_codec('auto').name in CODECS
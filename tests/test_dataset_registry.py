@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tseapy.data.registry import DatasetRegistry, frame_nbytes, freeze_frame
+
+
+def make_frame(n, value=0.0):
+    index = pd.date_range('2020-01-01', periods=n, freq='D')
+    return pd.DataFrame({'f': [value] * n}, index=index)
+
+
+def test_put_and_get_are_scoped_by_workspace():
+    registry = DatasetRegistry()
+    registry.put('a', 'active', make_frame(3, 1.0))
+    registry.put('b', 'active', make_frame(3, 2.0))
+    assert registry.get('a', 'active').frame['f'].iloc[0] == 1.0
+    assert registry.get('b', 'active').frame['f'].iloc[0] == 2.0
+    assert registry.get('c', 'active') is None
+
+
+def test_least_recently_used_dataset_is_spilled_and_reloaded(tmp_path):
+    frame = make_frame(100)
+    registry = DatasetRegistry(memory_budget=int(frame_nbytes(frame) * 1.5), spill_dir=tmp_path)
+    first = registry.put('a', 'active', frame)
+    registry.put('b', 'active', make_frame(100, 5.0))
+
+    assert not first.resident
+    assert first.spill_path.exists()
+    assert registry.stats()['resident'] == 1
+
+    reloaded = registry.get('a', 'active')
+    assert reloaded.resident
+    pd.testing.assert_frame_equal(reloaded.frame, frame)
+    assert registry.stats()['resident_bytes'] <= registry.memory_budget
+
+
+def test_resolved_frame_survives_eviction_of_its_entry(tmp_path):
+    frame = make_frame(100, 1.0)
+    registry = DatasetRegistry(memory_budget=int(frame_nbytes(frame) * 1.5), spill_dir=tmp_path)
+    registry.put('a', 'active', frame)
+    entry, resolved = registry.resolve('a', 'active')
+    registry.put('b', 'active', make_frame(100, 5.0))
+
+    assert entry.frame is None
+    pd.testing.assert_frame_equal(resolved, frame)
+    assert entry.fingerprint_of(resolved) == registry.get('a', 'active').fingerprint
+    assert registry.resolve('c', 'active') == (None, None)
+
+
+def test_idle_datasets_are_compressed_before_they_are_spilled(tmp_path):
+    frame = make_frame(1000, 1.5)
+    budget = int(frame_nbytes(frame) * 1.5)
+    registry = DatasetRegistry(memory_budget=budget, spill_dir=tmp_path, compression='zlib')
+    first = registry.put('a', 'active', frame)
+    registry.put('b', 'active', make_frame(1000, 2.5))
+
+    assert not first.resident and first.compressed is not None
+    assert first.compressed.nbytes < frame_nbytes(frame) / 4
+    assert list(tmp_path.iterdir()) == []
+    assert registry.stats()['compressed'] == 1
+
+    reloaded = registry.get('a', 'active')
+    pd.testing.assert_frame_equal(reloaded.frame, frame)
+    assert not reloaded.frame['f'].to_numpy().flags.writeable
+    stats = registry.stats()
+    assert stats['compressed'] == 1 and stats['resident'] == 1
+    assert stats['resident_bytes'] <= budget
+
+
+def test_compressed_datasets_spill_once_memory_is_exhausted(tmp_path):
+    frames = [make_frame(1000, float(value)) for value in range(3)]
+    registry = DatasetRegistry(memory_budget=frame_nbytes(frames[0]) + 100, spill_dir=tmp_path, compression='zlib')
+    for workspace, frame in zip('abc', frames):
+        registry.put(workspace, 'active', frame)
+
+    assert registry.stats()['resident'] == 1
+    assert len(list(tmp_path.iterdir())) >= 1
+    for workspace, frame in zip('abc', frames):
+        pd.testing.assert_frame_equal(registry.get(workspace, 'active').frame, frame)
+
+
+def test_unknown_compression_codec_is_rejected():
+    with pytest.raises(ValueError):
+        DatasetRegistry(compression='snappy')
+
+
+def test_replacing_a_slot_releases_the_previous_dataset(tmp_path):
+    frame = make_frame(100)
+    registry = DatasetRegistry(memory_budget=frame_nbytes(frame), spill_dir=tmp_path)
+    registry.put('a', 'raw', frame)
+    registry.put('b', 'raw', make_frame(100))
+    spilled = list(tmp_path.iterdir())
+    assert len(spilled) == 1
+
+    registry.discard('a', 'raw')
+    assert registry.stats()['datasets'] == 1
+    assert not spilled[0].exists()
+
+
+def test_idle_workspaces_expire():
+    registry = DatasetRegistry(ttl=-1)
+    registry.put('a', 'active', make_frame(3))
+    registry.put('b', 'active', make_frame(3))
+    assert registry.get('a', 'active') is None
+    assert registry.get('b', 'active') is not None
+
+
+def test_get_returns_shared_read_only_frame():
+    registry = DatasetRegistry()
+    frame = make_frame(5, 1.0)
+    registry.put('a', 'active', frame)
+
+    first = registry.get('a', 'active').frame
+    second = registry.get('a', 'active').frame
+    assert first is second
+    assert np.shares_memory(first['f'].to_numpy(), frame['f'].to_numpy())
+    with pytest.raises(ValueError):
+        first.iloc[0, 0] = 2.0
+    with pytest.raises(ValueError):
+        registry.get('a', 'active').column('f')[0] = 2.0
+
+
+def test_writable_copy_is_independent():
+    registry = DatasetRegistry()
+    entry = registry.put('a', 'active', make_frame(5, 1.0))
+    copy = entry.writable_copy()
+    copy.iloc[0, 0] = 2.0
+    assert entry.frame.iloc[0, 0] == 1.0
+
+
+def test_frozen_frame_keeps_columns_and_dtypes():
+    frame = pd.DataFrame({'t': ['a', 'b'], 'v': [1, 2], 3: [0.5, 1.5]})
+    frozen = freeze_frame(frame)
+    assert frozen.columns.tolist() == ['t', 'v', 3]
+    assert frozen.dtypes.tolist() == frame.dtypes.tolist()
+    pd.testing.assert_frame_equal(frozen, frame)
+
+
+def test_shared_datasets_are_loaded_once_and_outlive_their_slots():
+    registry = DatasetRegistry()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return make_frame(5, 1.0)
+
+    first = registry.put_shared('a', 'raw', 'digest', load)
+    first.artifacts['profile'] = 'cached'
+    second = registry.put_shared('b', 'raw', 'digest', load)
+    assert second is first and len(loads) == 1
+
+    registry.discard('a', 'raw')
+    registry.discard('b', 'raw')
+    assert registry.stats()['unreferenced'] == 1
+    again = registry.link('c', 'raw', 'digest')
+    assert again is first and again.artifacts['profile'] == 'cached'
+    assert registry.link('c', 'raw', 'unknown') is None
+
+
+def test_unreferenced_shared_datasets_are_dropped_under_memory_pressure(tmp_path):
+    frame = make_frame(100)
+    registry = DatasetRegistry(memory_budget=int(frame_nbytes(frame) * 1.5), spill_dir=tmp_path)
+    registry.put('a', 'raw', frame, dataset_id='digest')
+    registry.discard('a', 'raw')
+    registry.put('b', 'raw', make_frame(100, 5.0))
+    assert registry.stats()['datasets'] == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_relinking_the_same_dataset_into_its_slot_keeps_it():
+    registry = DatasetRegistry()
+    entry = registry.put('a', 'raw', make_frame(3), dataset_id='digest')
+    assert registry.link('a', 'raw', 'digest') is entry
+    assert entry.refs == 1 and entry.resident
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from tseapy.data.datetimes import infer_datetime_format, parse_datetimes
+
+
+def test_infers_day_first_and_epoch_formats():
+    assert infer_datetime_format(pd.Series(['01/02/2024', '13/02/2024', '14/02/2024'])) == '%d/%m/%Y'
+    assert infer_datetime_format(pd.Series(['2024-01-01 10:00:00', '2024-01-01 11:00:00'])) == '%Y-%m-%d %H:%M:%S'
+    assert infer_datetime_format(pd.Series([1_700_000_000, 1_700_000_060])) == 'epoch:s'
+    assert infer_datetime_format(pd.Series([1.7e12, 1.7e12 + 1000])) == 'epoch:ms'
+    assert infer_datetime_format(pd.Series([1, 2, 3])) is None
+    assert infer_datetime_format(pd.Series(['abc', 'def'])) is None
+
+
+def test_fixed_width_parse_matches_pandas():
+    index = pd.date_range('2019-12-30 22:00', periods=5000, freq='37min')
+    text = pd.Series(index.strftime('%d.%m.%Y %H:%M:%S'))
+    np.testing.assert_array_equal(parse_datetimes(text).to_numpy(), index.to_numpy())
+
+
+def test_rows_missed_by_the_format_fall_back():
+    values = pd.Series(['31.12.2024 23:59:59', '1.2.2024 01:00:00', '30.02.2024 00:00:00', None, '2024-03-05T06:07']
+                       + ['05.06.2024 10:00:00'] * 5)
+    parsed = parse_datetimes(values, '%d.%m.%Y %H:%M:%S')
+    assert parsed[0] == pd.Timestamp('2024-12-31 23:59:59')
+    assert parsed[1] == pd.Timestamp('2024-02-01 01:00:00')
+    assert pd.isna(parsed[2]) and pd.isna(parsed[3])
+    assert parsed[4] == pd.Timestamp('2024-03-05 06:07')
+
+
+def test_epoch_parse():
+    parsed = parse_datetimes(pd.Series([1_700_000_000_000, None]), 'epoch:ms')
+    assert parsed[0] == pd.Timestamp('2023-11-14 22:13:20')
+    assert pd.isna(parsed[1])
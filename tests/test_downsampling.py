@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from tseapy.core.downsampling import (
+    downsample_figure,
+    downsample_series,
+    lttb_indices,
+    minmax_indices,
+    points_for_width,
+)
+
+
+def test_points_for_width_rounds_and_caps():
+    assert points_for_width(None, 4000) == 4000
+    assert points_for_width('abc', 4000) == 4000
+    assert points_for_width('300', 4000) == 1024
+    assert points_for_width('512', 4000) == 1024
+    assert points_for_width('5000', 4000) == 4000
+    assert points_for_width('300', 0) == 0
+
+
+def test_lttb_keeps_endpoints_and_peak():
+    y = np.zeros(10_000)
+    y[4321] = 50.0
+    indices = lttb_indices(np.arange(len(y)), y, 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert 4321 in indices
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_minmax_preserves_extremes_and_gaps():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=10_000)
+    y[100] = 25.0
+    y[7000] = -25.0
+    y[5000:5010] = np.nan
+    indices = minmax_indices(y, 500)
+    assert {100, 7000} <= set(indices.tolist())
+    assert np.isnan(y[indices]).any()
+    assert len(indices) <= 500 + 20
+
+
+def test_downsample_figure_reduces_line_traces_only():
+    index = pd.date_range('2020-01-01', periods=20_000, freq='min')
+    fig = px.line(x=index, y=np.sin(np.arange(20_000) / 100.0), markers=True)
+    fig.add_scatter(x=index[:5_000], y=np.ones(5_000), mode='markers', name='matches')
+    downsample_figure(fig, 1000)
+    assert len(fig.data[0].x) == len(fig.data[0].y) == 1000
+    assert len(fig.data[1].x) == 5_000
+
+
+def test_downsample_series_leaves_short_series_alone():
+    series = pd.Series(range(10), index=pd.date_range('2020', periods=10))
+    assert downsample_series(series, 100) is series
+    reduced = downsample_series(pd.Series(np.arange(10_000.0)), 100)
+    assert len(reduced) == 100
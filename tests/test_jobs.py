@@ -0,0 +1,174 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pandas as pd
+
+from tseapy.core.jobs import JobManager, SharedJobRecords, JOB_CANCELLED, JOB_DONE, JOB_FAILED, JOB_RUNNING, JOB_TIMEOUT
+from tseapy.core.tasks import TasksList
+from tseapy.tasks.smoothing import Smoothing
+from tseapy.tasks.smoothing.moving_average import MovingAverage
+
+release = threading.Event()
+
+
+class BlockingMovingAverage(MovingAverage):
+    def do_analysis(self, data, feature, **kwargs):
+        release.wait(5)
+        return super().do_analysis(data, feature, **kwargs)
+
+
+class SleepingMovingAverage(MovingAverage):
+    def do_analysis(self, data, feature, sleep=0, **kwargs):
+        time.sleep(float(sleep))
+        return super().do_analysis(data, feature, **kwargs)
+
+
+def registry():
+    smoothing = Smoothing()
+    smoothing.add_analysis_backend(MovingAverage())
+    tasks = TasksList()
+    tasks.add_task(smoothing)
+    return tasks
+
+
+def blocking_registry():
+    smoothing = Smoothing()
+    smoothing.add_analysis_backend(BlockingMovingAverage())
+    tasks = TasksList()
+    tasks.add_task(smoothing)
+    return tasks
+
+
+def sleeping_registry():
+    smoothing = Smoothing()
+    smoothing.add_analysis_backend(SleepingMovingAverage())
+    tasks = TasksList()
+    tasks.add_task(smoothing)
+    return tasks
+
+
+def make_manager(factory, workers=1, timeout=30, executor='thread'):
+    manager = JobManager(workers=workers, executor=executor, default_timeout=timeout)
+    manager.registry_factory = factory
+    return manager
+
+
+def wait_finished(manager, job, deadline=10):
+    end = time.time() + deadline
+    while time.time() < end:
+        if manager.get(job.job_id).finished:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job still {job.status}")
+
+
+def sample_data():
+    return pd.DataFrame({'f': [1.0, 2.0, 3.0, 4.0]}, index=pd.date_range('2020-01-01', periods=4, freq='D'))
+
+
+def test_job_runs_and_reports_result():
+    manager = make_manager(registry)
+    stored = []
+    job = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f', {'window': '2'},
+                         on_success=lambda payload, cost: stored.append(payload))
+    wait_finished(manager, job)
+    assert job.status == JOB_DONE
+    assert '"data"' in job.result
+    assert stored == [job.result]
+    assert manager.get(job.job_id, owner='someone-else') is None
+
+
+def test_job_failure_carries_message():
+    manager = make_manager(registry)
+    job = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'missing', {'window': '2'})
+    wait_finished(manager, job)
+    assert job.status == JOB_FAILED
+    assert job.error == 'Unknown feature column'
+
+
+def test_queued_job_can_be_cancelled():
+    release.clear()
+    manager = make_manager(blocking_registry)
+    running = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f', {'window': '2'})
+    queued = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f', {'window': '2'})
+    manager.cancel(queued.job_id)
+    release.set()
+    wait_finished(manager, running)
+    assert queued.status == JOB_CANCELLED
+    assert running.status == JOB_DONE
+
+
+def test_running_job_times_out():
+    release.clear()
+    manager = make_manager(blocking_registry, timeout=0.2)
+    job = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f', {'window': '2'})
+    wait_finished(manager, job)
+    release.set()
+    assert job.status == JOB_TIMEOUT
+    assert 'timeout' in job.error
+
+
+def wait_running(manager, job, deadline=30):
+    end = time.time() + deadline
+    while manager.get(job.job_id).status != JOB_RUNNING:
+        assert time.time() < end, f"job still {job.status}"
+        time.sleep(0.05)
+
+
+def test_cancelled_job_process_is_replaced_for_the_next_job():
+    manager = make_manager(sleeping_registry, executor='process')
+    try:
+        sleeping = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f',
+                                  {'window': '2', 'sleep': '60'})
+        wait_running(manager, sleeping)
+        manager.cancel(sleeping.job_id)
+        started = time.time()
+        job = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f', {'window': '2'})
+        wait_finished(manager, job, deadline=30)
+        assert sleeping.status == JOB_CANCELLED
+        assert job.status == JOB_DONE
+        assert time.time() - started < 30
+    finally:
+        manager.shutdown()
+
+
+def test_timed_out_job_process_is_terminated():
+    manager = make_manager(sleeping_registry, executor='process', timeout=0.5)
+    try:
+        job = manager.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f',
+                             {'window': '2', 'sleep': '60'})
+        wait_finished(manager, job, deadline=30)
+        assert job.status == JOB_TIMEOUT
+        # The worker is terminated rather than left to finish its 60 second sleep.
+        assert isinstance(job.future.exception(timeout=5), CancelledError)
+    finally:
+        manager.shutdown()
+
+
+def test_jobs_are_visible_to_managers_sharing_records(tmp_path):
+    submitting, other = make_manager(registry), make_manager(registry)
+    submitting.records = SharedJobRecords(tmp_path)
+    other.records = SharedJobRecords(tmp_path)
+    job = submitting.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f', {'window': '2'})
+    wait_finished(submitting, job)
+
+    seen = other.get(job.job_id, owner='owner')
+    assert seen.status == JOB_DONE
+    assert seen.result == job.result
+    assert other.get(job.job_id, owner='someone-else') is None
+
+
+def test_cancellation_is_forwarded_to_the_running_manager(tmp_path):
+    release.clear()
+    submitting, other = make_manager(blocking_registry), make_manager(blocking_registry)
+    submitting.records = SharedJobRecords(tmp_path)
+    other.records = SharedJobRecords(tmp_path)
+    job = submitting.submit('owner', 'smoothing', 'moving-average', sample_data(), 'f', {'window': '2'})
+    other.cancel(job.job_id, owner='owner')
+    try:
+        wait_finished(submitting, job)
+    finally:
+        release.set()
+    assert job.status == JOB_CANCELLED
+    assert other.get(job.job_id).status == JOB_CANCELLED
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+stumpy = pytest.importorskip('stumpy')
+
+from tseapy.tasks.pattern_recognition import mass_index
+from tseapy.tasks.pattern_recognition.mass_index import get_mass_index, mass, mass_batch, multi_mass, series_key
+
+
+def make_series():
+    rng = np.random.default_rng(0)
+    series = np.cumsum(rng.normal(size=2000))
+    series[100:110] = np.nan
+    series[500:560] = 4.0
+    return series
+
+
+@pytest.mark.parametrize('normalize', [True, False])
+def test_distance_profile_matches_stumpy(normalize):
+    series = make_series()
+    for start, m in ((800, 20), (520, 30), (1500, 64)):
+        query = series[start:start + m].copy()
+        expected = stumpy.mass(query, series, normalize=normalize)
+        actual = mass(query, series, normalize=normalize)
+        np.testing.assert_array_equal(np.isfinite(actual), np.isfinite(expected))
+        finite = np.isfinite(expected)
+        # Exact matches come out as ~1e-6 instead of 0: FFT round-off under a square root.
+        np.testing.assert_allclose(actual[finite], expected[finite], atol=1e-4)
+
+
+def test_other_norms_fall_back_to_stumpy():
+    series = make_series()
+    query = series[800:820].copy()
+    np.testing.assert_allclose(mass(query, series, normalize=False, p=1.0),
+                               stumpy.mass(query, series, normalize=False, p=1.0))
+
+
+def test_index_and_statistics_are_reused_across_queries():
+    series = make_series()
+    index = get_mass_index(series)
+    assert get_mass_index(series.copy()) is index
+    assert index.statistics(series, 20) is index.statistics(series, 20)
+    for m in range(3, 3 + mass_index.MAX_LENGTHS + 1):
+        index.statistics(series, m)
+    assert len(index._statistics) == mass_index.MAX_LENGTHS
+
+
+def test_index_cache_is_bounded_by_bytes(monkeypatch):
+    monkeypatch.setattr(mass_index, '_indexes', type(mass_index._indexes)())
+    series = make_series()
+    first = get_mass_index(series)
+    first.statistics(series, 20)
+    monkeypatch.setattr(mass_index, 'MAX_INDEX_BYTES', first.nbytes + 1)
+    second = get_mass_index(series + 1.0)
+    assert list(mass_index._indexes.values()) == [second]
+    assert get_mass_index(series) is not first
+
+
+def test_invalid_queries_are_rejected():
+    series = make_series()
+    with pytest.raises(ValueError):
+        mass(series[:2], series)
+    with pytest.raises(ValueError):
+        mass(np.ones(3000), series)
+    assert np.isinf(mass(series[95:115], series)).all()
+
+
+def test_registry_frame_columns_are_hashed_once(monkeypatch):
+    import pandas as pd
+
+    from tseapy.data.registry import freeze_frame
+    from tseapy.tasks.pattern_recognition.mass_index import column_key
+
+    frame = freeze_frame(pd.DataFrame({'f': make_series()}))
+    key = column_key(frame, 'f')
+    assert key == series_key(make_series())
+    monkeypatch.setattr(mass_index, 'series_key', lambda T: pytest.fail('hashed again'))
+    assert column_key(frame, 'f') == key
+
+
+@pytest.mark.parametrize('normalize', [True, False])
+def test_batched_queries_match_single_queries(normalize, monkeypatch):
+    series = make_series()
+    queries = [series[800:820], series[1500:1564], series[95:115], series[300:320], series[1200:1264]]
+    # Force several FFT batches per query length.
+    monkeypatch.setattr(mass_index, 'BATCH_BYTES', 1)
+    profiles = dict(mass_batch(queries, series, normalize=normalize))
+    assert sorted(profiles) == list(range(len(queries)))
+    for position, query in enumerate(queries):
+        np.testing.assert_allclose(profiles[position], mass(query, series, normalize=normalize), atol=1e-8)
+
+
+@pytest.mark.parametrize('normalize', [True, False])
+def test_multidimensional_profiles_match_stumpy_per_channel(normalize):
+    rng = np.random.default_rng(1)
+    series = np.stack([make_series(), np.cumsum(rng.normal(size=2000)), np.sin(np.arange(2000) / 15)])
+    series[1, 1400:1410] = np.nan
+    for start, m in ((800, 20), (520, 30), (1395, 64)):
+        query = series[:, start:start + m].copy()
+        actual = multi_mass(query, series, normalize=normalize)
+        for channel in range(3):
+            expected = stumpy.mass(query[channel], series[channel], normalize=normalize)
+            np.testing.assert_array_equal(np.isfinite(actual[channel]), np.isfinite(expected))
+            finite = np.isfinite(expected)
+            np.testing.assert_allclose(actual[channel][finite], expected[finite], atol=1e-4)
+
+
+def test_multidimensional_index_keeps_the_stacked_series():
+    from tseapy.tasks.pattern_recognition.mass_index import get_multi_mass_index
+
+    channels = [make_series(), np.sin(np.arange(2000) / 15)]
+    for channel in channels:
+        channel.flags.writeable = False
+    keys = [series_key(channel) for channel in channels]
+    index = get_multi_mass_index(channels, keys)
+    assert get_multi_mass_index(channels, keys) is index
+    np.testing.assert_array_equal(index.T, np.stack(channels))
+    assert not index.T.flags.writeable
@@ -1,5 +1,8 @@
+import os
 import sys
 
+import pytest
+
 import app as app_module
 from app import app, create_app
 from tseapy import __version__
@@ -38,3 +41,97 @@ def test_cli_starts_app(monkeypatch):
     exit_code = cli.main()
     assert exit_code == 0
     assert called == {"host": "0.0.0.0", "port": 5055, "debug": True}
+
+
+def test_cli_serve_builds_gunicorn_options(monkeypatch):
+    from tseapy import server
+
+    called = {}
+
+    def fake_serve(options, warmup=None):
+        called["options"] = options
+        called["warmup"] = warmup
+        return 0
+
+    monkeypatch.setattr(server, "serve", fake_serve)
+    monkeypatch.setattr(
+        sys, "argv", ["tseapy", "serve", "--port", "8080", "--workers", "3", "--threads", "1", "--max-requests", "0"]
+    )
+
+    exit_code = cli.main()
+    assert exit_code == 0
+    options = called["options"]
+    assert options["bind"].endswith(":8080")
+    assert options["workers"] == 3
+    assert options["worker_class"] == "sync"
+    assert options["preload_app"] is True
+    assert options["max_requests"] == 0
+    assert options["max_requests_jitter"] == 0
+    assert called["warmup"] is None
+
+
+def test_server_options_use_threaded_workers():
+    from tseapy.server import server_options
+
+    options = server_options("0.0.0.0", 5000, workers=2, threads=4, preload=False)
+    assert options["bind"] == "0.0.0.0:5000"
+    assert options["worker_class"] == "gthread"
+    assert options["preload_app"] is False
+    assert options["max_requests"] == 1000
+    assert callable(options["post_fork"])
+
+
+def test_preload_demo_dataset_is_shared_with_sessions():
+    app_module.datasets.clear()
+    entry = app_module.preload_demo_dataset()
+    assert "profile" in entry.artifacts
+    assert app_module.datasets.stats()["unreferenced"] == 1
+    assert app_module.datasets.link("session", "raw", app_module.DEMO_DATASET_ID) is entry
+    app_module.datasets.clear()
+
+
+def test_serve_without_pyarrow_starts_one_worker_and_removes_its_temporary_directories(monkeypatch):
+    gunicorn_base = pytest.importorskip("gunicorn.app.base")
+    from tseapy import server
+
+    for name in ("TSEAPY_WORKSPACE_DIR", "TSEAPY_DATASET_STORE_DIR", "TSEAPY_CHUNKED_UPLOAD_DIR", "TSEAPY_JIT_CACHE_DIR"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("TSEAPY_SECRET_KEY", "test")
+    monkeypatch.setenv("TSEAPY_WARMUP", "0")
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    seen = {}
+
+    def fake_run(application):
+        seen["workers"] = application.cfg.workers
+        seen["jit_dir"] = os.environ["TSEAPY_JIT_CACHE_DIR"]
+        assert os.path.isdir(seen["jit_dir"])
+
+    monkeypatch.setattr(gunicorn_base.BaseApplication, "run", fake_run)
+    assert server.serve(server.server_options("127.0.0.1", 5000, workers=3), warmup=True) == 0
+    assert seen["workers"] == 1
+    assert not os.path.exists(seen["jit_dir"])
+    assert "TSEAPY_DATASET_STORE_DIR" not in os.environ
+    assert "TSEAPY_CHUNKED_UPLOAD_DIR" not in os.environ
+
+
+def test_serve_shares_temporary_upload_and_dataset_directories_between_workers(monkeypatch):
+    gunicorn_base = pytest.importorskip("gunicorn.app.base")
+    pytest.importorskip("pyarrow")
+    from tseapy import server
+
+    names = ("TSEAPY_WORKSPACE_DIR", "TSEAPY_DATASET_STORE_DIR", "TSEAPY_CHUNKED_UPLOAD_DIR", "TSEAPY_JIT_CACHE_DIR")
+    for name in names:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("TSEAPY_SECRET_KEY", "test")
+    monkeypatch.setenv("TSEAPY_WARMUP", "0")
+    seen = {}
+
+    def fake_run(application):
+        seen["workers"] = application.cfg.workers
+        seen["dirs"] = [os.environ["TSEAPY_DATASET_STORE_DIR"], os.environ["TSEAPY_CHUNKED_UPLOAD_DIR"]]
+        assert all(os.path.isdir(path) for path in seen["dirs"])
+
+    monkeypatch.setattr(gunicorn_base.BaseApplication, "run", fake_run)
+    assert server.serve(server.server_options("127.0.0.1", 5000, workers=2), warmup=False) == 0
+    assert seen["workers"] == 2
+    assert not any(os.path.exists(path) for path in seen["dirs"])
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from tseapy.core.parameters import RangeParameter, ListParameter
+from tseapy.core.parameters import NumberParameter, RangeParameter, ListParameter
 
 
 class TestAnalysisBackendParameter(TestCase):
@@ -25,3 +25,9 @@ class TestAnalysisBackendParameter(TestCase):
         actual_html = p.get_view()
         self.maxDiff = None
         self.assertEqual(expected_html, actual_html)
+
+    def test_optional_number_parameter_default_may_sit_on_a_bound(self):
+        p = NumberParameter(name='p', minimum=0, maximum=10, default=0, required=False)
+        self.assertFalse(p.required)
+        with self.assertRaises(ValueError):
+            NumberParameter(name='p', minimum=0, maximum=10, default=0)
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tseapy.tasks.pattern_recognition.matches import top_k_matches
+
+
+def test_matches_do_not_overlap_each_other_or_the_query():
+    profile = np.array([0.0, 0.1, 0.2, 5.0, 0.3, 0.4, 6.0, 0.5, 7.0, 8.0, 0.05, 9.0])
+    matches = top_k_matches(profile, k=3, exclusion_zone=3, excluded=[0])
+    assert matches.tolist() == [10, 4, 7]
+
+
+def test_fewer_matches_are_returned_when_the_series_runs_out():
+    profile = np.array([0.0, 1.0, 2.0, np.inf, 3.0])
+    assert top_k_matches(profile, k=10, exclusion_zone=2, excluded=[0]).tolist() == [2, 4]
+
+
+def test_maximum_distance_drops_distant_matches():
+    profile = np.array([0.0, 5.0, 1.0, 5.0, 2.0, 5.0, 3.0])
+    assert top_k_matches(profile, k=5, exclusion_zone=1, max_distance=2.0).tolist() == [0, 2, 4]
+
+
+def test_greedy_choice_is_exact_when_candidates_are_pooled():
+    rng = np.random.default_rng(3)
+    profile = rng.random(5000)
+    matches = top_k_matches(profile, k=20, exclusion_zone=40, excluded=[2500])
+
+    expected, blocked = [], [2500]
+    for position in np.argsort(profile, kind='stable'):
+        if all(abs(position - other) >= 40 for other in blocked):
+            expected.append(position)
+            blocked.append(position)
+        if len(expected) == 20:
+            break
+    assert matches.tolist() == expected
+
+
+def test_mass_reports_distinct_occurrences_of_a_repeated_shape():
+    pytest.importorskip('stumpy')
+    from tseapy.tasks.pattern_recognition.mass import Mass
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(scale=0.05, size=600)
+    bump = np.sin(np.linspace(0, np.pi, 20))
+    for start in (50, 200, 320, 480):
+        values[start:start + 20] += bump
+    data = pd.DataFrame({'f': values}, index=pd.date_range('2024-01-01', periods=600, freq='h'))
+    pattern = data['f'].iloc[50:70]
+
+    similar = Mass().do_analysis(data, 'f', pattern=pattern, nb_similar_patterns=3, normalize='true', p='2',
+                                 max_distance='0')
+    assert sorted(series.index[0] for series in similar) == list(data.index[[200, 320, 480]])
+    assert all(len(series) == 20 for series in similar)
+
+
+def test_profiles_combine_over_all_or_the_best_channels():
+    from tseapy.tasks.pattern_recognition.multidimensional_mass import combine_profiles
+
+    profiles = np.array([[1.0, 4.0, 0.0], [2.0, 0.5, np.inf], [3.0, 0.5, 1.0]])
+    assert combine_profiles(profiles).tolist() == [6.0, 5.0, np.inf]
+    assert combine_profiles(profiles, dimensions=2).tolist() == [3.0, 1.0, 1.0]
+    assert combine_profiles(profiles, dimensions=5).tolist() == [6.0, 5.0, np.inf]
+
+
+def test_multidimensional_mass_finds_joint_occurrences():
+    pytest.importorskip('stumpy')
+    from tseapy.tasks.pattern_recognition.multidimensional_mass import MultidimensionalMass
+
+    rng = np.random.default_rng(0)
+    a = rng.normal(scale=0.05, size=600)
+    b = rng.normal(scale=0.05, size=600)
+    bump = np.sin(np.linspace(0, np.pi, 20))
+    for start in (50, 200, 480):
+        a[start:start + 20] += bump
+        b[start:start + 20] -= bump
+    # Channel a alone also repeats the shape at 320, without b following it.
+    a[320:340] += bump
+    data = pd.DataFrame({'a': a, 'b': b, 'label': ['x'] * 600},
+                        index=pd.date_range('2024-01-01', periods=600, freq='h'))
+    pattern = data['a'].iloc[50:70]
+
+    backend = MultidimensionalMass()
+    similar = backend.do_analysis(data, 'a', pattern=pattern, nb_similar_patterns=2, normalize='true',
+                                  columns='', dimensions='0', max_distance='0')
+    assert sorted(series.index[0] for series in similar) == list(data.index[[200, 480]])
+    similar = backend.do_analysis(data, 'a', pattern=pattern, nb_similar_patterns=3, normalize='true',
+                                  columns='a', dimensions='0', max_distance='0')
+    assert sorted(series.index[0] for series in similar) == list(data.index[[200, 320, 480]])
+    with pytest.raises(ValueError):
+        backend.do_analysis(data, 'a', pattern=pattern, normalize='true', columns='a, missing', dimensions='0')
+
+
+def test_dtw_finds_time_warped_occurrences():
+    pytest.importorskip('numba')
+    pytest.importorskip('stumpy')
+    from tseapy.tasks.pattern_recognition.dtw import Dtw
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(scale=0.05, size=600)
+    shape = np.sin(np.linspace(0, 2 * np.pi, 30)) * np.linspace(1, 2, 30)
+    values[50:80] += shape
+    # The same shape stretched over 33 points and compressed into 27.
+    values[200:233] += np.interp(np.linspace(0, 29, 33), np.arange(30), shape)
+    values[400:427] += np.interp(np.linspace(0, 29, 27), np.arange(30), shape)
+    data = pd.DataFrame({'f': values}, index=pd.date_range('2024-01-01', periods=600, freq='h'))
+    pattern = data['f'].iloc[50:80]
+
+    similar = Dtw().do_analysis(data, 'f', pattern=pattern, nb_similar_patterns=2, normalize='true', window='0.2',
+                                max_distance='0')
+    starts = sorted(data.index.get_loc(series.index[0]) for series in similar)
+    assert abs(starts[0] - 200) <= 3 and abs(starts[1] - 400) <= 3
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from tseapy.data.profile import profile_frame
+
+
+def test_profile_classifies_columns_from_one_sample():
+    frame = pd.DataFrame({
+        'time': ['2024-01-02 10:00', '2024-01-01 09:00', None, '2024-01-03 08:00'],
+        'value': [1.0, None, 3.0, 5.0],
+        'label': ['a', 'b', 'c', 'd'],
+        'code': ['1x', '2y', '3z', '4w'],
+        'stamp': pd.date_range('2020-01-01', periods=4),
+    })
+    profile = profile_frame(frame)
+    assert profile.kinds() == {'time': 'date', 'value': 'numeric', 'label': 'text', 'code': 'text', 'stamp': 'date'}
+    assert profile.columns['time'].nulls == 1
+    assert profile.columns['time'].datetime_format == '%Y-%m-%d %H:%M'
+    assert profile.date_range == (pd.Timestamp('2024-01-01 09:00'), pd.Timestamp('2024-01-03 08:00'))
+
+
+def test_date_detection_samples_non_null_values_and_range_covers_every_row():
+    times = [None] * 150 + ['2024-03-01 00:00', '2023-01-01 00:00'] + ['2024-02-01 00:00'] * 300 + ['2024-01-15 00:00']
+    frame = pd.DataFrame({'time': times, 'value': np.arange(len(times), dtype=float)})
+    profile = profile_frame(frame, sample_rows=100)
+    assert profile.kinds()['time'] == 'date'
+    assert profile.date_range == (pd.Timestamp('2023-01-01'), pd.Timestamp('2024-03-01'))
+
+
+def test_numeric_statistics_match_numpy_across_chunks():
+    rng = np.random.default_rng(0)
+    values = 1e9 + rng.normal(size=1000)
+    values[::7] = np.nan
+    frame = pd.DataFrame({'a': values, 'b': np.arange(1000), 'empty': np.nan})
+    profile = profile_frame(frame, chunk_rows=64)
+    a = profile.columns['a']
+    assert a.count == np.count_nonzero(~np.isnan(values))
+    assert a.minimum == np.nanmin(values) and a.maximum == np.nanmax(values)
+    np.testing.assert_allclose(a.mean, np.nanmean(values))
+    np.testing.assert_allclose(a.std, np.nanstd(values), rtol=1e-6)
+    assert profile.columns['b'].mean == 499.5
+    assert profile.columns['empty'].mean is None and profile.columns['empty'].nulls == 1000
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from tseapy.data.pyramid import Pyramid, build_pyramids
+
+
+def make_series(size=100_000):
+    index = pd.date_range('2020-01-01', periods=size, freq='s')
+    values = np.sin(np.arange(size) / 500.0)
+    values[54_321] = 10.0
+    values[70_000] = -10.0
+    return index, values
+
+
+def test_levels_aggregate_min_max_and_mean():
+    index, values = make_series()
+    pyramid = Pyramid(values)
+    assert [level.bucket_size for level in pyramid.levels][:3] == [16, 64, 256]
+    for level in pyramid.levels:
+        assert level.count.sum() == len(values)
+        assert level.maximum.max() == 10.0
+        assert level.minimum.min() == -10.0
+        np.testing.assert_allclose(np.average(level.mean, weights=level.count), values.mean())
+        np.testing.assert_array_equal(values[level.argmax], level.maximum)
+
+
+def test_query_uses_raw_points_for_small_ranges():
+    index, values = make_series()
+    x, y, bucket_size = Pyramid(values).query(index, values, index[1000], index[1999], max_points=2000)
+    assert bucket_size == 1
+    assert len(x) == 1000
+    np.testing.assert_array_equal(y, values[1000:2000])
+
+
+def test_query_returns_envelope_within_budget():
+    index, values = make_series()
+    x, y, bucket_size = Pyramid(values).query(index, values, index[50_000], index[80_000], max_points=1000)
+    assert bucket_size > 1
+    assert len(x) <= 1000
+    assert x.is_monotonic_increasing
+    assert x[0] >= index[50_000] and x[-1] <= index[80_000]
+    assert y.max() == 10.0 and y.min() == -10.0
+
+
+def test_query_mean_and_gaps():
+    index, values = make_series()
+    values[20_000:40_000] = np.nan
+    pyramid = build_pyramids(pd.DataFrame({'v': values, 'label': 'a'}, index=index))
+    assert list(pyramid) == ['v']
+    x, y, _ = pyramid['v'].query(index, values, max_points=500)
+    assert np.isnan(y).any()
+    x, y, bucket_size = pyramid['v'].query(index, values, max_points=500, stat='mean')
+    assert len(x) == len(y) <= 500
+    assert x[0] == index[0]
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from tseapy.core.result_cache import ResultCache, dataset_fingerprint
+
+
+def test_make_key_normalizes_equivalent_parameters():
+    key_a = ResultCache.make_key('fp', 'smoothing', 'moving-average', 'f', {'window': '5', 'flag': 'True'})
+    key_b = ResultCache.make_key('fp', 'smoothing', 'moving-average', 'f', {'flag': 'true', 'window': '5.0'})
+    key_c = ResultCache.make_key('other', 'smoothing', 'moving-average', 'f', {'window': '5', 'flag': 'true'})
+    assert key_a == key_b
+    assert key_a != key_c
+
+
+def test_dataset_fingerprint_tracks_content():
+    index = pd.date_range('2020-01-01', periods=3, freq='D')
+    base = pd.DataFrame({'f': [1.0, 2.0, 3.0]}, index=index)
+    assert dataset_fingerprint(base) == dataset_fingerprint(base.copy())
+    assert dataset_fingerprint(base) != dataset_fingerprint(base.rename(columns={'f': 'g'}))
+    assert dataset_fingerprint(base) != dataset_fingerprint(base + 1)
+
+
+def test_eviction_keeps_expensive_results():
+    cache = ResultCache(max_bytes=250)
+    cache.set('expensive', 'x' * 100, cost=30.0)
+    cache.set('cheap', 'y' * 100, cost=0.01)
+    cache.set('new', 'z' * 100, cost=1.0)
+    assert cache.get('expensive') is not None
+    assert cache.get('cheap') is None
+    assert cache.get('new') is not None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    first = ResultCache(max_bytes=1024, directory=tmp_path)
+    first.set('key', '{"data": []}', cost=2.0)
+
+    second = ResultCache(max_bytes=1024, directory=tmp_path)
+    assert second.get('key') == '{"data": []}'
+    assert second.stats()['entries'] == 1
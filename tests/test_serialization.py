@@ -0,0 +1,65 @@
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from tseapy.core.serialization import (
+    choose_encoding,
+    epoch_milliseconds,
+    figure_to_json,
+    figure_to_plotly_json,
+    typed_array,
+)
+
+
+def decode(spec):
+    return np.frombuffer(base64.b64decode(spec['bdata']), dtype='<' + spec['dtype'])
+
+
+def test_typed_array_narrows_integers():
+    assert typed_array(np.arange(5, dtype=np.int64))['dtype'] == 'i4'
+    assert typed_array(np.array([0, 2 ** 40]))['dtype'] == 'f8'
+    assert typed_array(np.array([True, False]))['dtype'] == 'u1'
+    np.testing.assert_array_equal(decode(typed_array(np.array([1.5, np.nan]))), [1.5, np.nan])
+
+
+def test_epoch_milliseconds_uses_wall_time_and_nan_for_nat():
+    index = pd.DatetimeIndex(['2020-01-01 01:00', None]).tz_localize('Europe/Berlin')
+    milliseconds = epoch_milliseconds(index)
+    assert milliseconds[0] == pd.Timestamp('2020-01-01 01:00').value / 1e6
+    assert np.isnan(milliseconds[1])
+
+
+def test_figure_to_json_encodes_dates_and_values():
+    index = pd.date_range('2021-03-01', periods=4, freq='h')
+    fig = px.line(x=index, y=[1.0, 2.0, 3.0, 4.0])
+    fig.add_scatter(x=['a', 'b'], y=[1, 2], xaxis='x2')
+    figure = json.loads(figure_to_json(fig))
+    assert figure['layout']['xaxis']['type'] == 'date'
+    assert 'xaxis2' not in figure['layout']
+    np.testing.assert_array_equal(decode(figure['data'][0]['x']), index.asi8 / 1e6)
+    np.testing.assert_array_equal(decode(figure['data'][0]['y']), [1.0, 2.0, 3.0, 4.0])
+    assert figure['data'][1]['x'] == ['a', 'b']
+    assert fig.data[0].y.tolist() == [1.0, 2.0, 3.0, 4.0]
+
+
+def dumps_sorted(figure):
+    return json.dumps(figure, sort_keys=True, default=str)
+
+
+def test_figure_fast_path_matches_public_to_dict():
+    # The fast path reads plotly's private trace and layout dicts; this guards plotly upgrades.
+    index = pd.date_range('2021-03-01', periods=4, freq='h')
+    fig = px.line(x=index, y=[1.0, 2.0, 3.0, 4.0], title='t')
+    fig.add_scatter(x=['a', 'b'], y=[1, 2], name='second')
+    fig.add_vline(x=index[1])
+    assert dumps_sorted(figure_to_plotly_json(fig)) == dumps_sorted(figure_to_plotly_json(fig.to_dict()))
+
+
+def test_choose_encoding_respects_quality():
+    assert choose_encoding('') is None
+    assert choose_encoding('gzip;q=0, deflate') is None
+    assert choose_encoding('gzip, deflate') == 'gzip'
+    assert choose_encoding('*') in ('br', 'gzip')
@@ -0,0 +1,133 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from tseapy.data.registry import DatasetRegistry
+from tseapy.data.shared_store import DatasetRef, SharedDatasetStore, read_frame, write_frame
+from tseapy.data.workspace import load_secret_key, workspace_config
+
+
+def make_frame(n, value=0.0):
+    index = pd.date_range('2020-01-01', periods=n, freq='D')
+    return pd.DataFrame({'f': [value] * n, 'g': np.arange(n, dtype=float)}, index=index)
+
+
+def test_frames_round_trip_through_arrow_files(tmp_path):
+    frame = pd.DataFrame({
+        'value': [1.0, np.nan, 3.0],
+        'count': [1, 2, 3],
+        'label': ['a', None, 'c'],
+        'mixed': ['x', 2.5, None],
+        42: pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']),
+    })
+    write_frame(tmp_path / 'frame.arrow', frame)
+    restored = read_frame(tmp_path / 'frame.arrow')
+
+    assert list(restored.columns) == ['value', 'count', 'label', 'mixed', 42]
+    assert isinstance(restored.index, pd.RangeIndex)
+    pd.testing.assert_series_equal(restored['value'], frame['value'])
+    pd.testing.assert_series_equal(restored['count'], frame['count'])
+    pd.testing.assert_series_equal(restored[42], frame[42])
+    assert restored['label'].tolist() == ['a', None, 'c']
+    # Mixed object columns are stored as text.
+    assert restored['mixed'].tolist() == ['x', '2.5', None]
+
+
+def test_numeric_columns_and_datetime_index_are_read_only_views(tmp_path):
+    frame = make_frame(10)
+    write_frame(tmp_path / 'frame.arrow', frame)
+    restored = read_frame(tmp_path / 'frame.arrow')
+
+    pd.testing.assert_frame_equal(restored, frame, check_freq=False)
+    values = restored['g'].to_numpy()
+    assert not values.flags.writeable
+    assert not values.flags.owndata
+
+
+def test_workers_share_datasets_through_the_store(tmp_path):
+    worker_a = DatasetRegistry(store=SharedDatasetStore(tmp_path))
+    worker_b = DatasetRegistry(store=SharedDatasetStore(tmp_path))
+
+    worker_a.put('session', 'active', make_frame(5, 1.0))
+    entry = worker_b.get('session', 'active')
+    assert entry is not None
+    assert entry.frame['f'].iloc[0] == 1.0
+    assert worker_b.get('other', 'active') is None
+
+    worker_b.discard('session', 'active')
+    assert worker_a.get('session', 'active') is None
+    assert worker_a.stats()['datasets'] == 0
+    assert list(tmp_path.glob('*.arrow')) == []
+
+
+def test_shared_content_outlives_its_slots_until_it_expires(tmp_path):
+    registry = DatasetRegistry(store=SharedDatasetStore(tmp_path), ttl=60)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return make_frame(5)
+
+    registry.put_shared('a', 'raw', 'digest', load)
+    registry.discard('a', 'raw')
+    assert registry.stats()['unreferenced'] == 1
+
+    other_worker = DatasetRegistry(store=SharedDatasetStore(tmp_path), ttl=60)
+    other_worker.put_shared('b', 'raw', 'digest', load)
+    assert len(loads) == 1
+
+    other_worker.discard('b', 'raw')
+    other_worker.store.expire(ttl=-1)
+    assert other_worker.stats()['datasets'] == 0
+    assert not other_worker.store.path('digest').exists()
+
+
+def test_idle_workspaces_expire_from_the_store(tmp_path):
+    registry = DatasetRegistry(store=SharedDatasetStore(tmp_path), ttl=60)
+    registry.put('a', 'active', make_frame(3))
+    registry.store.expire(ttl=-1)
+    assert registry.get('a', 'active') is None
+    assert registry.stats()['workspaces'] == 0
+
+
+def test_dataset_references_are_picklable_and_map_the_file(tmp_path):
+    registry = DatasetRegistry(store=SharedDatasetStore(tmp_path))
+    entry = registry.put('a', 'active', make_frame(4, 2.0))
+
+    reference = pickle.loads(pickle.dumps(entry.reference))
+    assert isinstance(reference, DatasetRef)
+    pd.testing.assert_frame_equal(reference.load(), entry.frame, check_freq=False)
+
+    registry.discard('a', 'active')
+    with pytest.raises(ValueError):
+        reference.load()
+
+
+def test_restarted_registry_restores_datasets_and_artifacts_lazily(tmp_path):
+    before = DatasetRegistry(store=SharedDatasetStore(tmp_path))
+    entry = before.put('session', 'active', make_frame(6, 3.0))
+    before.artifact(entry, 'profile', lambda: {'rows': 6})
+
+    after = DatasetRegistry(store=SharedDatasetStore(tmp_path))
+    assert after.stats()['resident'] == 0
+    restored = after.get('session', 'active')
+    pd.testing.assert_frame_equal(restored.frame, entry.frame, check_freq=False)
+    assert after.artifact(restored, 'profile', lambda: pytest.fail('profile was rebuilt')) == {'rows': 6}
+
+    after.discard('session', 'active')
+    assert list((tmp_path / 'artifacts').iterdir()) == []
+
+
+def test_workspace_directory_keeps_its_settings_and_session_key(tmp_path):
+    config = workspace_config(tmp_path / 'workspace')
+    assert config['DATASET_STORE_DIR'] == str(tmp_path / 'workspace' / 'datasets')
+    assert config['RESULT_CACHE_DIR'] == str(tmp_path / 'workspace' / 'results')
+    assert config['CHUNKED_UPLOAD_DIR'] == str(tmp_path / 'workspace' / 'uploads')
+    assert len(config['SECRET_KEY']) == 64
+    assert workspace_config(tmp_path / 'workspace')['SECRET_KEY'] == config['SECRET_KEY']
+    assert load_secret_key(tmp_path / 'workspace') == config['SECRET_KEY']
+    assert [path.name for path in (tmp_path / 'workspace').iterdir()] == ['secret_key']
@@ -70,3 +70,25 @@ class TestTask(TestCase):
         self.assertIn("fetch(url, {method: 'GET'})", actual_javascript)
         self.assertIn("Plotly.newPlot(resultsDiv, data, layout, config);", actual_javascript)
         self.assertIn("Plotly.react(resultsDiv, data, layout, config);", actual_javascript)
+        self.assertIn("var analysisJobsUrl = null;", actual_javascript)
+
+    def test_get_parameter_script_polls_jobs(self):
+        task = DummyTask(task_name='task', short_description='', long_description='')
+        task.add_analysis_backend(
+            DummyBackend(
+                name='algo',
+                short_description='short description',
+                long_description='long description',
+                callback_url="'/task/algo/compute'",
+                parameters=[],
+            )
+        )
+        actual_javascript = task.get_parameter_script(
+            'algo',
+            analysis_url="/task/algo/compute",
+            jobs_url="/task/algo/jobs",
+        )
+        self.assertIn("var analysisJobsUrl = '/task/algo/jobs';", actual_javascript)
+        self.assertIn("fetch(analysisJobsUrl + query, {method: 'POST'})", actual_javascript)
+        self.assertIn("fetch(job.status_url, {method: 'GET'})", actual_javascript)
+        self.assertIn("fetch(currentAnalysisJob.status_url, {method: 'DELETE'})", actual_javascript)
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('numba')
+pytest.importorskip('stumpy')
+
+from tseapy.tasks.pattern_recognition.matches import top_k_matches
+from tseapy.tasks.pattern_recognition.ucr_dtw import _rolling_mean_std, dtw_search
+
+
+def brute_force_dtw(query, series, r, normalize):
+    def prepare(values):
+        if not normalize:
+            return values
+        std = values.std()
+        return (values - values.mean()) / (std if std >= 1e-8 else 1.0)
+
+    m = len(query)
+    q = prepare(query)
+    profile = np.full(len(series) - m + 1, np.inf)
+    for start in range(len(profile)):
+        window = series[start:start + m]
+        if not np.isfinite(window).all():
+            continue
+        t = prepare(window)
+        cost = np.full((m + 1, m + 1), np.inf)
+        cost[0, 0] = 0.0
+        for i in range(1, m + 1):
+            for j in range(max(1, i - r), min(m, i + r) + 1):
+                cost[i, j] = (t[i - 1] - q[j - 1]) ** 2 + min(cost[i - 1, j], cost[i, j - 1], cost[i - 1, j - 1])
+        profile[start] = np.sqrt(cost[m, m])
+    return profile
+
+
+@pytest.mark.parametrize('normalize', [True, False])
+@pytest.mark.parametrize('start, m, window, k', [(100, 30, 0.1, 3), (600, 40, 0.2, 5), (50, 8, 0.0, 4),
+                                                 (420, 25, 1.0, 2)])
+def test_matches_are_those_of_a_full_dtw_scan(normalize, start, m, window, k):
+    rng = np.random.default_rng(0)
+    series = np.cumsum(rng.normal(size=800))
+    series[300:305] = np.nan
+    query = series[start:start + m].copy()
+
+    expected = brute_force_dtw(query, series, int(np.floor(window * m)), normalize)
+    profile = dtw_search(query, series, k, window=window, normalize=normalize, query_index=start)
+    expected_matches = top_k_matches(expected, k, m, excluded=[start])
+    matches = top_k_matches(profile, k, m, excluded=[start])
+    assert matches.tolist() == expected_matches.tolist()
+    np.testing.assert_allclose(profile[matches], expected[matches])
+    # Most windows are pruned without a full DTW.
+    assert np.isfinite(profile).sum() < len(profile) // 2
+
+
+def test_maximum_distance_limits_the_matches():
+    rng = np.random.default_rng(1)
+    series = np.cumsum(rng.normal(size=500))
+    query = series[200:220].copy()
+    expected = brute_force_dtw(query, series, 2, True)
+    limit = float(np.sort(expected[np.isfinite(expected)])[20])
+    profile = dtw_search(query, series, 5, window=0.1, max_distance=limit)
+    assert (top_k_matches(profile, 5, 20, max_distance=limit).tolist()
+            == top_k_matches(expected, 5, 20, max_distance=limit).tolist())
+
+
+@pytest.mark.parametrize('seed', [7, 17, 45, 59])
+def test_maximum_distance_keeps_matches_at_exactly_that_distance(seed):
+    rng = np.random.default_rng(seed)
+    n, m, k = int(rng.integers(60, 200)), int(rng.integers(4, 20)), int(rng.integers(1, 5))
+    normalize = bool(rng.integers(2))
+    series = np.cumsum(rng.normal(size=n))
+    query = series[10:10 + m].copy()
+    unlimited = dtw_search(query, series, k, window=0.1, normalize=normalize, query_index=10)
+    expected_matches = top_k_matches(unlimited, k, m, excluded=[10])
+    limit = float(unlimited[expected_matches[-1]])
+    profile = dtw_search(query, series, k, window=0.1, normalize=normalize, query_index=10, max_distance=limit)
+    assert top_k_matches(profile, k, m, excluded=[10], max_distance=limit).tolist() == expected_matches.tolist()
+
+
+@pytest.mark.parametrize('seed', list(range(30)) + [49, 171])
+def test_random_searches_match_a_full_dtw_scan(seed):
+    # Short series and many matches, where the greedy selection can rule out two
+    # of the Euclidean seeds and must not be limited by their distances.
+    rng = np.random.default_rng(seed)
+    n, m, k = int(rng.integers(60, 200)), int(rng.integers(4, 20)), int(rng.integers(1, 7))
+    window, normalize = float(rng.choice([0.0, 0.1, 0.3, 1.0])), bool(rng.integers(2))
+    series = rng.normal(size=n) if rng.integers(2) else np.cumsum(rng.normal(size=n))
+    query = rng.normal(size=m)
+    expected = brute_force_dtw(query, series, int(np.floor(window * m)), normalize)
+    limit = None
+    if rng.integers(2):
+        finite = np.sort(expected[np.isfinite(expected)])
+        limit = float(finite[int(rng.integers(len(finite)))])
+    profile = dtw_search(query, series, k, window=window, normalize=normalize, max_distance=limit)
+    assert (top_k_matches(profile, k, m, max_distance=limit).tolist()
+            == top_k_matches(expected, k, m, max_distance=limit).tolist())
+
+
+def test_rolling_statistics_match_numpy():
+    rng = np.random.default_rng(2)
+    series = 1000 + np.cumsum(rng.normal(size=10000))
+    series[5000] = np.nan
+    means, stds = _rolling_mean_std(series, 50)
+    windows = np.lib.stride_tricks.sliding_window_view(series, 50)
+    finite = np.isfinite(windows).all(axis=1)
+    np.testing.assert_allclose(means[finite], windows[finite].mean(axis=1))
+    np.testing.assert_allclose(stds[finite], windows[finite].std(axis=1), rtol=1e-6)
+    assert np.isinf(means[~finite]).all()
+
+
+def test_invalid_searches_are_rejected():
+    series = np.sin(np.arange(200) / 5)
+    with pytest.raises(ValueError):
+        dtw_search(series[:10], series, 3, window=1.5)
+    with pytest.raises(ValueError):
+        dtw_search(np.ones(300), series, 3)
+    assert np.isinf(dtw_search(np.array([1.0, np.nan, 2.0, 3.0]), series, 3)).all()
@@ -1,8 +1,20 @@
+import gzip
 import io
 
+import pandas as pd
+import pytest
 from werkzeug.datastructures import FileStorage
 
-from tseapy.data.upload import CSVUploadError, parse_csv_upload
+from tseapy.data import upload
+from tseapy.data.upload import (
+    CSVUploadError,
+    UploadError,
+    detect_delimiter,
+    detect_encoding,
+    parse_csv_upload,
+    parse_upload,
+    upload_format,
+)
 
 
 def test_parse_csv_upload_autodetects_delimiter():
@@ -19,3 +31,64 @@ def test_parse_csv_upload_empty_file():
     except CSVUploadError:
         return
     assert False, "Expected CSVUploadError for empty file"
+
+
+def test_detect_encoding_and_delimiter_from_prefix():
+    assert detect_encoding(b"\xef\xbb\xbfa,b\n") == "utf-8-sig"
+    assert detect_encoding("zeit;wert\n".encode("utf-8")) == "utf-8"
+    assert detect_delimiter("a\tb\n1\t2\n") == "\t"
+    assert detect_delimiter('"x,y"|b\n"1,2"|3\n') == "|"
+
+
+@pytest.mark.parametrize("engine", ["auto", "c", "python"])
+def test_parse_csv_upload_engines_agree(engine):
+    content = "time;value;label\n" + "".join(f"2020-01-{day:02d};{day}.5;\"a;b\"\n" for day in range(1, 29))
+    storage = FileStorage(stream=io.BytesIO(content.encode("utf-8")), filename="a.csv")
+    dataframe = parse_csv_upload(storage, engine=engine)
+    assert dataframe.columns.tolist() == ["time", "value", "label"]
+    assert dataframe["value"].iloc[-1] == 28.5
+    assert dataframe["label"].iloc[0] == "a;b"
+
+
+def test_parse_csv_upload_falls_back_when_prefix_types_do_not_hold(monkeypatch):
+    monkeypatch.setattr(upload, "SNIFF_BYTES", 64)
+    content = "a,b\n" + "1.5,x\n" * 50 + "oops,y\n"
+    storage = FileStorage(stream=io.BytesIO(content.encode("utf-8")), filename="a.csv")
+    dataframe = parse_csv_upload(storage)
+    assert len(dataframe) == 51
+    assert dataframe["a"].iloc[-1] == "oops"
+
+
+def test_upload_format_matches_compound_suffixes():
+    assert upload_format("data.CSV.GZ") == ("csv", "gzip")
+    assert upload_format("data.parquet") == ("parquet", None)
+    assert upload_format("data.txt") is None
+    assert upload_format(".csv") is None
+
+
+def test_parse_upload_decompresses_csv_in_chunks():
+    payload = gzip.compress(b"a,b\n" + b"1,2\n" * 1000)
+    storage = FileStorage(stream=io.BytesIO(payload), filename="a.csv.gz")
+    assert len(parse_upload(storage)) == 1000
+    storage = FileStorage(stream=io.BytesIO(payload), filename="a.csv.gz")
+    with pytest.raises(UploadError, match="exceeds the limit"):
+        parse_upload(storage, max_decompressed_bytes=100)
+    storage = FileStorage(stream=io.BytesIO(b"not gzip"), filename="a.csv.gz")
+    with pytest.raises(UploadError):
+        parse_upload(storage)
+
+
+@pytest.mark.parametrize("suffix", ["parquet", "feather"])
+def test_parse_upload_reads_columnar_files(tmp_path, suffix):
+    pytest.importorskip("pyarrow")
+    frame = pd.DataFrame({"value": [1.0, 2.0, 3.0]}, index=pd.date_range("2024-01-01", periods=3, name="time"))
+    path = tmp_path / f"data.{suffix}"
+    if suffix == "parquet":
+        frame.to_parquet(path)
+    else:
+        frame.reset_index().to_feather(path)
+    with open(path, "rb") as handle:
+        dataframe = parse_upload(FileStorage(stream=handle, filename=path.name))
+    assert dataframe.columns.tolist() == ["time", "value"]
+    assert pd.api.types.is_datetime64_any_dtype(dataframe["time"])
+    assert dataframe["value"].tolist() == [1.0, 2.0, 3.0]
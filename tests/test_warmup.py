@@ -0,0 +1,77 @@
+import time
+
+from flask import Flask
+
+from tseapy.core.tasks import TasksList
+from tseapy.core.warmup import WarmupManager, default_arguments, synthetic_frame, warm_up
+from tseapy.tasks.pattern_recognition import PatternRecognition
+from tseapy.tasks.pattern_recognition.mass import Mass
+from tseapy.tasks.smoothing import Smoothing
+from tseapy.tasks.smoothing.moving_average import MovingAverage
+
+
+class FailingMovingAverage(MovingAverage):
+    def __init__(self):
+        super().__init__()
+        self.name = 'failing'
+
+    def do_analysis(self, data, feature, **kwargs):
+        raise ImportError("No module named 'missing'")
+
+
+def registry():
+    smoothing = Smoothing()
+    smoothing.add_analysis_backend(MovingAverage())
+    smoothing.add_analysis_backend(FailingMovingAverage())
+    pattern_recognition = PatternRecognition()
+    pattern_recognition.add_analysis_backend(Mass())
+    tasks = TasksList()
+    tasks.add_task(smoothing)
+    tasks.add_task(pattern_recognition)
+    return tasks
+
+
+def test_default_arguments_are_form_values():
+    arguments = default_arguments(Mass())
+    assert arguments['nb_similar_patterns'] == '5'
+
+
+def test_synthetic_frame_is_a_regular_series():
+    frame = synthetic_frame(64)
+    assert len(frame) == 64
+    assert frame.index.is_monotonic_increasing
+    assert frame['value'].notna().all()
+
+
+def test_warm_up_runs_every_backend_and_records_failures():
+    results = warm_up(registry())
+    assert set(results) == {'smoothing/moving-average', 'smoothing/failing', 'pattern-recognition/mass'}
+    assert results['smoothing/moving-average']['error'] is None
+    assert results['pattern-recognition/mass']['error'] is None
+    assert "missing" in results['smoothing/failing']['error']
+    assert all(result['seconds'] >= 0 for result in results.values())
+
+
+def test_manager_reports_ready_after_warm_up():
+    app = Flask(__name__)
+    app.config.update(WARMUP=True)
+    manager = WarmupManager()
+    manager.init_app(app)
+    assert not manager.ready
+
+    manager.start(registry())
+    deadline = time.time() + 60
+    while not manager.ready and time.time() < deadline:
+        time.sleep(0.05)
+    assert manager.ready
+    status = manager.to_dict()
+    assert status['state'] == 'done'
+    assert 'smoothing/moving-average' in status['backends']
+
+
+def test_manager_is_ready_when_disabled():
+    manager = WarmupManager()
+    manager.init_app(Flask(__name__))
+    manager.start(registry())
+    assert manager.ready
+    assert manager.to_dict()['state'] == 'disabled'
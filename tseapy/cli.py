@@ -1,4 +1,59 @@
 import argparse
+import os
+
+
+def _add_serve_parser(subparsers):
+    serve = subparsers.add_parser(
+        "serve",
+        help="Run the multi-process production server (requires tseapy[server]).",
+        description="Run tseapy under gunicorn with preloaded, forked workers.",
+    )
+    serve.add_argument("--host", default=os.getenv("TSEAPY_HOST", "127.0.0.1"),
+                       help="Host interface to bind (default: TSEAPY_HOST or 127.0.0.1).")
+    serve.add_argument("--port", default=int(os.getenv("TSEAPY_PORT", "5000")), type=int,
+                       help="Port to bind (default: TSEAPY_PORT or 5000).")
+    serve.add_argument("--workers", default=int(os.getenv("TSEAPY_WORKERS", "2")), type=int,
+                       help="Worker processes (default: TSEAPY_WORKERS or 2).")
+    serve.add_argument("--threads", default=int(os.getenv("TSEAPY_THREADS", "4")), type=int,
+                       help="Request threads per worker (default: TSEAPY_THREADS or 4).")
+    serve.add_argument("--max-requests", default=int(os.getenv("TSEAPY_MAX_REQUESTS", "1000")), type=int,
+                       help="Replace a worker after this many requests; 0 disables recycling (default: 1000).")
+    serve.add_argument("--max-requests-jitter", default=100, type=int,
+                       help="Random extra requests before recycling, so workers restart at different times "
+                            "(default: 100).")
+    serve.add_argument("--timeout", default=120, type=int,
+                       help="Seconds a silent worker may take before it is killed and restarted (default: 120).")
+    serve.add_argument("--graceful-timeout", default=30, type=int,
+                       help="Seconds workers get to finish requests on reload or shutdown (default: 30).")
+    serve.add_argument("--preload", dest="preload", action="store_true",
+                       help="Load the app, backend libraries and demo dataset before forking workers (default).")
+    serve.add_argument("--no-preload", dest="preload", action="store_false",
+                       help="Load the app separately in each worker.")
+    serve.add_argument("--warmup", dest="warmup", action="store_true",
+                       help="Warm up the analysis backends in every worker (default: TSEAPY_WARMUP).")
+    serve.add_argument("--no-warmup", dest="warmup", action="store_false", help="Disable backend warm-up.")
+    serve.set_defaults(preload=True, warmup=None)
+
+
+def _serve(args) -> int:
+    from tseapy.server import serve, server_options
+
+    options = server_options(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        threads=args.threads,
+        preload=args.preload,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        timeout=args.timeout,
+        graceful_timeout=args.graceful_timeout,
+    )
+    try:
+        return serve(options, warmup=args.warmup)
+    except RuntimeError as exc:
+        print(exc)
+        return 2
 
 
 def main() -> int:
@@ -7,9 +62,25 @@ def main() -> int:
     parser.add_argument("--port", default=5000, type=int, help="Port to bind (default: 5000).")
     parser.add_argument("--debug", dest="debug", action="store_true", help="Enable Flask debug mode.")
     parser.add_argument("--no-debug", dest="debug", action="store_false", help="Disable Flask debug mode.")
+    parser.add_argument(
+        "--import-report",
+        action="store_true",
+        help="Print the import time and memory each analysis backend costs, then exit.",
+    )
     parser.set_defaults(debug=None)
+    subparsers = parser.add_subparsers(dest="command")
+    _add_serve_parser(subparsers)
     args = parser.parse_args()
 
+    if args.import_report:
+        from tseapy.core.backend_registry import format_import_report, import_report
+
+        print(format_import_report(import_report()))
+        return 0
+
+    if args.command == "serve":
+        return _serve(args)
+
     from app import main as run_main
 
     run_main(host=args.host, port=args.port, debug=args.debug)
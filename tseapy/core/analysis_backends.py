@@ -6,7 +6,16 @@ from tseapy.core import create_callback_url
 
 
 class AnalysisBackend(abc.ABC):
-    """Base class for analysis backends."""
+    """
+    Base class for analysis backends.
+
+    Constructing a backend only records its metadata. Heavy libraries are imported
+    inside :meth:`do_analysis` and listed in :attr:`requires`, so building the task
+    registry stays cheap and the import-cost report knows what each backend loads.
+    """
+
+    #: Modules :meth:`do_analysis` imports on first use.
+    requires: tuple = ()
 
     def __init__(self, name: str, short_description: str, long_description: str,
                  callback_url: str, parameters: List[AnalysisBackendParameter], required_query_params=None):
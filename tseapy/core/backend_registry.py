@@ -0,0 +1,167 @@
+import importlib
+import json
+import logging
+import subprocess
+import sys
+from importlib.metadata import entry_points
+
+from tseapy.core.tasks import TasksList
+
+logger = logging.getLogger(__name__)
+
+#: Entry point group third-party packages use to register backends. The entry point
+#: name is ``<task>.<algorithm>`` and its value the backend class, e.g.
+#: ``"pattern-recognition.fast-mass" = "mypackage.mass:FastMass"``.
+ENTRY_POINT_GROUP = "tseapy.backends"
+
+#: Built-in tasks and their backends as ``module:attribute`` references, in display order.
+BUILTIN_TASKS = (
+    ("tseapy.tasks.pattern_recognition:PatternRecognition", (
+        "tseapy.tasks.pattern_recognition.mass:Mass",
+        "tseapy.tasks.pattern_recognition.multidimensional_mass:MultidimensionalMass",
+        "tseapy.tasks.pattern_recognition.dtw:Dtw",
+    )),
+    ("tseapy.tasks.change_in_mean:ChangeInMean", (
+        "tseapy.tasks.change_in_mean.pelt_l2:PeltL2",
+        "tseapy.tasks.change_in_mean.sliding_window_l2:SlidingWindowL2",
+    )),
+    ("tseapy.tasks.motif_detection:MotifDetection", (
+        "tseapy.tasks.motif_detection.matrixprofile:Matrixprofile",
+        "tseapy.tasks.motif_detection.pan_matrixprofile:PanMatrixprofile",
+    )),
+    ("tseapy.tasks.smoothing:Smoothing", (
+        "tseapy.tasks.smoothing.moving_average:MovingAverage",
+    )),
+    ("tseapy.tasks.forecasting:Forecasting", (
+        "tseapy.tasks.forecasting.auto_arima:AutoArimaBackend",
+        "tseapy.tasks.forecasting.auto_ets:AutoEtsBackend",
+        "tseapy.tasks.forecasting.auto_theta:AutoThetaBackend",
+        "tseapy.tasks.forecasting.naive:NaiveBackend",
+        "tseapy.tasks.forecasting.seasonal_naive:SeasonalNaiveBackend",
+        "tseapy.tasks.forecasting.historic_average:HistoricAverageBackend",
+        "tseapy.tasks.forecasting.lightgbm_mlforecast:LightGBMMLForecastBackend",
+        "tseapy.tasks.forecasting.xgboost_mlforecast:XGBoostMLForecastBackend",
+        "tseapy.tasks.forecasting.comparison:ForecastComparisonBackend",
+    )),
+    ("tseapy.tasks.decomposition:Decomposition", (
+        "tseapy.tasks.decomposition.stl:STLBackend",
+        "tseapy.tasks.decomposition.classical:ClassicalDecompositionBackend",
+    )),
+    ("tseapy.tasks.frequency_analysis:FrequencyAnalysis", (
+        "tseapy.tasks.frequency_analysis.welch:WelchBackend",
+        "tseapy.tasks.frequency_analysis.lomb_scargle:LombScargleBackend",
+        "tseapy.tasks.frequency_analysis.stft:STFTBackend",
+    )),
+)
+
+
+def load_object(reference: str):
+    """Import ``module:attribute`` and return the attribute."""
+    module_name, _, attribute = reference.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def iter_plugin_backends():
+    """Yield ``(task name, entry point)`` for backends registered by installed packages."""
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        task_name, _, _ = entry_point.name.partition(".")
+        yield task_name, entry_point
+
+
+def build_tasks_registry(include_plugins: bool = True) -> TasksList:
+    """
+    Instantiate the built-in tasks and backends, then add backends from entry points.
+
+    Backends only describe themselves when constructed; their heavy dependencies
+    are imported on the first :meth:`~tseapy.core.analysis_backends.AnalysisBackend.do_analysis`.
+    A plugin that fails to load or names an unknown task is logged and skipped.
+    """
+    registry = TasksList()
+    for task_reference, backend_references in BUILTIN_TASKS:
+        task = load_object(task_reference)()
+        for backend_reference in backend_references:
+            task.add_analysis_backend(load_object(backend_reference)())
+        registry.add_task(task)
+    if not include_plugins:
+        return registry
+    for task_name, entry_point in iter_plugin_backends():
+        try:
+            task = registry.get_tasks(task_name)
+            task.add_analysis_backend(entry_point.load()())
+        except Exception:
+            logger.exception("Could not load tseapy backend plugin %r", entry_point.name)
+    return registry
+
+
+_IMPORT_COST_SCRIPT = """
+import importlib, json, sys, time
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None
+
+baseline, modules = sys.argv[1].split(","), sys.argv[2:]
+for module in baseline:
+    importlib.import_module(module)
+before, started = rss_mb(), time.perf_counter()
+for module in modules:
+    importlib.import_module(module)
+seconds = time.perf_counter() - started
+after = rss_mb()
+print(json.dumps({"seconds": seconds, "rss_mb": None if after is None else after - before}))
+"""
+
+
+def measure_import_cost(modules, baseline=("pandas", "tseapy.core.tasks")) -> dict:
+    """
+    Import ``modules`` in a fresh interpreter and return ``{"seconds": ..., "rss_mb": ...}``.
+
+    The ``baseline`` modules are imported first and not counted, so what every
+    backend shares (pandas, the task module) does not show up in each backend's
+    cost. ``rss_mb`` is the growth of the peak resident set and is ``None`` where
+    :mod:`resource` is unavailable.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", _IMPORT_COST_SCRIPT, ",".join(baseline), *modules],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {"seconds": None, "rss_mb": None, "error": error[-1] if error else "import failed"}
+    return json.loads(completed.stdout)
+
+
+def import_report(registry: TasksList | None = None) -> list:
+    """
+    Return the import cost of every registered backend, most expensive first.
+
+    Each row holds the task, backend name, implementing module, the modules it
+    loads on first use (:attr:`~tseapy.core.analysis_backends.AnalysisBackend.requires`)
+    and their measured cost (see :func:`measure_import_cost`).
+    """
+    registry = registry or build_tasks_registry()
+    rows = []
+    for task in registry.iter_tasks():
+        for backend in task.analysis_backend_factory.iter_backends():
+            module = type(backend).__module__
+            row = {"task": task.name, "backend": backend.name, "module": module, "requires": list(backend.requires)}
+            row.update(measure_import_cost([module, *backend.requires], baseline=("pandas", type(task).__module__)))
+            rows.append(row)
+    rows.sort(key=lambda row: row["seconds"] if row["seconds"] is not None else -1, reverse=True)
+    return rows
+
+
+def format_import_report(rows) -> str:
+    lines = [f"{'task':<20} {'backend':<24} {'seconds':>8} {'RSS MB':>8}  requires"]
+    for row in rows:
+        seconds = f"{row['seconds']:.3f}" if row["seconds"] is not None else "failed"
+        rss = f"{row['rss_mb']:.1f}" if row["rss_mb"] is not None else "-"
+        requires = ", ".join(row["requires"]) or "-"
+        if row.get("error"):
+            requires += f" ({row['error']})"
+        lines.append(f"{row['task']:<20} {row['backend']:<24} {seconds:>8} {rss:>8}  {requires}")
+    return "\n".join(lines)
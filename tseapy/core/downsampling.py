@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+#: Per-point trace attributes that must be subset together with ``x`` and ``y``.
+_POINT_ATTRIBUTES = ("text", "hovertext", "customdata")
+_MARKER_ATTRIBUTES = ("color", "size", "symbol")
+
+
+def points_for_width(plot_width, max_points: int) -> int:
+    """
+    Return the number of points worth sending to a chart ``plot_width`` pixels wide.
+
+    Two points per pixel column keep the min/max envelope of every column; the
+    result is capped by ``max_points``. Widths are rounded up to a multiple of 256
+    so nearby window sizes share cached results. A missing or invalid width gives
+    ``max_points``.
+    """
+    try:
+        width = int(float(plot_width))
+    except (TypeError, ValueError):
+        return max_points
+    if width <= 0:
+        return max_points
+    width = -(-width // 256) * 256
+    return min(max_points, 2 * width)
+
+
+def _numeric_axis(x) -> np.ndarray:
+    """Return ``x`` as float64 positions, falling back to point numbers for categorical axes."""
+    values = np.asarray(x)
+    if values.dtype.kind in "iuf":
+        return values.astype(np.float64, copy=False)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[ns]").view(np.int64).astype(np.float64)
+    try:
+        return pd.DatetimeIndex(values).asi8.astype(np.float64)
+    except (TypeError, ValueError):
+        return np.arange(len(values), dtype=np.float64)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Select ``n_out`` point indices with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between keeps the
+    point forming the largest triangle with the previously kept point and the mean
+    of the next bucket, which preserves the visual shape of the line. ``y`` must
+    not contain NaN (use :func:`minmax_indices` for series with gaps).
+    """
+    x = _numeric_axis(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_start = stop
+        mean_x = x[next_start:next_stop].mean()
+        mean_y = y[next_start:next_stop].mean()
+        ax, ay = x[selected], y[selected]
+        area = np.abs(
+            (ax - mean_x) * (y[start:stop] - ay) - (ax - x[start:stop]) * (mean_y - ay)
+        )
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """
+    Select about ``n_out`` point indices keeping each bucket's minimum and maximum.
+
+    The envelope is exact, so spikes survive downsampling. A bucket that contains
+    missing values also keeps its first NaN so Plotly still draws the gap.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    kept = [0, n - 1]
+    missing = np.isnan(y)
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop <= start:
+            continue
+        bucket = y[start:stop]
+        bucket_missing = missing[start:stop]
+        if bucket_missing.any():
+            kept.append(start + int(np.argmax(bucket_missing)))
+            if bucket_missing.all():
+                continue
+            kept.append(start + int(np.nanargmin(bucket)))
+            kept.append(start + int(np.nanargmax(bucket)))
+        else:
+            kept.append(start + int(np.argmin(bucket)))
+            kept.append(start + int(np.argmax(bucket)))
+    return np.unique(np.asarray(kept, dtype=np.int64))
+
+
+def downsample_indices(x, y, max_points: int) -> np.ndarray:
+    """Pick LTTB for complete numeric series and the min/max envelope for series with gaps."""
+    values = np.asarray(y)
+    if len(values) <= max_points:
+        return np.arange(len(values))
+    if values.dtype.kind not in "iufb":
+        try:
+            values = values.astype(np.float64)
+        except (TypeError, ValueError):
+            # Non-numeric y cannot be ranked; keep evenly spaced points instead.
+            return np.unique(np.linspace(0, len(values) - 1, max_points).astype(np.int64))
+    values = values.astype(np.float64, copy=False)
+    if np.isnan(values).any():
+        return minmax_indices(values, max_points)
+    return lttb_indices(x, values, max_points)
+
+
+def _take(values, indices):
+    if isinstance(values, (pd.Index, pd.Series)):
+        return values.to_numpy()[indices]
+    return np.asarray(values)[indices]
+
+
+def _is_line_trace(trace) -> bool:
+    if trace.type not in ("scatter", "scattergl"):
+        return False
+    # Marker-only traces carry sparse annotations (matches, change points) and are left intact.
+    return trace.mode is None or "lines" in trace.mode
+
+
+def downsample_figure(fig, max_points: int | None):
+    """
+    Downsample every line trace of ``fig`` with more than ``max_points`` points in place.
+
+    Per-point attributes (hover text, custom data, marker colours and sizes) are
+    subset together with the coordinates. Returns ``fig`` for chaining.
+    """
+    if not max_points:
+        return fig
+    for trace in fig.data:
+        if not _is_line_trace(trace) or trace.y is None:
+            continue
+        n = len(trace.y)
+        if n <= max_points:
+            continue
+        x = trace.x if trace.x is not None else np.arange(n)
+        if len(x) != n:
+            continue
+        indices = downsample_indices(x, trace.y, max_points)
+        updates = {"x": _take(x, indices), "y": _take(trace.y, indices)}
+        for name in _POINT_ATTRIBUTES:
+            values = getattr(trace, name)
+            if values is not None and not isinstance(values, str) and len(values) == n:
+                updates[name] = _take(values, indices)
+        trace.update(updates)
+        for name in _MARKER_ATTRIBUTES:
+            values = getattr(trace.marker, name)
+            if values is not None and not isinstance(values, (str, int, float)) and len(values) == n:
+                trace.marker[name] = _take(values, indices)
+    return fig
+
+
+def downsample_series(series: pd.Series, max_points: int | None) -> pd.Series:
+    """Return ``series`` reduced to at most about ``max_points`` points for display."""
+    if not max_points or len(series) <= max_points:
+        return series
+    return series.iloc[downsample_indices(series.index, series.to_numpy(), max_points)]
@@ -0,0 +1,623 @@
+import importlib
+import multiprocessing
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import queue
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from pathlib import Path
+
+from tseapy.core.downsampling import downsample_figure
+from tseapy.core.serialization import figure_to_json
+from tseapy.data.shared_store import DatasetRef, SharedIndex
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_TIMEOUT = "timeout"
+FINISHED_STATES = {JOB_DONE, JOB_FAILED, JOB_CANCELLED, JOB_TIMEOUT}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    task TEXT NOT NULL,
+    algo TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    timeout REAL NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_worker_tasks = None
+
+
+def _init_worker(registry_factory, preload_modules, warm=False):
+    """
+    Build the task registry once per worker and import heavy libraries ahead of the first job.
+
+    With ``warm`` every backend is also run once (see :func:`tseapy.core.warmup.warm_up`).
+    """
+    global _worker_tasks
+    _worker_tasks = registry_factory()
+    for module_name in preload_modules:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+    if warm:
+        from tseapy.core.warmup import warm_up
+
+        warm_up(_worker_tasks)
+
+
+def _ping(delay: float = 0.0):
+    time.sleep(delay)
+    return os.getpid()
+
+
+def _process_context():
+    # Forking a server that already runs BLAS/OpenMP or numba threads can deadlock the
+    # child or the parent at exit, so workers are started from a clean interpreter.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _serve(connection, initargs):
+    """Worker process loop: initialize once, then run one ``(fn, args)`` call at a time."""
+    _init_worker(*initargs)
+    while True:
+        message = connection.recv()
+        if message is None:
+            return
+        fn, args = message
+        try:
+            reply = (True, fn(*args))
+        except Exception as exc:
+            reply = (False, exc)
+        try:
+            connection.send(reply)
+        except Exception as exc:
+            # An unpicklable result or exception is reported without its original type.
+            connection.send((False, RuntimeError(f"{type(exc).__name__}: {exc}")))
+
+
+class _WorkerProcess:
+    def __init__(self, context, initargs):
+        self.connection, child = context.Pipe()
+        # Daemonic, so a server that exits with a job still running does not wait for it.
+        self.process = context.Process(target=_serve, args=(child, initargs), name="tseapy-job", daemon=True)
+        self.process.start()
+        child.close()
+        self.future = None
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+        self.process.terminate()
+
+    def close(self):
+        self.connection.close()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class JobProcessPool:
+    """
+    A fixed set of worker processes that each run one call at a time.
+
+    Unlike :class:`~concurrent.futures.ProcessPoolExecutor`, the process running a
+    call can be terminated through :meth:`kill` without breaking the pool: the
+    call's future fails with :class:`~concurrent.futures.CancelledError` and a fresh
+    worker, initialized like the others, takes its place. A future only reports
+    ``running()`` once a worker has received its call.
+    """
+
+    def __init__(self, max_workers: int, initargs: tuple, mp_context=None):
+        self._context = mp_context or _process_context()
+        self._initargs = initargs
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers = [None] * max_workers
+        self._shutdown = False
+        self._runners = [
+            threading.Thread(target=self._run, args=(slot,), name="tseapy-job-runner", daemon=True)
+            for slot in range(max_workers)
+        ]
+        for runner in self._runners:
+            runner.start()
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new jobs after shutdown")
+            self._queue.put((future, fn, args))
+        return future
+
+    def kill(self, future: Future) -> bool:
+        """Terminate the worker running ``future``; return whether one was found."""
+        with self._lock:
+            for worker in self._workers:
+                if worker is not None and worker.future is future:
+                    worker.kill()
+                    return True
+        return False
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        with self._lock:
+            self._shutdown = True
+            workers = [worker for worker in self._workers if worker is not None]
+        if cancel_futures:
+            while True:
+                try:
+                    future, _, _ = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                future.cancel()
+        for _ in self._runners:
+            self._queue.put(None)
+        for worker in workers:
+            if worker.future is not None:
+                worker.kill()
+        if wait:
+            for runner in self._runners:
+                runner.join()
+
+    def _run(self, slot: int):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            future, fn, args = item
+            with self._lock:
+                worker = self._workers[slot]
+                if worker is None or not worker.process.is_alive():
+                    try:
+                        worker = self._workers[slot] = _WorkerProcess(self._context, self._initargs)
+                    except Exception as exc:
+                        future.set_exception(exc)
+                        continue
+                # Marked running under the lock, so kill() always finds the worker of a running future.
+                if not future.set_running_or_notify_cancel():
+                    continue
+                worker.future = future
+            try:
+                worker.connection.send((fn, args))
+                succeeded, value = worker.connection.recv()
+            except (EOFError, OSError) as exc:
+                with self._lock:
+                    worker.future = None
+                    self._workers[slot] = None
+                worker.close()
+                if worker.killed:
+                    future.set_exception(CancelledError())
+                else:
+                    future.set_exception(ChildProcessError(
+                        f"worker process exited unexpectedly (exit code {worker.process.exitcode})"
+                    ) if isinstance(exc, EOFError) else exc)
+                continue
+            except Exception as exc:
+                # The call itself could not be pickled; the worker is still usable.
+                worker.future = None
+                future.set_exception(exc)
+                continue
+            worker.future = None
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        with self._lock:
+            worker, self._workers[slot] = self._workers[slot], None
+        if worker is not None:
+            try:
+                worker.connection.send(None)
+            except OSError:
+                pass
+            worker.close()
+
+
+def run_analysis(task_name: str, algo: str, data, feature: str, kwargs: dict, max_points: int | None = None):
+    """
+    Run one analysis in a worker and return ``(serialized figure, elapsed seconds)``.
+
+    ``data`` is a frame, or a :class:`~tseapy.data.shared_store.DatasetRef` that the
+    worker memory-maps instead of receiving a pickled copy.
+    """
+    started = time.perf_counter()
+    if isinstance(data, DatasetRef):
+        data = data.load()
+    task = _worker_tasks.get_tasks(task_name)
+    fig = task.get_analysis_results(data=data, feature=feature, algo=algo, **kwargs)
+    downsample_figure(fig, max_points)
+    payload = figure_to_json(fig)
+    return payload, time.perf_counter() - started
+
+
+def describe_error(exc: BaseException) -> str:
+    if isinstance(exc, ValueError):
+        return str(exc)
+    if isinstance(exc, (TypeError, IndexError, RuntimeError)):
+        return f"Algorithm input error: {exc}"
+    return f"Analysis failed: {exc}"
+
+
+class Job:
+    def __init__(self, job_id: str, owner: str, task: str, algo: str, timeout: float):
+        self.job_id = job_id
+        self.owner = owner
+        self.task = task
+        self.algo = algo
+        self.timeout = timeout
+        self.status = JOB_QUEUED
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.result = None
+        self.future = None
+
+    @classmethod
+    def from_record(cls, record: dict) -> "Job":
+        job = cls(record["job_id"], record["owner"], record["task"], record["algo"], record["timeout"])
+        job.status = record["status"]
+        job.error = record["error"]
+        job.submitted_at = record["submitted_at"]
+        job.started_at = record["started_at"]
+        job.finished_at = record["finished_at"]
+        return job
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_record(self) -> dict:
+        return dict(self.to_dict(), owner=self.owner)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "task": self.task,
+            "algo": self.algo,
+            "status": self.status,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "timeout": self.timeout,
+        }
+
+
+class SharedJobRecords(SharedIndex):
+    """
+    Status and results of background jobs, readable by every server worker.
+
+    The worker that runs a job publishes each state change and, once done, the
+    serialized result; other workers answer status and result requests from these
+    records and forward cancellations through :meth:`request_cancel`.
+    """
+
+    schema = _SCHEMA
+
+    def result_path(self, job_id: str) -> Path:
+        return self.directory / "jobs" / f"{job_id}.json"
+
+    def publish(self, record: dict, result: str | None = None):
+        if result is not None:
+            path = self.result_path(record["job_id"])
+            path.parent.mkdir(exist_ok=True)
+            partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+            partial.write_text(result, encoding="utf-8")
+            os.replace(partial, path)
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO jobs (job_id, owner, task, algo, status, error, submitted_at, started_at, finished_at, "
+                "timeout, cancel_requested) VALUES (:job_id, :owner, :task, :algo, :status, :error, :submitted_at, "
+                ":started_at, :finished_at, :timeout, 0) ON CONFLICT (job_id) DO UPDATE SET status = :status, "
+                "error = :error, started_at = :started_at, finished_at = :finished_at",
+                record,
+            )
+
+    def load(self, job_id: str) -> dict | None:
+        connection = self._connect()
+        connection.row_factory = sqlite3.Row
+        try:
+            row = connection.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        finally:
+            connection.row_factory = None
+        return dict(row) if row is not None else None
+
+    def load_result(self, job_id: str) -> str | None:
+        try:
+            return self.result_path(job_id).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def request_cancel(self, job_id: str):
+        with self._transaction() as connection:
+            connection.execute("UPDATE jobs SET cancel_requested = 1 WHERE job_id = ?", (job_id,))
+
+    def cancel_requested(self, job_ids) -> set:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return set()
+        placeholders = ",".join("?" * len(job_ids))
+        rows = self._connect().execute(
+            f"SELECT job_id FROM jobs WHERE cancel_requested = 1 AND job_id IN ({placeholders})", job_ids
+        )
+        return {row[0] for row in rows}
+
+    def purge(self, finished_before: float, submitted_before: float):
+        """
+        Drop jobs finished before ``finished_before``, and unfinished jobs submitted before
+        ``submitted_before`` (left behind by workers that exited).
+        """
+        with self._transaction() as connection:
+            stale = [row[0] for row in connection.execute(
+                "SELECT job_id FROM jobs WHERE finished_at < ? OR (finished_at IS NULL AND submitted_at < ?)",
+                (finished_before, submitted_before),
+            )]
+            connection.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id in stale])
+        for job_id in stale:
+            self.result_path(job_id).unlink(missing_ok=True)
+
+
+class JobManager:
+    """
+    Runs analyses outside the request thread.
+
+    Work is executed by a lazily created pool (processes by default, threads when
+    ``JOB_EXECUTOR`` is ``thread``) whose workers build their own task registry and
+    import the modules listed in ``JOB_PRELOAD`` when they start. A watchdog thread
+    tracks when jobs start running and marks jobs that exceed their timeout, counted
+    from the moment a worker takes the job. Queued jobs can be cancelled outright.
+    Process workers (:class:`JobProcessPool`) running a job that is cancelled or
+    times out are terminated and replaced, so the next queued job starts at once;
+    a thread worker cannot be stopped, so it finishes in the background and its
+    result is only passed on to ``on_success`` (the result cache).
+
+    With ``DATASET_STORE_DIR`` set, job states and results are also published to
+    :class:`SharedJobRecords`, so any server worker can report on, return or cancel a
+    job submitted through another one.
+    """
+
+    def __init__(self, workers: int = 2, executor: str = "process", default_timeout: float = 900,
+                 retention: float = 3600, preload=()):
+        self.workers = workers
+        self.executor_kind = executor
+        self.default_timeout = default_timeout
+        self.retention = retention
+        self.preload = tuple(preload)
+        self.warmup = False
+        self.registry_factory = None
+        self.records = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor_lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._watchdog = None
+
+    def init_app(self, app, registry_factory):
+        self.shutdown()
+        self.workers = int(app.config.get("JOB_WORKERS", 2))
+        self.executor_kind = app.config.get("JOB_EXECUTOR", "process")
+        self.default_timeout = float(app.config.get("JOB_TIMEOUT", 900))
+        self.retention = float(app.config.get("JOB_RETENTION", 3600))
+        preload = app.config.get("JOB_PRELOAD", "")
+        if isinstance(preload, str):
+            preload = [name.strip() for name in preload.split(",") if name.strip()]
+        self.preload = tuple(preload)
+        self.warmup = bool(app.config.get("WARMUP", False))
+        self.registry_factory = registry_factory
+        store_dir = app.config.get("DATASET_STORE_DIR")
+        self.records = SharedJobRecords(store_dir) if store_dir else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0 and self.registry_factory is not None
+
+    def submit(self, owner: str, task: str, algo: str, data, feature: str, kwargs: dict,
+               timeout: float | None = None, on_success=None, max_points: int | None = None) -> Job:
+        if timeout is None or timeout <= 0:
+            timeout = self.default_timeout
+        job = Job(secrets.token_hex(12), owner, task, algo, min(timeout, self.default_timeout))
+        with self._lock:
+            self._purge_finished()
+            self._jobs[job.job_id] = job
+        self._publish(job)
+        job.future = self._get_executor().submit(run_analysis, task, algo, data, feature, kwargs, max_points)
+        job.future.add_done_callback(lambda future: self._complete(job, future, on_success))
+        self._ensure_watchdog()
+        return job
+
+    def add_finished(self, owner: str, task: str, algo: str, result: str) -> Job:
+        """Register a job whose result is already known, e.g. from the result cache."""
+        job = Job(secrets.token_hex(12), owner, task, algo, self.default_timeout)
+        job.status = JOB_DONE
+        job.result = result
+        job.started_at = job.finished_at = job.submitted_at
+        with self._lock:
+            self._purge_finished()
+            self._jobs[job.job_id] = job
+        self._publish(job)
+        return job
+
+    def get(self, job_id: str, owner: str | None = None) -> Job | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            job = self._get_published(job_id)
+        if job is None or (owner is not None and job.owner != owner):
+            return None
+        self._check(job)
+        return job
+
+    def cancel(self, job_id: str, owner: str | None = None) -> Job | None:
+        job = self.get(job_id, owner)
+        if job is None or job.finished:
+            return job
+        if job.future is None:
+            # Submitted through another worker, which cancels it on its next watchdog round.
+            self.records.request_cancel(job_id)
+            return job
+        with self._lock:
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            job.error = "Job was cancelled."
+            self._publish(job)
+        if not job.future.cancel():
+            self._kill(job)
+        return job
+
+    def warm_up(self, timeout: float | None = None):
+        """
+        Start every worker process now and wait until they are initialized.
+
+        Process workers run the backend warm-up in their initializer when ``WARMUP``
+        is set, so jobs submitted afterwards do not pay for imports or JIT compilation.
+        """
+        if self.executor_kind == "thread":
+            return
+        executor = self._get_executor()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # A worker only takes tasks once initialized, but one fast worker can answer every
+        # ping; keep pinging until each worker process has answered.
+        seen = set()
+        while len(seen) < self.workers:
+            futures = [executor.submit(_ping, 0.05) for _ in range(self.workers)]
+            for future in futures:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                seen.add(future.result(timeout=remaining))
+
+    def shutdown(self):
+        executor, owner_pid = self._executor, self._executor_pid
+        self._executor = None
+        self._executor_pid = None
+        if executor is not None and owner_pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._jobs.clear()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            # Pools and threads are not inherited across fork: a forked server worker builds its own.
+            if self._executor is None or self._executor_pid != os.getpid():
+                if self.executor_kind == "thread":
+                    # Threads share the server's compiled kernels, warmed up in-process.
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, initializer=_init_worker,
+                        initargs=(self.registry_factory, self.preload),
+                        thread_name_prefix="tseapy-job",
+                    )
+                else:
+                    self._executor = JobProcessPool(
+                        max_workers=self.workers,
+                        initargs=(self.registry_factory, self.preload, self.warmup),
+                    )
+                self._executor_pid = os.getpid()
+                self._watchdog = None
+            return self._executor
+
+    def _kill(self, job: Job):
+        """Stop the worker process running ``job``; thread workers cannot be stopped."""
+        executor = self._executor
+        if isinstance(executor, JobProcessPool):
+            executor.kill(job.future)
+
+    def _complete(self, job: Job, future, on_success):
+        try:
+            payload, elapsed = future.result()
+        except CancelledError:
+            self._finish(job, JOB_CANCELLED, error="Job was cancelled.")
+            return
+        except Exception as exc:
+            self._finish(job, JOB_FAILED, error=describe_error(exc))
+            return
+        # A result that arrives after cancellation or timeout is still worth caching.
+        if on_success is not None:
+            on_success(payload, elapsed)
+        self._finish(job, JOB_DONE, result=payload)
+
+    def _finish(self, job: Job, status: str, error=None, result=None):
+        with self._lock:
+            if job.finished:
+                return
+            job.status = status
+            job.error = error
+            job.result = result
+            job.finished_at = time.time()
+            # Published before the lock is released, so no worker reports "done" ahead of the others.
+            self._publish(job)
+
+    def _check(self, job: Job):
+        if job.future is None:
+            return
+        with self._lock:
+            if job.finished:
+                return
+            status = job.status
+            if status == JOB_QUEUED and job.future.running():
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+            if job.started_at is not None and time.time() - job.started_at > job.timeout:
+                job.status = JOB_TIMEOUT
+                job.finished_at = time.time()
+                job.error = f"Job exceeded its timeout of {job.timeout:g} seconds."
+            if job.status != status:
+                self._publish(job)
+        if job.status == JOB_TIMEOUT:
+            self._kill(job)
+
+    def _publish(self, job: Job):
+        if self.records is not None:
+            self.records.publish(job.to_record(), result=job.result if job.status == JOB_DONE else None)
+
+    def _get_published(self, job_id: str) -> Job | None:
+        if self.records is None:
+            return None
+        record = self.records.load(job_id)
+        if record is None:
+            return None
+        job = Job.from_record(record)
+        if job.status == JOB_DONE:
+            job.result = self.records.load_result(job_id)
+        return job
+
+    def _ensure_watchdog(self):
+        with self._lock:
+            if self._watchdog is not None:
+                return
+            self._watchdog = threading.Thread(target=self._watch, name="tseapy-job-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def _watch(self):
+        while True:
+            with self._lock:
+                active = [job for job in self._jobs.values() if not job.finished]
+                if not active:
+                    self._watchdog = None
+                    return
+            if self.records is not None:
+                for job_id in self.records.cancel_requested(job.job_id for job in active):
+                    self.cancel(job_id)
+            for job in active:
+                self._check(job)
+            time.sleep(0.25)
+
+    def _purge_finished(self):
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[job_id]
+        if self.records is not None:
+            self.records.purge(cutoff, cutoff - self.default_timeout)
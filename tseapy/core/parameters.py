@@ -8,14 +8,19 @@ def _is_number(value) -> bool:
 class AnalysisBackendParameter:
     """
     A class for defining AnalysisBackend parameters
+
+    Requests must pass every ``required`` parameter; an optional one falls back to
+    the backend's own default when it is left out.
     """
 
-    def __init__(self, name, label=None, description='', onclick: str = '', disabled: bool = False):
+    def __init__(self, name, label=None, description='', onclick: str = '', disabled: bool = False,
+                 required: bool = True):
         self.name = name
         self.label = label if label is not None else name
         self.description = description
         self.onclick = onclick
         self.disabled = disabled
+        self.required = required
 
     def _disabled_attr(self) -> str:
         return ' disabled' if self.disabled else ''
@@ -24,8 +29,8 @@ class AnalysisBackendParameter:
 class NumberParameter(AnalysisBackendParameter):
 
     def __init__(self, name, label=None, description='', minimum: float = 0.0, maximum: float = 1.0, step: float = 1.0,
-                 default: float = 0.0, onclick: str = '', disabled: bool = False):
-        super().__init__(name, label, description, onclick, disabled)
+                 default: float = 0.0, onclick: str = '', disabled: bool = False, required: bool = True):
+        super().__init__(name, label, description, onclick, disabled, required)
         if not _is_number(minimum):
             raise TypeError("minimum must be a number")
         if not _is_number(maximum):
@@ -34,8 +39,11 @@ class NumberParameter(AnalysisBackendParameter):
             raise TypeError("step must be a number")
         if not _is_number(default):
             raise TypeError("default must be a number")
-        if not minimum < default < maximum:
+        if required and not minimum < default < maximum:
             raise ValueError("default must be strictly between minimum and maximum")
+        # An optional parameter's default often means "off" and may sit on a bound.
+        if not required and not minimum <= default <= maximum:
+            raise ValueError("default must be between minimum and maximum")
         if not step < (maximum - minimum):
             raise ValueError("step must be less than the parameter range")
         self.min = minimum
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+
+def dataset_fingerprint(data: pd.DataFrame) -> str:
+    """Return a content hash of ``data`` (index, column names and values)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(c) for c in data.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def normalize_kwargs(kwargs: dict) -> dict:
+    """Canonicalize query parameters so equivalent requests share a cache key."""
+    normalized = {}
+    for name, raw in kwargs.items():
+        value = str(raw).strip()
+        lowered = value.lower()
+        if lowered in {"true", "false"}:
+            normalized[name] = lowered
+            continue
+        try:
+            number = float(value)
+        except ValueError:
+            normalized[name] = value
+            continue
+        normalized[name] = repr(number) if math.isfinite(number) else lowered
+    return normalized
+
+
+class _Entry:
+    __slots__ = ("payload", "size", "cost", "hits", "priority")
+
+    def __init__(self, payload: str, cost: float):
+        self.payload = payload
+        self.size = max(1, len(payload))
+        self.cost = max(cost, 1e-6)
+        self.hits = 1
+        self.priority = 0.0
+
+
+class ResultCache:
+    """
+    In-memory cache of serialized analysis results with an optional disk tier.
+
+    Eviction follows GreedyDual-Size-Frequency: an entry's priority is
+    ``clock + hits * cost / size``, so results that took long to compute are
+    kept over cheap ones of the same size. The clock advances to the priority
+    of each evicted entry, which ages out entries that are no longer requested.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, directory=None, disk_max_bytes: int = 1024 * 1024 * 1024):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._clock = 0.0
+        self._used = 0
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.directory = Path(directory) if directory else None
+
+    def init_app(self, app):
+        self.max_bytes = int(app.config.get("RESULT_CACHE_MAX_MB", 128)) * 1024 * 1024
+        self.disk_max_bytes = int(app.config.get("RESULT_CACHE_DISK_MAX_MB", 1024)) * 1024 * 1024
+        directory = app.config.get("RESULT_CACHE_DIR")
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.clear(disk=False)
+
+    @staticmethod
+    def make_key(fingerprint: str, task: str, algo: str, feature: str, kwargs: dict) -> str:
+        material = json.dumps(
+            [fingerprint, task, algo, feature, normalize_kwargs(kwargs)],
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.directory is not None
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.hits += 1
+                entry.priority = self._clock + entry.hits * entry.cost / entry.size
+                return entry.payload
+        loaded = self._read_disk(key)
+        if loaded is None:
+            return None
+        payload, cost = loaded
+        self._store(key, payload, cost)
+        return payload
+
+    def set(self, key: str, payload: str, cost: float):
+        self._store(key, payload, cost)
+        self._write_disk(key, payload, cost)
+
+    def clear(self, disk: bool = True):
+        with self._lock:
+            self._entries.clear()
+            self._clock = 0.0
+            self._used = 0
+        if disk and self.directory is not None:
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._used, "max_bytes": self.max_bytes}
+
+    def _store(self, key: str, payload: str, cost: float):
+        entry = _Entry(payload, cost)
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._used -= previous.size
+                entry.hits = previous.hits + 1
+            while self._entries and self._used + entry.size > self.max_bytes:
+                victim_key = min(self._entries, key=lambda k: self._entries[k].priority)
+                victim = self._entries.pop(victim_key)
+                self._clock = victim.priority
+                self._used -= victim.size
+            entry.priority = self._clock + entry.hits * entry.cost / entry.size
+            self._entries[key] = entry
+            self._used += entry.size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                header = json.loads(handle.readline())
+                payload = handle.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return payload, float(header.get("cost", 0.0))
+
+    def _write_disk(self, key: str, payload: str, cost: float):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                handle.write(json.dumps({"cost": cost, "created": time.time()}) + "\n")
+                handle.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        files = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.disk_max_bytes:
+            return
+        for _mtime, size, path in sorted(files):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.disk_max_bytes:
+                break
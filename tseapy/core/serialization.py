@@ -0,0 +1,200 @@
+import base64
+import copy
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.utils
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional speed-up
+    brotli = None
+
+#: NumPy dtypes Plotly.js decodes from ``{"dtype": ..., "bdata": ...}`` typed-array specs.
+_TYPED_ARRAY_CODES = {
+    "int8": "i1",
+    "uint8": "u1",
+    "int16": "i2",
+    "uint16": "u2",
+    "int32": "i4",
+    "uint32": "u4",
+    "float32": "f4",
+    "float64": "f8",
+}
+_INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+#: Responses smaller than this are not worth compressing.
+COMPRESS_MIN_BYTES = 1024
+
+
+def typed_array(values) -> dict:
+    """
+    Encode a one-dimensional numeric array as a Plotly.js typed-array spec.
+
+    The array is sent as little-endian bytes in base64 instead of one JSON number
+    per element. 64-bit integers are narrowed to ``int32`` when they fit and sent
+    as ``float64`` otherwise, since Plotly.js has no 64-bit integer arrays.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == "b":
+        values = values.astype(np.uint8)
+    elif values.dtype.name not in _TYPED_ARRAY_CODES:
+        if values.dtype.kind in "iu" and len(values) and _INT32_RANGE[0] <= values.min() and values.max() <= _INT32_RANGE[1]:
+            values = values.astype(np.int32)
+        else:
+            values = values.astype(np.float64)
+    little_endian = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder("<"))
+    return {
+        "dtype": _TYPED_ARRAY_CODES[values.dtype.name],
+        "bdata": base64.b64encode(little_endian.tobytes()).decode("ascii"),
+    }
+
+
+def epoch_milliseconds(values) -> np.ndarray:
+    """
+    Return datetimes as float milliseconds since the epoch, with ``NaN`` for ``NaT``.
+
+    Timezone-aware values are converted to their wall time, which is what Plotly
+    date axes display for numeric input.
+    """
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    milliseconds = index.as_unit("ns").asi8 / 1e6
+    milliseconds[index.isna()] = np.nan
+    return milliseconds
+
+
+def _is_datetime_array(values: np.ndarray) -> bool:
+    if values.dtype.kind == "M":
+        return True
+    if values.dtype.kind == "O" and len(values):
+        return pd.api.types.infer_dtype(values, skipna=True) in ("datetime64", "datetime")
+    return False
+
+
+def encode_values(values):
+    """
+    Encode one data array: numeric arrays as typed arrays, datetimes as epoch milliseconds.
+
+    Returns ``(encoded, is_datetime)``; values that are not one-dimensional arrays are
+    returned unchanged.
+    """
+    if isinstance(values, (pd.Index, pd.Series)):
+        values = values.to_numpy()
+    if not isinstance(values, np.ndarray) or values.ndim != 1:
+        return values, False
+    if _is_datetime_array(values):
+        try:
+            return typed_array(epoch_milliseconds(values)), True
+        except (TypeError, ValueError):
+            # e.g. datetimes with mixed timezones; let the JSON encoder format them.
+            return values, False
+    if values.dtype.kind in "biuf":
+        return typed_array(values), False
+    return values, False
+
+
+def _axis_layout_name(axis_ref: str) -> str:
+    # Trace axis references ("x", "y2") map to layout keys ("xaxis", "yaxis2").
+    return f"{axis_ref[0]}axis{axis_ref[1:]}"
+
+
+def figure_to_plotly_json(fig) -> dict:
+    """
+    Return ``fig`` as a JSON-ready dict using typed arrays for trace coordinates.
+
+    Axes whose traces carry datetimes are declared as ``date`` axes because the
+    datetimes are sent as epoch milliseconds.
+    """
+    if isinstance(fig, dict):
+        figure = {"data": [dict(trace) for trace in fig.get("data", [])], "layout": copy.deepcopy(fig.get("layout", {}))}
+    elif isinstance(getattr(fig, "_data", None), list) and isinstance(getattr(fig, "_layout", None), dict):
+        # ``to_dict()`` deep-copies every array element; the figure's own trace dicts
+        # are shallow-copied instead and only their top-level arrays are replaced.
+        # ``_data``/``_layout`` are private to plotly, which is pinned in pyproject.toml;
+        # tests check this path against ``to_dict()``.
+        figure = {"data": [dict(trace) for trace in fig._data], "layout": copy.deepcopy(fig._layout)}
+    else:
+        figure = fig.to_dict()
+    layout = figure["layout"]
+    for trace in figure["data"]:
+        for key, value in list(trace.items()):
+            encoded, is_datetime = encode_values(value)
+            trace[key] = encoded
+            if is_datetime and key in ("x", "y"):
+                axis = layout.setdefault(_axis_layout_name(trace.get(f"{key}axis", key)), {})
+                axis.setdefault("type", "date")
+    return figure
+
+
+def dumps(obj) -> str:
+    """Serialize ``obj`` with orjson when it is installed, else with Plotly's JSON encoder."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=plotly.utils.PlotlyJSONEncoder().default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    return json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder)
+
+
+def figure_to_json(fig) -> str:
+    """Serialize a Plotly figure for the browser (see :func:`figure_to_plotly_json`)."""
+    return dumps(figure_to_plotly_json(fig))
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Return the best supported content coding accepted by the client, or ``None``."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(data, quality=4)
+    return gzip.compress(data, compresslevel=5)
+
+
+def compress_response(response, accept_encoding: str):
+    """
+    Compress a JSON response body in place according to ``Accept-Encoding``.
+
+    Streaming responses, small bodies and responses that are already encoded are
+    left alone. ``Vary: Accept-Encoding`` is always set on JSON responses so
+    caches keep the variants apart.
+    """
+    if response.mimetype != "application/json" or response.direct_passthrough:
+        return response
+    response.vary.add("Accept-Encoding")
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return response
+    coding = choose_encoding(accept_encoding)
+    if coding is None:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(body, coding))
+    response.headers["Content-Encoding"] = coding
+    return response
@@ -15,15 +15,23 @@ class Task(abc.ABC):
         self.analysis_backend_factory = AnalysisBackendsList()
 
     @staticmethod
-    def get_visualization_view(data, feature_to_display: str):
-        """Return a Plotly line plot for the given feature."""
+    def get_visualization_view(data, feature_to_display: str, max_points: int | None = None):
+        """
+        Return a Plotly line plot for the given feature.
+
+        With ``max_points`` the series is downsampled for display (see
+        :func:`tseapy.core.downsampling.downsample_series`).
+        """
         import pandas as pd  # Local import to avoid hard dependency for tests
         from plotly import express as px
 
+        from tseapy.core.downsampling import downsample_series
+
         if not isinstance(data, pd.DataFrame):
             raise TypeError('data must be a pandas.DataFrame')
 
-        fig = px.line(x=data.index, y=data[feature_to_display], markers=True)
+        series = downsample_series(data[feature_to_display], max_points)
+        fig = px.line(x=series.index, y=series, markers=True)
         fig.update_yaxes(title={'text': feature_to_display})
         return fig
 
@@ -39,10 +47,32 @@ class Task(abc.ABC):
     def get_interaction_view(self, algo: str):
         pass
 
+    def get_batch_results(self, data, feature, algo, queries: list, **kwargs) -> dict:
+        """
+        Run one analysis per item of ``queries`` in a single pass and return JSON-ready results.
+
+        Backs ``POST /<task>/<algo>/batch``; tasks without batched queries raise ``ValueError``.
+        """
+        raise ValueError(f'Task "{self.name}" does not support batched queries')
+
     def get_parameter_view(self, algo: str):
         return ""
 
-    def get_parameter_script(self, algo: str, analysis_url: str, extra_query_params=None):
+    def get_warmup_arguments(self, data, feature) -> dict:
+        """
+        Return the query arguments, beyond the backends' parameter defaults, needed to
+        run an analysis on ``data`` during warm-up (see :mod:`tseapy.core.warmup`).
+        """
+        return {}
+
+    def get_parameter_script(self, algo: str, analysis_url: str, extra_query_params=None, jobs_url=None):
+        """
+        Return the ``doAnalysis()`` script for the parameter form.
+
+        Without ``jobs_url`` the script fetches ``analysis_url`` and waits for the figure.
+        With ``jobs_url`` it submits a background job, polls its status and fetches the
+        result once the job is done; ``cancelAnalysis()`` cancels the pending job.
+        """
         extra_query_params = extra_query_params or []
         a: AnalysisBackend = self.get_analysis_backend(algo)
         extra_params_js = ""
@@ -56,7 +86,82 @@ class Task(abc.ABC):
                 """
             )
         base_url_literal = repr(analysis_url)
+        jobs_url_literal = repr(jobs_url) if jobs_url else "null"
         script = """
+        var analysisJobsUrl = """ + jobs_url_literal + """;
+        var currentAnalysisJob = null;
+
+        function readAnalysisResponse(response) {
+            if (!response.ok) {
+                return response.text().then(raw => {
+                    try {
+                        const err = JSON.parse(raw);
+                        throw new Error(err.error || 'Analysis failed');
+                    } catch (_parseError) {
+                        throw new Error(raw || 'Analysis failed');
+                    }
+                })
+            }
+            return response.json();
+        }
+
+        function plotAnalysisResults(resultsPlot) {
+            const resultsDiv = document.getElementById('results');
+            const data = resultsPlot.data || [];
+            const layout = resultsPlot.layout || {};
+            const config = {};
+            if (resultsDiv.classList.contains('js-plotly-plot')) {
+                Plotly.react(resultsDiv, data, layout, config);
+            } else {
+                resultsDiv.innerHTML = '';
+                Plotly.newPlot(resultsDiv, data, layout, config);
+            }
+        }
+
+        function showAnalysisError(err) {
+            const resultsDiv = document.getElementById('results');
+            if (resultsDiv.classList.contains('js-plotly-plot')) {
+                Plotly.purge(resultsDiv);
+            }
+            resultsDiv.innerHTML = '<div class="alert alert-danger mt-3" role="alert">' + err.message + '</div>';
+        }
+
+        function showAnalysisProgress(job) {
+            const resultsDiv = document.getElementById('results');
+            if (resultsDiv.classList.contains('js-plotly-plot')) {
+                Plotly.purge(resultsDiv);
+            }
+            resultsDiv.innerHTML = '<div class="alert alert-info mt-3 d-flex justify-content-between align-items-center" role="status">'
+                + '<span>Analysis ' + job.status + '&hellip;</span>'
+                + '<button type="button" class="btn btn-sm btn-outline-secondary" onclick="cancelAnalysis()">Cancel</button>'
+                + '</div>';
+        }
+
+        function pollAnalysisJob(job) {
+            currentAnalysisJob = job;
+            if (job.status === 'done') {
+                currentAnalysisJob = null;
+                return fetch(job.result_url, {method: 'GET'})
+                    .then(readAnalysisResponse)
+                    .then(plotAnalysisResults);
+            }
+            if (job.status !== 'queued' && job.status !== 'running') {
+                currentAnalysisJob = null;
+                throw new Error(job.error || ('Analysis ' + job.status));
+            }
+            showAnalysisProgress(job);
+            return new Promise(resolve => setTimeout(resolve, 1000))
+                .then(() => fetch(job.status_url, {method: 'GET'}))
+                .then(readAnalysisResponse)
+                .then(pollAnalysisJob);
+        }
+
+        function cancelAnalysis() {
+            if (currentAnalysisJob) {
+                fetch(currentAnalysisJob.status_url, {method: 'DELETE'});
+            }
+        }
+
         function doAnalysis() {
             if (typeof window.validateAnalysisRequest === 'function') {
                 const validationMessage = window.validateAnalysisRequest();
@@ -78,39 +183,20 @@ class Task(abc.ABC):
                     }
                 }
             } 
-            var url = analysisUrl;
-            if (params.length > 0) {
-                url += '?' + params.join('&');
+            params.push('plot_width=' + document.getElementById('results').clientWidth);
+            var query = '?' + params.join('&');
+            if (analysisJobsUrl) {
+                fetch(analysisJobsUrl + query, {method: 'POST'})
+                    .then(readAnalysisResponse)
+                    .then(pollAnalysisJob)
+                    .catch(showAnalysisError);
+                return;
             }
+            var url = analysisUrl + query;
             fetch(url, {method: 'GET'})
-                    .then(response => {
-                        if (!response.ok) {
-                            return response.text().then(raw => {
-                                try {
-                                    const err = JSON.parse(raw);
-                                    throw new Error(err.error || 'Analysis failed');
-                                } catch (_parseError) {
-                                    throw new Error(raw || 'Analysis failed');
-                                }
-                            })
-                        }
-                        return response.json();
-                    })
-                    .then(resultsPlot => {
-                        const resultsDiv = document.getElementById('results');
-                        const data = resultsPlot.data || [];
-                        const layout = resultsPlot.layout || {};
-                        const config = {};
-                        if (resultsDiv.classList.contains('js-plotly-plot')) {
-                            Plotly.react(resultsDiv, data, layout, config);
-                        } else {
-                            Plotly.newPlot(resultsDiv, data, layout, config);
-                        }
-                    })
-                    .catch(err => {
-                        const resultsDiv = document.getElementById('results');
-                        resultsDiv.innerHTML = '<div class="alert alert-danger mt-3" role="alert">' + err.message + '</div>';
-                    });  
+                    .then(readAnalysisResponse)
+                    .then(plotAnalysisResults)
+                    .catch(showAnalysisError);
         }
         """
         return script
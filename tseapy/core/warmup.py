@@ -0,0 +1,219 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from tseapy.core.parameters import BooleanParameter, ListParameter, NumberParameter, RangeParameter
+
+logger = logging.getLogger(__name__)
+
+#: Length of the synthetic series each backend is run on during warm-up.
+WARMUP_POINTS = 256
+WARMUP_FEATURE = "value"
+
+WARMUP_DISABLED = "disabled"
+WARMUP_PENDING = "pending"
+WARMUP_RUNNING = "running"
+WARMUP_DONE = "done"
+
+
+def synthetic_frame(points: int = WARMUP_POINTS) -> pd.DataFrame:
+    """Return a small hourly series with seasonality, a level shift and noise, enough for every backend."""
+    rng = np.random.default_rng(0)
+    steps = np.arange(points)
+    values = np.sin(2 * np.pi * steps / 24) + (steps >= points // 2) * 2.0 + rng.normal(scale=0.1, size=points)
+    index = pd.date_range("2024-01-01", periods=points, freq="h")
+    return pd.DataFrame({WARMUP_FEATURE: values}, index=index)
+
+
+def default_arguments(backend) -> dict:
+    """Return the backend's parameter defaults as the query-string values the form would send."""
+    arguments = {}
+    for parameter in backend.parameters:
+        if isinstance(parameter, NumberParameter):
+            value = parameter.value
+            arguments[parameter.name] = str(int(value)) if float(value).is_integer() else str(value)
+        elif isinstance(parameter, BooleanParameter):
+            arguments[parameter.name] = "true" if parameter.default else "false"
+        elif isinstance(parameter, ListParameter) and parameter.values:
+            arguments[parameter.name] = str(parameter.values[0])
+        elif isinstance(parameter, RangeParameter):
+            arguments[parameter.name] = str(parameter.min)
+    return arguments
+
+
+def configure_jit_cache(directory):
+    """
+    Persist numba compilation results in ``directory``.
+
+    Sets ``NUMBA_CACHE_DIR`` (read by numba, and inherited by job worker processes
+    started afterwards) and turns on statsforecast's on-disk kernel cache. stumpy's
+    kernels are compiled without caching and are switched over by
+    :func:`enable_stumpy_cache` during warm-up.
+    """
+    os.makedirs(directory, exist_ok=True)
+    os.environ["NUMBA_CACHE_DIR"] = str(directory)
+    os.environ.setdefault("NIXTLA_NUMBA_CACHE", "1")
+    if "numba" in sys.modules:
+        from numba.core import config
+
+        config.reload_config()
+
+
+def enable_stumpy_cache():
+    try:
+        from stumpy import cache
+    except ImportError:
+        return
+    with warnings.catch_warnings():
+        # stumpy flags its cache switch as experimental on every call.
+        warnings.simplefilter("ignore")
+        cache._enable()
+
+
+def start_numba_threads():
+    """
+    Launch numba's parallel thread pool from the calling thread.
+
+    With the TBB threading layer, a process whose first parallel kernel (e.g. a
+    stumpy matrix profile) runs on a secondary thread hangs at interpreter exit,
+    so the pool is started from the main thread before warm-up moves to the background.
+    """
+    try:
+        import numba
+    except ImportError:
+        return
+
+    @numba.njit(parallel=True)
+    def touch(n):
+        total = 0
+        for i in numba.prange(n):
+            total += i
+        return total
+
+    touch(2)
+
+
+def warm_up(registry) -> dict:
+    """
+    Run every backend of ``registry`` once on :func:`synthetic_frame` with default parameters.
+
+    This imports each backend's dependencies and compiles its numba kernels, or loads
+    them from the JIT cache. Returns ``{"<task>/<algo>": {"seconds": ..., "error": ...}}``;
+    failures (e.g. an optional dependency that is not installed) are recorded, not raised.
+    """
+    if os.environ.get("NUMBA_CACHE_DIR"):
+        enable_stumpy_cache()
+    data = synthetic_frame()
+    results = {}
+    for task in registry.iter_tasks():
+        for backend in task.analysis_backend_factory.iter_backends():
+            arguments = dict(default_arguments(backend), **task.get_warmup_arguments(data, WARMUP_FEATURE))
+            started = time.perf_counter()
+            error = None
+            try:
+                task.get_analysis_results(data=data, feature=WARMUP_FEATURE, algo=backend.name, **arguments)
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+            results[f"{task.name}/{backend.name}"] = {"seconds": time.perf_counter() - started, "error": error}
+    return results
+
+
+def warm_up_subprocess(timeout: float | None = None):
+    """
+    Run :func:`warm_up` on a fresh registry in a child interpreter.
+
+    The child inherits ``NUMBA_CACHE_DIR``, so it fills the JIT cache without
+    starting numba's thread pool in this process, e.g. a server master about to fork.
+    """
+    subprocess.run(
+        [sys.executable, "-c",
+         "from tseapy.core.backend_registry import build_tasks_registry\n"
+         "from tseapy.core.warmup import warm_up\n"
+         "warm_up(build_tasks_registry())"],
+        check=True,
+        timeout=timeout,
+    )
+
+
+class WarmupManager:
+    """
+    Opt-in background warm-up of the analysis backends at startup.
+
+    When enabled, a daemon thread runs :func:`warm_up` on the server's own registry
+    (for analyses computed inside requests) and then starts the job worker processes,
+    which warm themselves up before taking work. :attr:`ready` turns true once both
+    are done; a process forked after the warm-up started (e.g. a preloading server
+    worker) starts its own on first :meth:`start`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = False
+        self.jobs = None
+        self.state = WARMUP_DISABLED
+        self.results = {}
+        self.started_at = None
+        self.finished_at = None
+        self._pid = None
+
+    def init_app(self, app, jobs=None):
+        self.enabled = bool(app.config.get("WARMUP", False))
+        self.jobs = jobs
+        cache_dir = app.config.get("JIT_CACHE_DIR")
+        if cache_dir:
+            configure_jit_cache(cache_dir)
+        with self._lock:
+            self.state = WARMUP_PENDING if self.enabled else WARMUP_DISABLED
+            self.results = {}
+            self.started_at = self.finished_at = None
+            self._pid = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in (WARMUP_DISABLED, WARMUP_DONE) and self._pid in (None, os.getpid())
+
+    def start(self, registry):
+        """Start the warm-up thread for this process unless it already ran or is running."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.state = WARMUP_RUNNING
+            self.results = {}
+            self.started_at = time.time()
+            self.finished_at = None
+        if threading.current_thread() is threading.main_thread():
+            start_numba_threads()
+        threading.Thread(target=self.run, args=(registry,), name="tseapy-warmup", daemon=True).start()
+
+    def run(self, registry):
+        try:
+            results = warm_up(registry)
+            if self.jobs is not None and self.jobs.enabled:
+                self.jobs.warm_up()
+        except Exception:
+            logger.exception("Backend warm-up failed")
+            results = {}
+        with self._lock:
+            self.results = results
+            self.state = WARMUP_DONE
+            self.finished_at = time.time()
+        logger.info("Backend warm-up finished in %.1f s", self.finished_at - self.started_at)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "backends": dict(self.results),
+            }
@@ -0,0 +1,174 @@
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from tseapy.data.upload import UploadError, upload_format
+
+
+class ChunkOffsetError(UploadError):
+    """Raised when a chunk does not start where the stored data ends; ``received`` tells the client where to resume."""
+
+    def __init__(self, received: int):
+        super().__init__(f"Expected a chunk at offset {received}.")
+        self.received = received
+
+
+class ChunkedUpload:
+    """State of one chunked upload: its metadata and the spooled ``.part`` file."""
+
+    def __init__(self, upload_id: str, owner: str, filename: str, size: int, path: Path, created: float):
+        self.upload_id = upload_id
+        self.owner = owner
+        self.filename = filename
+        self.size = size
+        self.path = path
+        self.created = created
+
+    @property
+    def received(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    @property
+    def complete(self) -> bool:
+        return self.received == self.size
+
+    def to_dict(self) -> dict:
+        return {
+            "upload_id": self.upload_id,
+            "filename": self.filename,
+            "size": self.size,
+            "received": self.received,
+            "complete": self.complete,
+        }
+
+
+class ChunkedUploadStore:
+    """
+    Spools uploads sent as a sequence of chunks to disk.
+
+    A client announces a file with :meth:`create`, then sends chunks in order with
+    :meth:`append`; each chunk must start exactly where the stored data ends, so a
+    client that lost its connection asks :meth:`get` for ``received`` and resumes
+    from there. The spool file and a small JSON sidecar live in ``directory``, so
+    uploads survive a restart and are visible to every worker process configured
+    with the same directory (``tseapy serve`` and workspace directories set one
+    up). Without one, each process spools to its own temporary directory.
+    Uploads untouched for ``ttl`` seconds are deleted.
+    """
+
+    def __init__(self, directory=None, max_bytes: int = 4 * 1024 ** 3, chunk_bytes: int = 8 * 1024 * 1024,
+                 ttl: float = 24 * 3600):
+        # Re-entrant: append() holds it while the sidecar path resolves the directory.
+        self._lock = threading.RLock()
+        self.directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self.chunk_bytes = chunk_bytes
+        self.ttl = ttl
+
+    def init_app(self, app):
+        directory = app.config.get("CHUNKED_UPLOAD_DIR")
+        self.directory = Path(directory) if directory else None
+        self.max_bytes = int(app.config.get("CHUNKED_UPLOAD_MAX_MB", 4096)) * 1024 * 1024
+        self.chunk_bytes = int(app.config.get("UPLOAD_CHUNK_MB", 8)) * 1024 * 1024
+        limit = app.config.get("MAX_CONTENT_LENGTH")
+        if limit:
+            # A chunk travels as one request body and must fit under the global limit.
+            self.chunk_bytes = min(self.chunk_bytes, int(limit))
+        self.ttl = float(app.config.get("CHUNKED_UPLOAD_TTL", 24 * 3600))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def create(self, owner: str, filename: str, size: int) -> ChunkedUpload:
+        if upload_format(filename) is None:
+            raise UploadError("Unsupported file type.")
+        if size <= 0:
+            raise UploadError("The uploaded file is empty.")
+        if size > self.max_bytes:
+            raise UploadError(f"File is too large. Maximum size is {self.max_bytes // (1024 * 1024)} MB.")
+        self._expire_idle()
+        upload = ChunkedUpload(secrets.token_hex(16), owner, filename, size,
+                               self._directory() / f"{secrets.token_hex(16)}.part", time.time())
+        upload.path.touch()
+        meta = {"owner": owner, "filename": filename, "size": size, "path": upload.path.name, "created": upload.created}
+        self._meta_path(upload.upload_id).write_text(json.dumps(meta), encoding="utf-8")
+        return upload
+
+    def get(self, upload_id: str, owner: str | None = None) -> ChunkedUpload | None:
+        if self.directory is None or not upload_id.isalnum():
+            return None
+        try:
+            meta = json.loads(self._meta_path(upload_id).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if owner is not None and meta["owner"] != owner:
+            return None
+        return ChunkedUpload(upload_id, meta["owner"], meta["filename"], int(meta["size"]),
+                             self.directory / meta["path"], float(meta["created"]))
+
+    def append(self, upload: ChunkedUpload, offset: int, stream, length: int | None = None) -> int:
+        """
+        Write one chunk read from ``stream`` at ``offset`` and return the new ``received`` count.
+
+        The chunk is copied in bounded pieces. A chunk at the wrong offset raises
+        :class:`ChunkOffsetError`; a chunk that would exceed the announced size
+        raises :class:`UploadError`.
+        """
+        if length is not None and length > self.chunk_bytes:
+            raise UploadError(f"Chunks must not exceed {self.chunk_bytes} bytes.")
+        with self._lock:
+            received = upload.received
+            if offset != received:
+                raise ChunkOffsetError(received)
+            with upload.path.open("r+b") as handle:
+                handle.seek(offset)
+                copied = 0
+                while True:
+                    piece = stream.read(min(1024 * 1024, self.chunk_bytes - copied + 1))
+                    if not piece:
+                        break
+                    copied += len(piece)
+                    if copied > self.chunk_bytes or offset + copied > upload.size:
+                        handle.truncate(offset)
+                        raise UploadError("Chunk exceeds the announced file size or the chunk size limit.")
+                    handle.write(piece)
+            os.utime(self._meta_path(upload.upload_id))
+            return offset + copied
+
+    def discard(self, upload: ChunkedUpload):
+        upload.path.unlink(missing_ok=True)
+        self._meta_path(upload.upload_id).unlink(missing_ok=True)
+
+    def _directory(self) -> Path:
+        with self._lock:
+            if self.directory is None:
+                self.directory = Path(tempfile.mkdtemp(prefix="tseapy-uploads-"))
+            directory = self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self._directory() / f"{upload_id}.json"
+
+    def _expire_idle(self):
+        if not self.ttl or self.directory is None:
+            return
+        deadline = time.time() - self.ttl
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                if meta_path.stat().st_mtime >= deadline:
+                    continue
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if meta.get("path"):
+                (self.directory / meta["path"]).unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
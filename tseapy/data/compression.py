@@ -0,0 +1,135 @@
+import pickle
+import zlib
+
+import numpy as np
+import pandas as pd
+
+#: Codecs in order of preference for ``auto``: zstd and lz4 are optional packages, zlib always works.
+CODECS = ("zstd", "lz4", "zlib")
+#: NumPy dtype kinds stored as raw, byte-shuffled buffers.
+_SHUFFLED_KINDS = "biufcmM"
+
+
+class Codec:
+    """A named pair of ``compress`` and ``decompress`` functions over bytes."""
+
+    def __init__(self, name: str, compress, decompress):
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+    def __repr__(self):
+        return f"Codec({self.name!r})"
+
+    def __reduce__(self):
+        # Pickled by name, e.g. when a compressed dataset is spilled to disk.
+        return _load_codec, (self.name,)
+
+
+def _load_codec(name: str) -> Codec:
+    if name == "zstd":
+        import zstandard
+
+        # The module-level functions use a fresh context per call and are safe to share between threads.
+        return Codec(name, lambda data: zstandard.compress(data, 3), zstandard.decompress)
+    if name == "lz4":
+        import lz4.frame
+
+        return Codec(name, lz4.frame.compress, lz4.frame.decompress)
+    if name == "zlib":
+        return Codec(name, lambda data: zlib.compress(data, 1), zlib.decompress)
+    raise ValueError(f"Unknown compression codec {name!r}; expected one of {', '.join(CODECS)}, auto or off.")
+
+
+def resolve_codec(name: str | None) -> Codec | None:
+    """
+    Return the codec for a ``TSEAPY_DATASET_COMPRESSION`` value, or ``None`` when compression is off.
+
+    ``auto`` picks the first of :data:`CODECS` that is installed. A named codec whose
+    package is missing raises :class:`RuntimeError`; an unknown name raises :class:`ValueError`.
+    """
+    name = (name or "off").strip().lower()
+    if name in ("off", "none", "0", "false", ""):
+        return None
+    if name == "auto":
+        for candidate in CODECS:
+            try:
+                return _load_codec(candidate)
+            except ImportError:
+                continue
+    try:
+        return _load_codec(name)
+    except ImportError:
+        raise RuntimeError(f"Dataset compression with {name} requires the {name} package: "
+                           "pip install tseapy[fast]") from None
+
+
+def shuffle_bytes(values: np.ndarray) -> bytes:
+    """
+    Group the bytes of ``values`` by their position within each element.
+
+    Neighbouring samples of a sensor series share their sign, exponent and high
+    mantissa bytes; stored next to each other, those bytes form long runs that
+    general-purpose codecs compress several times better than the interleaved array.
+    """
+    values = np.ascontiguousarray(values)
+    return values.view(np.uint8).reshape(-1, values.dtype.itemsize).T.tobytes()
+
+
+def unshuffle_bytes(data: bytes, dtype: np.dtype) -> np.ndarray:
+    """Invert :func:`shuffle_bytes`; the returned array owns its memory."""
+    dtype = np.dtype(dtype)
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(-1)
+
+
+class CompressedFrame:
+    """
+    A DataFrame held as one compressed block per column.
+
+    Columns with a plain NumPy dtype (and the index) are byte-shuffled before
+    compression; other columns, e.g. text or extension arrays, are pickled first.
+    """
+
+    def __init__(self, frame: pd.DataFrame, codec: Codec):
+        self.codec = codec
+        self.columns = frame.columns
+        self.attrs = dict(frame.attrs)
+        self.blocks = [self._pack(frame.iloc[:, position]) for position in range(frame.shape[1])]
+        index = frame.index
+        if isinstance(index, pd.RangeIndex):
+            self.index = ("range", index)
+        else:
+            freq = getattr(index, "freq", None)
+            self.index = ("values", self._pack(pd.Series(index, copy=False)), index.name, freq)
+        self.nbytes = sum(len(block[1]) for block in self.blocks)
+        if self.index[0] == "values":
+            self.nbytes += len(self.index[1][1])
+
+    def _pack(self, series: pd.Series) -> tuple:
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in _SHUFFLED_KINDS:
+            return "shuffled", self.codec.compress(shuffle_bytes(series.to_numpy())), series.dtype.str
+        return "pickled", self.codec.compress(pickle.dumps(series.array, protocol=pickle.HIGHEST_PROTOCOL)), None
+
+    def _unpack(self, block: tuple):
+        kind, data, dtype = block
+        if kind == "shuffled":
+            return unshuffle_bytes(self.codec.decompress(data), np.dtype(dtype))
+        return pickle.loads(self.codec.decompress(data))
+
+    def decompress(self) -> pd.DataFrame:
+        if self.index[0] == "range":
+            index = self.index[1]
+        else:
+            _, block, name, freq = self.index
+            values = self._unpack(block)
+            if freq is not None:
+                index = pd.DatetimeIndex(values, name=name, freq=freq)
+            else:
+                index = pd.Index(values, name=name, copy=False)
+        frame = pd.DataFrame(
+            {position: self._unpack(block) for position, block in enumerate(self.blocks)}, index=index, copy=False
+        )
+        frame.columns = self.columns
+        frame.attrs = dict(self.attrs)
+        return frame
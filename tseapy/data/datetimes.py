@@ -0,0 +1,206 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+#: Values sampled to infer a column's datetime format.
+SAMPLE_SIZE = 200
+#: Share of sampled values a candidate format must parse to be used.
+FORMAT_THRESHOLD = 0.8
+#: Prefix of formats describing numeric epoch timestamps, e.g. ``"epoch:ms"``.
+EPOCH_PREFIX = "epoch:"
+#: Lower bound of the median absolute value for each epoch unit (1973-03-03 in that unit).
+_EPOCH_UNITS = (("ns", 1e17), ("us", 1e14), ("ms", 1e11), ("s", 1e8))
+#: Largest nanosecond timestamp pandas can represent (year 2262).
+_EPOCH_MAX = float(np.iinfo(np.int64).max)
+#: ``strftime`` directives the fixed-width parser understands, with their widths.
+_FIXED_WIDTH_FIELDS = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2}
+
+
+def _sample(series: pd.Series, size: int) -> pd.Series:
+    values = series.dropna()
+    if len(values) <= size:
+        return values
+    # Head and tail catch formats that change over the column (e.g. a late switch to ISO).
+    return pd.concat([values.head(size // 2), values.tail(size - size // 2)], ignore_index=True)
+
+
+def infer_epoch_unit(values) -> str | None:
+    """Return the epoch unit (``s``, ``ms``, ``us`` or ``ns``) numeric timestamps are most likely in, or ``None``."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    magnitude = np.median(np.abs(values))
+    if magnitude >= _EPOCH_MAX:
+        return None
+    for unit, lower in _EPOCH_UNITS:
+        if magnitude >= lower:
+            return unit
+    return None
+
+
+def infer_datetime_format(series: pd.Series, sample_size: int = SAMPLE_SIZE) -> str | None:
+    """
+    Infer an explicit format for parsing ``series`` as datetimes from a sample of its values.
+
+    Returns a ``strftime`` pattern for text, ``"epoch:<unit>"`` for numeric epoch
+    timestamps, or ``None`` when no single format parses enough of the sample.
+    Candidates are guessed month-first and day-first from distinct sample values and
+    the one parsing most of the sample wins, so ``01/02/2024`` next to ``13/02/2024``
+    resolves to day-first.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return None
+    sample = _sample(series, sample_size)
+    if sample.empty:
+        return None
+    if pd.api.types.is_numeric_dtype(sample) and not pd.api.types.is_bool_dtype(sample):
+        unit = infer_epoch_unit(sample)
+        return f"{EPOCH_PREFIX}{unit}" if unit else None
+
+    sample = sample.astype(str)
+    candidates = []
+    for value in sample.drop_duplicates().head(20):
+        for dayfirst in (False, True):
+            with warnings.catch_warnings():
+                # guess_datetime_format warns about day-first and unknown timezone tokens.
+                warnings.simplefilter("ignore")
+                candidate = guess_datetime_format(value, dayfirst=dayfirst)
+            if candidate and candidate not in candidates:
+                candidates.append(candidate)
+    best, best_parsed = None, 0
+    for candidate in candidates:
+        parsed = int(_parse_with_format(sample, candidate).notna().sum())
+        if parsed > best_parsed:
+            best, best_parsed = candidate, parsed
+    if best_parsed < FORMAT_THRESHOLD * len(sample):
+        return None
+    return best
+
+
+def _fixed_width_layout(fmt: str):
+    # Returns ({directive: offset}, [(offset, literal byte)], width) or None.
+    fields, literals, position, i = {}, [], 0, 0
+    while i < len(fmt):
+        if fmt[i] == "%":
+            directive = fmt[i:i + 2]
+            if directive not in _FIXED_WIDTH_FIELDS or directive in fields:
+                return None
+            fields[directive] = position
+            position += _FIXED_WIDTH_FIELDS[directive]
+            i += 2
+        else:
+            if not fmt[i].isascii():
+                return None
+            literals.append((position, ord(fmt[i])))
+            position += 1
+            i += 1
+    if not {"%Y", "%m", "%d"}.issubset(fields):
+        return None
+    return fields, literals, position
+
+
+def _parse_fixed_width(values: pd.Series, fmt: str) -> pd.Series | None:
+    """
+    Parse zero-padded, fixed-width text such as ``31.12.2024 23:59:59`` with array arithmetic.
+
+    pandas runs formats other than ISO 8601 through ``strptime`` one value at a
+    time; here the strings are viewed as a byte matrix and every field is decoded
+    for all rows at once. Rows that do not match the layout exactly become ``NaT``.
+    Returns ``None`` when ``fmt`` uses directives this parser does not handle.
+    """
+    layout = _fixed_width_layout(fmt)
+    if layout is None or values.dtype != object:
+        return None
+    fields, literals, width = layout
+    try:
+        # One spare byte: it is zero exactly when a value is not longer than ``width``.
+        raw = np.asarray(values.to_numpy(), dtype=f"S{width + 1}")
+    except (UnicodeEncodeError, TypeError, ValueError):
+        return None
+    matrix = raw.view(np.uint8).reshape(len(raw), width + 1)
+    valid = matrix[:, width] == 0
+    for position, byte in literals:
+        valid &= matrix[:, position] == byte
+
+    def field(directive, default=0):
+        if directive not in fields:
+            return np.full(len(raw), default, dtype=np.int64)
+        start = fields[directive]
+        digits = matrix[:, start:start + _FIXED_WIDTH_FIELDS[directive]].astype(np.int64) - ord("0")
+        valid[:] &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        return digits @ (10 ** np.arange(digits.shape[1] - 1, -1, -1))
+
+    year, month, day = field("%Y", 1970), field("%m", 1), field("%d", 1)
+    hour, minute, second = field("%H"), field("%M"), field("%S")
+    # Years outside 1678-2261 do not fit nanosecond timestamps.
+    valid &= (year >= 1678) & (year <= 2261) & (month >= 1) & (month <= 12) & (day >= 1)
+    valid &= (hour < 24) & (minute < 60) & (second < 60)
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+    month_start = months.astype("datetime64[D]")
+    valid &= day <= ((months + 1).astype("datetime64[D]") - month_start).astype(np.int64)
+    seconds = (month_start + (day - 1)).astype("datetime64[s]") + (hour * 3600 + minute * 60 + second)
+    stamps = seconds.astype("datetime64[ns]")
+    stamps[~valid] = np.datetime64("NaT")
+    return pd.Series(stamps, index=values.index, name=values.name)
+
+
+def _parse_with_format(values: pd.Series, fmt: str) -> pd.Series:
+    parsed = _parse_fixed_width(values, fmt)
+    if parsed is None:
+        return _parse_with_pandas(values, fmt)
+    missed = parsed.isna() & values.notna()
+    if missed.any():
+        # e.g. values without zero padding, which pandas' own parser accepts.
+        parsed[missed.to_numpy()] = _parse_with_pandas(values[missed], fmt).to_numpy()
+    return parsed
+
+
+def _parse_with_pandas(values: pd.Series, fmt: str) -> pd.Series:
+    with warnings.catch_warnings():
+        # Mixed UTC offsets make pandas warn and return objects; callers treat that as a miss.
+        warnings.simplefilter("ignore", FutureWarning)
+        try:
+            parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+        except (TypeError, ValueError):
+            return pd.Series(pd.NaT, index=values.index)
+    if not pd.api.types.is_datetime64_any_dtype(parsed):
+        return pd.Series(pd.NaT, index=values.index)
+    return parsed
+
+
+def parse_datetimes(series: pd.Series, fmt: str | None = None) -> pd.Series:
+    """
+    Parse ``series`` as datetimes, with unparseable values as ``NaT``.
+
+    The whole column is parsed with ``fmt`` (inferred with
+    :func:`infer_datetime_format` when not given) in pandas' vectorized fixed-format
+    path; only the values that format misses are parsed element by element with
+    ``format="mixed"``.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if fmt is None:
+        fmt = infer_datetime_format(series)
+    if fmt is not None and fmt.startswith(EPOCH_PREFIX):
+        values = pd.to_numeric(series, errors="coerce")
+        return pd.to_datetime(values, unit=fmt[len(EPOCH_PREFIX):], errors="coerce")
+    if fmt is None:
+        return pd.to_datetime(series, errors="coerce", format="mixed")
+
+    parsed = _parse_with_format(series, fmt)
+    missed = parsed.isna() & series.notna()
+    if missed.any():
+        fallback = pd.to_datetime(series[missed], errors="coerce", format="mixed")
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)
+                parsed[missed.to_numpy()] = fallback.to_numpy()
+        except (TypeError, ValueError):
+            # The fallback disagrees on timezones with the fast path; parse everything the slow way.
+            return pd.to_datetime(series, errors="coerce", format="mixed")
+        if not pd.api.types.is_datetime64_any_dtype(parsed):
+            return pd.to_datetime(series, errors="coerce", format="mixed")
+    return parsed
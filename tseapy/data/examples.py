@@ -2,6 +2,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from tseapy.data.datetimes import parse_datetimes
+
 
 def get_air_quality_uci() -> pd.DataFrame:
     """
@@ -17,7 +19,7 @@ def get_air_quality_uci() -> pd.DataFrame:
     if {"Date", "Time"}.issubset(raw.columns):
         raw["date"] = pd.to_datetime(raw["Date"] + " " + raw["Time"], errors="coerce", format="%d/%m/%Y %H.%M.%S")
     elif "Date_Time" in raw.columns:
-        raw["date"] = pd.to_datetime(raw["Date_Time"], errors="coerce", format="mixed")
+        raw["date"] = parse_datetimes(raw["Date_Time"])
     else:
         raw["date"] = pd.to_datetime(raw.index, errors="coerce", format="mixed")
 
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from tseapy.data.datetimes import infer_datetime_format, parse_datetimes
+
+#: Non-null values of each column inspected to decide whether text values are dates.
+SAMPLE_ROWS = 100
+#: Rows converted to float at a time while accumulating numeric statistics.
+CHUNK_ROWS = 65536
+#: Share of sampled non-null values that must parse as datetimes for a ``date`` column.
+DATE_THRESHOLD = 0.8
+
+
+class ColumnProfile:
+    """
+    Type and summary statistics of one column.
+
+    ``minimum``/``maximum``/``mean``/``std`` are ``None`` unless the column is numeric;
+    ``datetime_format`` is the inferred parsing format of text date columns.
+    """
+
+    __slots__ = ("name", "kind", "count", "nulls", "minimum", "maximum", "mean", "std", "datetime_format")
+
+    def __init__(self, name, kind, count, nulls, minimum=None, maximum=None, mean=None, std=None,
+                 datetime_format=None):
+        self.name = name
+        self.kind = kind
+        self.count = count
+        self.nulls = nulls
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.std = std
+        self.datetime_format = datetime_format
+
+
+class DatasetProfile:
+    """Column profiles of a raw upload, plus the date range of its first date column."""
+
+    def __init__(self, columns: dict, row_count: int, date_range=None):
+        self.columns = columns
+        self.row_count = row_count
+        self.date_range = date_range
+
+    def kinds(self) -> dict:
+        return {name: column.kind for name, column in self.columns.items()}
+
+    def names(self, kind: str) -> list:
+        return [name for name, column in self.columns.items() if column.kind == kind]
+
+
+class _Moments:
+    """
+    Per-column count, mean, sum of squared deviations, minimum and maximum.
+
+    Chunks are folded in with Chan et al.'s pairwise update of Welford's algorithm,
+    so every value is read once and the result does not suffer from the
+    cancellation of a naive sum-of-squares.
+    """
+
+    def __init__(self, width: int):
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.minimum = np.full(width, np.inf)
+        self.maximum = np.full(width, -np.inf)
+
+    def update(self, block: np.ndarray):
+        present = ~np.isnan(block)
+        count = present.sum(axis=0).astype(float)
+        filled = np.where(present, block, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = filled.sum(axis=0) / count
+            deviations = np.where(present, block - mean, 0.0)
+            m2 = (deviations * deviations).sum(axis=0)
+            total = self.count + count
+            delta = np.nan_to_num(mean - self.mean)
+            weight = np.where(total > 0, count / total, 0.0)
+            self.m2 = self.m2 + np.nan_to_num(m2) + delta * delta * self.count * weight
+            self.mean = self.mean + delta * weight
+        self.count = total
+        self.minimum = np.fmin(self.minimum, np.where(present, block, np.inf).min(axis=0))
+        self.maximum = np.fmax(self.maximum, np.where(present, block, -np.inf).max(axis=0))
+
+
+def _sample_date_share(frame: pd.DataFrame, columns: list, sample_rows: int) -> dict:
+    # Each column contributes its first non-null values, so leading gaps do not hide a
+    # date column; all samples are parsed as one series instead of column by column.
+    if not columns:
+        return {}
+    sample = pd.concat({column: frame[column].dropna().head(sample_rows) for column in columns})
+    non_null = sample.groupby(level=0, sort=False).size()
+    sample = sample[sample.astype(str).str.contains(r"\d", regex=True)]
+    parsed = pd.to_datetime(sample, errors="coerce", format="mixed")
+    parsed_per_column = parsed.notna().groupby(level=0, sort=False).sum()
+    return {
+        column: (parsed_per_column.get(column, 0) / non_null[column]) if non_null.get(column, 0) else 0.0
+        for column in columns
+    }
+
+
+def _date_range(series: pd.Series, datetime_format: str | None):
+    # The whole column is parsed, so unordered exports still report their true range;
+    # with an inferred format this is the vectorized fast path of parse_datetimes.
+    values = series.dropna()
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = parse_datetimes(values, datetime_format)
+    if values.isna().all():
+        return None
+    return values.min(), values.max()
+
+
+def profile_frame(frame: pd.DataFrame, sample_rows: int = SAMPLE_ROWS, chunk_rows: int = CHUNK_ROWS) -> DatasetProfile:
+    """
+    Classify every column of ``frame`` and compute count, null count, min, max, mean and std.
+
+    Columns are typed from their dtype; text columns are only tested as dates on their
+    first ``sample_rows`` non-null values, all in one parse. Numeric statistics are accumulated
+    over blocks of ``chunk_rows`` rows covering every numeric column at once, so the
+    data is scanned a single time with bounded extra memory.
+    """
+    kinds = {}
+    text_columns = []
+    for column, dtype in frame.dtypes.items():
+        if pd.api.types.is_numeric_dtype(dtype):
+            kinds[column] = "numeric"
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            kinds[column] = "date"
+        else:
+            kinds[column] = "text"
+            text_columns.append(column)
+    for column, share in _sample_date_share(frame, text_columns, sample_rows).items():
+        if share >= DATE_THRESHOLD:
+            kinds[column] = "date"
+
+    nulls = frame.isna().sum()
+    numeric = [column for column, kind in kinds.items() if kind == "numeric"]
+    moments = _Moments(len(numeric))
+    if numeric:
+        positions = [frame.columns.get_loc(column) for column in numeric]
+        for start in range(0, len(frame), chunk_rows):
+            block = frame.iloc[start:start + chunk_rows, positions].to_numpy(dtype=np.float64, na_value=np.nan)
+            moments.update(block)
+
+    columns = {}
+    for column, kind in kinds.items():
+        columns[column] = ColumnProfile(column, kind, int(len(frame) - nulls[column]), int(nulls[column]))
+        if kind == "date" and column in text_columns:
+            columns[column].datetime_format = infer_datetime_format(frame[column], sample_rows)
+    for position, column in enumerate(numeric):
+        profile = columns[column]
+        if moments.count[position] == 0:
+            continue
+        profile.minimum = float(moments.minimum[position])
+        profile.maximum = float(moments.maximum[position])
+        profile.mean = float(moments.mean[position])
+        profile.std = float(np.sqrt(moments.m2[position] / moments.count[position]))
+
+    date_columns = [column for column, kind in kinds.items() if kind == "date"]
+    date_range = None
+    if date_columns:
+        first = columns[date_columns[0]]
+        date_range = _date_range(frame[first.name], first.datetime_format)
+    return DatasetProfile(columns, len(frame), date_range)
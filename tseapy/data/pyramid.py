@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+
+class PyramidLevel:
+    """Per-bucket aggregates of one column for a fixed bucket size."""
+
+    __slots__ = ("bucket_size", "minimum", "maximum", "argmin", "argmax", "mean", "count")
+
+    def __init__(self, bucket_size, minimum, maximum, argmin, argmax, mean, count):
+        self.bucket_size = bucket_size
+        self.minimum = minimum
+        self.maximum = maximum
+        self.argmin = argmin
+        self.argmax = argmax
+        self.mean = mean
+        self.count = count
+
+    def __len__(self):
+        return len(self.count)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__[1:])
+
+
+def _base_level(values: np.ndarray, bucket_size: int) -> PyramidLevel:
+    n = len(values)
+    buckets = -(-n // bucket_size)
+    padded = np.full(buckets * bucket_size, np.nan)
+    padded[:n] = values
+    blocks = padded.reshape(buckets, bucket_size)
+    missing = np.isnan(blocks)
+    count = (~missing).sum(axis=1)
+    offsets = np.arange(buckets, dtype=np.int64) * bucket_size
+    with np.errstate(invalid="ignore"):
+        argmin = np.where(missing, np.inf, blocks).argmin(axis=1) + offsets
+        argmax = np.where(missing, -np.inf, blocks).argmax(axis=1) + offsets
+        mean = np.where(missing, 0.0, blocks).sum(axis=1) / count
+    empty = count == 0
+    argmin[empty] = offsets[empty]
+    argmax[empty] = offsets[empty]
+    minimum = padded[argmin]
+    maximum = padded[argmax]
+    return PyramidLevel(bucket_size, minimum, maximum, argmin, argmax, mean, count)
+
+
+def _coarser_level(level: PyramidLevel, factor: int) -> PyramidLevel:
+    buckets = -(-len(level) // factor)
+    pad = buckets * factor - len(level)
+
+    def blocks(values, fill):
+        return np.concatenate([values, np.full(pad, fill, dtype=values.dtype)]).reshape(buckets, factor)
+
+    minimum = blocks(level.minimum, np.nan)
+    maximum = blocks(level.maximum, np.nan)
+    count = blocks(level.count, 0)
+    total = np.nan_to_num(blocks(level.mean, np.nan) * count).sum(axis=1)
+    merged_count = count.sum(axis=1)
+    rows = np.arange(buckets)
+    pick_min = np.where(count > 0, minimum, np.inf).argmin(axis=1)
+    pick_max = np.where(count > 0, maximum, -np.inf).argmax(axis=1)
+    with np.errstate(invalid="ignore"):
+        mean = total / merged_count
+    return PyramidLevel(
+        level.bucket_size * factor,
+        minimum[rows, pick_min],
+        maximum[rows, pick_max],
+        blocks(level.argmin, 0)[rows, pick_min],
+        blocks(level.argmax, 0)[rows, pick_max],
+        mean,
+        merged_count,
+    )
+
+
+class Pyramid:
+    """
+    Multi-resolution min/max/mean summary of a numeric series.
+
+    Level ``k`` aggregates buckets of ``base_bucket * factor**k`` consecutive points
+    and remembers where each bucket's minimum and maximum occur, so an envelope
+    drawn from any level passes through real data points. Building costs one pass
+    over the data plus a geometric series of smaller passes; with the defaults the
+    levels take about 4 bytes per point. The pyramid does not keep the series
+    itself: :meth:`query` takes the index and values it was built from.
+    """
+
+    def __init__(self, values, base_bucket: int = 16, factor: int = 4, min_buckets: int = 256):
+        values = np.asarray(values, dtype=np.float64)
+        self.length = len(values)
+        self.levels = []
+        if self.length <= base_bucket:
+            return
+        level = _base_level(values, base_bucket)
+        self.levels.append(level)
+        while len(level) > min_buckets:
+            level = _coarser_level(level, factor)
+            self.levels.append(level)
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def query(self, index: pd.Index, values: np.ndarray, start=None, end=None,
+              max_points: int = 2000, stat: str = "minmax"):
+        """
+        Return ``(x, y, bucket_size)`` for the points of ``index`` between ``start`` and ``end``.
+
+        Ranges holding at most ``max_points`` points are returned at full resolution
+        (``bucket_size`` 1). Otherwise the finest level that fits is used: ``minmax``
+        yields each bucket's extreme points in time order and ``mean`` one averaged
+        point per bucket at the bucket's first timestamp. Apart from the two binary
+        searches the work done is proportional to the number of points returned.
+        """
+        if stat not in ("minmax", "mean"):
+            raise ValueError('stat must be "minmax" or "mean"')
+        if len(index) != self.length:
+            raise ValueError("index does not match the series the pyramid was built from")
+        first = 0 if start is None else int(index.searchsorted(start, side="left"))
+        last = self.length if end is None else max(first, int(index.searchsorted(end, side="right")))
+        if last - first <= max_points or not self.levels:
+            return index[first:last], values[first:last], 1
+
+        per_bucket = 2 if stat == "minmax" else 1
+        level = self.levels[-1]
+        for candidate in self.levels:
+            if (last - first) // candidate.bucket_size * per_bucket <= max_points:
+                level = candidate
+                break
+        lo = first // level.bucket_size
+        hi = -(-last // level.bucket_size)
+        if stat == "mean":
+            positions = np.arange(lo, hi, dtype=np.int64) * level.bucket_size
+            return index[positions], level.mean[lo:hi], level.bucket_size
+
+        argmin = level.argmin[lo:hi]
+        argmax = level.argmax[lo:hi]
+        positions = np.column_stack([np.minimum(argmin, argmax), np.maximum(argmin, argmax)]).ravel()
+        # Each bucket contributes its extremes; an empty bucket contributes one NaN so the chart shows the gap.
+        keep = np.ones(len(positions), dtype=bool)
+        keep[1::2] = (level.count[lo:hi] > 0) & (argmin != argmax)
+        positions = positions[keep]
+        positions = positions[(positions >= first) & (positions < last)]
+        return index[positions], values[positions], level.bucket_size
+
+
+def build_pyramids(frame: pd.DataFrame, **options) -> dict:
+    """Build a :class:`Pyramid` for every numeric column of ``frame``."""
+    return {
+        column: Pyramid(frame[column].to_numpy(dtype=np.float64, na_value=np.nan), **options)
+        for column in frame.columns
+        if pd.api.types.is_numeric_dtype(frame[column])
+    }
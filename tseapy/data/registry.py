@@ -0,0 +1,395 @@
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tseapy.core.result_cache import dataset_fingerprint
+from tseapy.data.compression import CompressedFrame, resolve_codec
+from tseapy.data.shared_store import SharedDatasetStore, read_frame
+
+
+def freeze_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a frame sharing ``frame``'s buffers with every NumPy column marked read-only.
+
+    No data is copied; in-place writes through the returned frame (``loc``/``iloc``
+    assignment, ``Series`` item assignment) raise ``ValueError``. Callers that need
+    to modify data must work on ``frame.copy()``.
+    """
+    columns = {}
+    for position in range(frame.shape[1]):
+        series = frame.iloc[:, position]
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy().view()
+            values.flags.writeable = False
+        else:
+            values = series.array
+        columns[position] = values
+    frozen = pd.DataFrame(columns, index=frame.index, copy=False)
+    frozen.columns = frame.columns
+    frozen.attrs = dict(frame.attrs)
+    return frozen
+
+
+def frame_nbytes(frame: pd.DataFrame) -> int:
+    """Return the in-memory size of ``frame`` including its index and object payloads."""
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+class DatasetEntry:
+    """
+    Handle to a dataset held by the registry: resident in memory, compressed in memory, or spilled to disk.
+
+    ``frame`` is shared by every request that resolves this entry and is read-only
+    (see :func:`freeze_frame`); use :meth:`writable_copy` to obtain a private copy.
+    Entries backed by a :class:`~tseapy.data.shared_store.SharedDatasetStore` carry a
+    picklable ``reference`` that other processes resolve by mapping the same file.
+    """
+
+    def __init__(self, dataset_id: str, frame: pd.DataFrame, content_addressed: bool = False):
+        self.dataset_id = dataset_id
+        self.frame = freeze_frame(frame)
+        self.nbytes = frame_nbytes(frame)
+        self.artifacts = {}
+        self.spill_path = None
+        self.compressed = None
+        self.refs = 0
+        self.content_addressed = content_addressed
+        self.released = None
+        self.reference = None
+        self._fingerprint = None
+
+    @property
+    def resident(self) -> bool:
+        return self.frame is not None
+
+    def column(self, name) -> np.ndarray:
+        """Return a read-only view of one column's values."""
+        return self.frame[name].to_numpy()
+
+    def writable_copy(self) -> pd.DataFrame:
+        return self.frame.copy(deep=True)
+
+    @property
+    def fingerprint(self) -> str:
+        return self.fingerprint_of(self.frame)
+
+    def fingerprint_of(self, frame: pd.DataFrame) -> str:
+        """Return the fingerprint, computed from ``frame`` (this entry's data, e.g. from :meth:`DatasetRegistry.resolve`) once."""
+        if self._fingerprint is None:
+            self._fingerprint = dataset_fingerprint(frame)
+        return self._fingerprint
+
+
+class DatasetRegistry:
+    """
+    Session-scoped dataset storage with a shared memory budget.
+
+    Each workspace (one per browser session) maps named slots such as ``raw``
+    and ``active`` to dataset entries. Entries are kept in LRU order; when the
+    resident total exceeds the budget the least recently used entries are
+    pickled to the spill directory and reloaded on their next access.
+    Workspaces idle for longer than ``ttl`` seconds are dropped entirely.
+
+    With ``compression`` (a codec name from :mod:`tseapy.data.compression`, or
+    ``auto``), datasets evicted from the resident set are first kept compressed in
+    memory, and only spilled, compressed, once those no longer fit the budget either.
+    An access decompresses the dataset and makes it resident again.
+
+    Resident frames are never pickled or copied on access: :meth:`get` returns the
+    same read-only entry to every caller.
+
+    Datasets stored under an explicit ``dataset_id`` (a content hash of the upload,
+    or a fixed id for built-in data) are shared: storing the same id again links the
+    existing entry, with its frame and artifacts, into the new slot. When no slot
+    refers to such an entry any more it is kept as a cache until it is idle for
+    ``ttl`` seconds or memory is needed, and is dropped rather than spilled.
+
+    With a ``store`` (``DATASET_STORE_DIR``), datasets and slot assignments live in a
+    :class:`~tseapy.data.shared_store.SharedDatasetStore` instead, so every server
+    worker sees the same workspaces. Each process then only keeps memory-mapped
+    entries, with their artifacts, as an LRU cache within the memory budget.
+    """
+
+    def __init__(self, memory_budget: int = 1024 * 1024 * 1024, spill_dir=None, ttl: float | None = 3600,
+                 store: SharedDatasetStore | None = None, compression: str | None = None):
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._resident = OrderedDict()
+        self._compressed = OrderedDict()
+        self._workspaces = {}
+        self._touched = {}
+        self._used = 0
+        self.memory_budget = memory_budget
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.ttl = ttl
+        self.store = store
+        self.codec = resolve_codec(compression)
+
+    def init_app(self, app):
+        # The shared store is joined, not cleared: other workers may already be serving
+        # from it, and a workspace directory is meant to outlive the process.
+        self.store = None
+        self.clear()
+        self.memory_budget = int(app.config.get("DATASET_MEMORY_MB", 1024)) * 1024 * 1024
+        spill_dir = app.config.get("DATASET_SPILL_DIR")
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        ttl = app.config.get("DATASET_TTL")
+        self.ttl = float(ttl) if ttl else None
+        self.codec = resolve_codec(app.config.get("DATASET_COMPRESSION"))
+        store_dir = app.config.get("DATASET_STORE_DIR")
+        self.store = SharedDatasetStore(store_dir) if store_dir else None
+
+    @staticmethod
+    def new_workspace_id() -> str:
+        return secrets.token_hex(16)
+
+    def put(self, workspace_id: str, slot: str, frame: pd.DataFrame, dataset_id: str | None = None) -> DatasetEntry:
+        if self.store is not None:
+            self._expire_idle()
+            content_addressed = dataset_id is not None
+            dataset_id = dataset_id or secrets.token_hex(16)
+            self.store.add(dataset_id, frame, frame_nbytes(frame), content_addressed=content_addressed)
+            self.store.link(workspace_id, slot, dataset_id)
+            return self._mapped(dataset_id)
+        with self._lock:
+            self._expire_idle()
+            entry = self._entries.get(dataset_id) if dataset_id is not None else None
+            if entry is None:
+                entry = DatasetEntry(dataset_id or secrets.token_hex(16), frame, content_addressed=dataset_id is not None)
+                self._entries[entry.dataset_id] = entry
+            self._link(workspace_id, slot, entry)
+            return entry
+
+    def link(self, workspace_id: str, slot: str, dataset_id: str) -> DatasetEntry | None:
+        """Put the already stored dataset ``dataset_id`` into a slot; returns ``None`` if it is not stored."""
+        if self.store is not None:
+            self._expire_idle()
+            return self._mapped(dataset_id) if self.store.link(workspace_id, slot, dataset_id) else None
+        with self._lock:
+            self._expire_idle()
+            entry = self._entries.get(dataset_id)
+            if entry is None:
+                return None
+            self._link(workspace_id, slot, entry)
+            return entry
+
+    def put_shared(self, workspace_id: str, slot: str, dataset_id: str, load) -> DatasetEntry:
+        """
+        Put the dataset stored as ``dataset_id`` into a slot, calling ``load()`` for its frame only if it is not stored.
+
+        ``load`` runs outside the registry lock, so two sessions loading the same new
+        content at once may both parse it; the second :meth:`put` then links the first entry.
+        """
+        entry = self.link(workspace_id, slot, dataset_id)
+        if entry is not None:
+            return entry
+        return self.put(workspace_id, slot, load(), dataset_id=dataset_id)
+
+    def get(self, workspace_id: str, slot: str) -> DatasetEntry | None:
+        return self.resolve(workspace_id, slot)[0]
+
+    def resolve(self, workspace_id: str, slot: str) -> tuple:
+        """
+        Return ``(entry, frame)`` for a slot, or ``(None, None)`` when it is empty.
+
+        ``frame`` is read while the registry lock keeps the entry resident. A concurrent
+        :meth:`put` may evict the entry right afterwards and clear ``entry.frame``, so
+        a request should keep using this frame instead of reading ``entry.frame`` again.
+        """
+        if self.store is not None:
+            dataset_id = self.store.resolve(workspace_id, slot)
+            return self._mapped(dataset_id, with_frame=True) if dataset_id is not None else (None, None)
+        with self._lock:
+            dataset_id = self._workspaces.get(workspace_id, {}).get(slot)
+            if dataset_id is None:
+                return None, None
+            self._touched[workspace_id] = time.monotonic()
+            entry = self._entries[dataset_id]
+            self._restore(entry)
+            self._make_resident(entry)
+            return entry, entry.frame
+
+    def artifact(self, entry: DatasetEntry, name: str, build):
+        """
+        Return the artifact ``name`` of ``entry``, computing it with ``build()`` only once.
+
+        With a store, artifacts are saved next to the dataset, so other workers and
+        a restarted server read them back instead of computing them again.
+        """
+        value = entry.artifacts.get(name)
+        if value is None and entry.reference is not None:
+            value = self.store.load_artifact(entry.dataset_id, name)
+            if value is not None:
+                entry.artifacts[name] = value
+        if value is None:
+            value = build()
+            self.set_artifact(entry, name, value)
+        return value
+
+    def set_artifact(self, entry: DatasetEntry, name: str, value):
+        entry.artifacts[name] = value
+        if entry.reference is not None:
+            self.store.save_artifact(entry.dataset_id, name, value)
+
+    def discard(self, workspace_id: str, slot: str):
+        if self.store is not None:
+            self.store.unlink(workspace_id, slot)
+            return
+        with self._lock:
+            self._unlink(workspace_id, slot)
+            if not self._workspaces.get(workspace_id):
+                self._workspaces.pop(workspace_id, None)
+                self._touched.pop(workspace_id, None)
+
+    def clear(self):
+        with self._lock:
+            for entry in list(self._entries.values()):
+                self._drop(entry)
+            self._workspaces.clear()
+            self._touched.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self.store is not None:
+                return dict(self.store.stats(), resident=len(self._resident), resident_bytes=self._used,
+                            memory_budget=self.memory_budget)
+            return {
+                "workspaces": len(self._workspaces),
+                "datasets": len(self._entries),
+                "unreferenced": sum(1 for entry in self._entries.values() if entry.refs <= 0),
+                "resident": len(self._resident),
+                "compressed": len(self._compressed),
+                "compressed_bytes": sum(entry.compressed.nbytes for entry in self._compressed.values()),
+                "resident_bytes": self._used,
+                "memory_budget": self.memory_budget,
+            }
+
+    def _mapped(self, dataset_id: str, with_frame: bool = False):
+        # Dataset ids in the shared store are never reused for other data, so a
+        # mapped entry stays valid for as long as this process keeps it.
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is None:
+                try:
+                    frame = read_frame(self.store.path(dataset_id))
+                except FileNotFoundError:
+                    # Dropped by another process since the slot was resolved.
+                    return (None, None) if with_frame else None
+                entry = DatasetEntry(dataset_id, frame, content_addressed=True)
+                entry.reference = self.store.reference(dataset_id)
+                self._entries[dataset_id] = entry
+            self._make_resident(entry)
+            return (entry, entry.frame) if with_frame else entry
+
+    def _link(self, workspace_id: str, slot: str, entry: DatasetEntry):
+        # Take the new reference before releasing the slot, which may hold this same entry.
+        entry.refs += 1
+        entry.released = None
+        self._unlink(workspace_id, slot)
+        self._workspaces.setdefault(workspace_id, {})[slot] = entry.dataset_id
+        self._touched[workspace_id] = time.monotonic()
+        self._restore(entry)
+        self._make_resident(entry)
+
+    def _unlink(self, workspace_id: str, slot: str):
+        dataset_id = self._workspaces.get(workspace_id, {}).pop(slot, None)
+        if dataset_id is None:
+            return
+        entry = self._entries[dataset_id]
+        entry.refs -= 1
+        if entry.refs <= 0:
+            if entry.content_addressed:
+                entry.released = time.monotonic()
+            else:
+                self._drop(entry)
+
+    def _drop(self, entry: DatasetEntry):
+        self._entries.pop(entry.dataset_id, None)
+        if self._resident.pop(entry.dataset_id, None) is not None:
+            self._used -= entry.nbytes
+        if self._compressed.pop(entry.dataset_id, None) is not None:
+            self._used -= entry.compressed.nbytes
+        if entry.spill_path is not None:
+            entry.spill_path.unlink(missing_ok=True)
+        entry.frame = None
+        entry.compressed = None
+
+    def _restore(self, entry: DatasetEntry):
+        if entry.resident:
+            return
+        if entry.compressed is not None:
+            stored = entry.compressed
+            del self._compressed[entry.dataset_id]
+            self._used -= stored.nbytes
+            entry.compressed = None
+        else:
+            stored = pd.read_pickle(entry.spill_path)
+        entry.frame = freeze_frame(stored.decompress() if isinstance(stored, CompressedFrame) else stored)
+
+    def _make_resident(self, entry: DatasetEntry):
+        if entry.dataset_id in self._resident:
+            self._resident.move_to_end(entry.dataset_id)
+        else:
+            self._resident[entry.dataset_id] = entry
+            self._used += entry.nbytes
+        while self._used > self.memory_budget and len(self._resident) > 1:
+            victim_id = next(iter(self._resident))
+            if victim_id == entry.dataset_id:
+                break
+            victim = self._resident[victim_id]
+            if victim.refs <= 0:
+                # Unreferenced shared entries are only a cache and are not worth a spill file.
+                self._drop(victim)
+            elif self.codec is not None:
+                self._compress(self._resident.pop(victim_id))
+            else:
+                self._spill(self._resident.pop(victim_id))
+        while self._used > self.memory_budget and self._compressed:
+            self._spill(self._compressed.popitem(last=False)[1])
+
+    def _compress(self, entry: DatasetEntry):
+        entry.compressed = CompressedFrame(entry.frame, self.codec)
+        entry.frame = None
+        self._compressed[entry.dataset_id] = entry
+        self._used += entry.compressed.nbytes - entry.nbytes
+
+    def _spill(self, entry: DatasetEntry):
+        # Entries are read-only, so a spill file written once stays valid for every later eviction.
+        stored = entry.compressed if entry.compressed is not None else entry.frame
+        if entry.spill_path is None:
+            if self.spill_dir is None:
+                self.spill_dir = Path(tempfile.mkdtemp(prefix="tseapy-datasets-"))
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            entry.spill_path = self.spill_dir / f"{entry.dataset_id}.pkl"
+            pd.to_pickle(stored, entry.spill_path)
+        if entry.compressed is not None:
+            self._used -= entry.compressed.nbytes
+            entry.compressed = None
+        else:
+            entry.frame = None
+            self._used -= entry.nbytes
+
+    def _expire_idle(self):
+        if not self.ttl:
+            return
+        if self.store is not None:
+            self.store.expire(self.ttl)
+            return
+        deadline = time.monotonic() - self.ttl
+        for workspace_id, touched in list(self._touched.items()):
+            if touched < deadline:
+                for slot in list(self._workspaces.get(workspace_id, {})):
+                    self._unlink(workspace_id, slot)
+                self._workspaces.pop(workspace_id, None)
+                self._touched.pop(workspace_id, None)
+        for entry in list(self._entries.values()):
+            if entry.released is not None and entry.released < deadline:
+                self._drop(entry)
@@ -0,0 +1,368 @@
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+#: Schema metadata key holding column names and the index description.
+_METADATA_KEY = b"tseapy"
+#: NumPy dtype kinds stored as Arrow primitives and mapped back without a copy.
+_PRIMITIVE_KINDS = "iufmM"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    dataset_id TEXT PRIMARY KEY,
+    nbytes INTEGER NOT NULL,
+    content_addressed INTEGER NOT NULL,
+    released REAL
+);
+CREATE TABLE IF NOT EXISTS slots (
+    workspace_id TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    dataset_id TEXT NOT NULL,
+    PRIMARY KEY (workspace_id, slot)
+);
+CREATE INDEX IF NOT EXISTS slots_dataset ON slots (dataset_id);
+CREATE TABLE IF NOT EXISTS workspaces (
+    workspace_id TEXT PRIMARY KEY,
+    touched REAL NOT NULL
+);
+"""
+
+
+def _to_arrow(values):
+    import pyarrow as pa
+
+    if isinstance(values, np.ndarray) and values.dtype.kind in _PRIMITIVE_KINDS:
+        # Without ``from_pandas`` NaN stays a float value instead of becoming a null,
+        # so float columns come back as a view of the file.
+        return pa.array(values)
+    try:
+        return pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Object columns mixing types (e.g. numbers and text) are stored as text.
+        return pa.array([None if _is_missing(value) else str(value) for value in values], type=pa.string())
+
+
+def _is_missing(value) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _from_arrow(array):
+    import pyarrow as pa
+
+    primitive = pa.types.is_integer(array.type) or pa.types.is_floating(array.type) or pa.types.is_duration(array.type)
+    naive_timestamp = pa.types.is_timestamp(array.type) and array.type.tz is None
+    if (primitive or naive_timestamp) and array.null_count == 0:
+        return array.to_numpy(zero_copy_only=True)
+    return array.to_pandas().array
+
+
+def write_frame(path, frame: pd.DataFrame):
+    """
+    Write ``frame`` to ``path`` as an uncompressed Arrow IPC file, atomically.
+
+    Numeric and timestamp columns are stored as plain Arrow buffers that
+    :func:`read_frame` maps without copying; column labels and the index are kept in
+    the schema metadata. Object columns Arrow cannot type are stored as text.
+    """
+    import pyarrow as pa
+
+    arrays, names = [], []
+    for position in range(frame.shape[1]):
+        series = frame.iloc[:, position]
+        arrays.append(_to_arrow(series.to_numpy() if isinstance(series.dtype, np.dtype) else series))
+        names.append(f"c{position}")
+    index = frame.index
+    if isinstance(index, pd.RangeIndex):
+        index_meta = {"kind": "range", "start": index.start, "stop": index.stop, "step": index.step}
+    else:
+        index_meta = {"kind": "column"}
+        arrays.append(_to_arrow(index.to_numpy() if isinstance(index.dtype, np.dtype) else index.array))
+        names.append("index")
+    index_meta["name"] = index.name
+    metadata = {"columns": [_json_label(column) for column in frame.columns], "index": index_meta}
+    table = pa.Table.from_arrays(arrays, names=names, metadata={_METADATA_KEY: json.dumps(metadata)})
+
+    path = Path(path)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+    try:
+        with pa.OSFile(str(partial), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            # One record batch keeps every column in a single contiguous buffer.
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _single_chunk(column):
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def _json_label(label):
+    return label if isinstance(label, (str, int, float, bool)) or label is None else str(label)
+
+
+def read_frame(path) -> pd.DataFrame:
+    """
+    Memory-map an Arrow file written by :func:`write_frame` and return it as a frame.
+
+    Numeric and timestamp columns without nulls are read-only views of the mapped
+    file, shared through the page cache by every process that reads it.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    metadata = json.loads(table.schema.metadata[_METADATA_KEY])
+    index_meta = metadata["index"]
+    columns = {
+        position: _from_arrow(_single_chunk(table.column(position))) for position in range(len(metadata["columns"]))
+    }
+    if index_meta["kind"] == "range":
+        index = pd.RangeIndex(index_meta["start"], index_meta["stop"], index_meta["step"], name=index_meta["name"])
+    else:
+        index = pd.Index(_from_arrow(_single_chunk(table.column("index"))), name=index_meta["name"], copy=False)
+    frame = pd.DataFrame(columns, index=index, copy=False)
+    frame.columns = metadata["columns"]
+    return frame
+
+
+class DatasetRef:
+    """Picklable reference to a dataset in a :class:`SharedDatasetStore`, resolved by memory-mapping it."""
+
+    __slots__ = ("path", "dataset_id")
+
+    def __init__(self, path, dataset_id: str):
+        self.path = str(path)
+        self.dataset_id = dataset_id
+
+    def __getstate__(self):
+        return self.path, self.dataset_id
+
+    def __setstate__(self, state):
+        self.path, self.dataset_id = state
+
+    def load(self) -> pd.DataFrame:
+        try:
+            return read_frame(self.path)
+        except FileNotFoundError:
+            raise ValueError("The dataset is no longer available. Please load it again.") from None
+
+
+class SharedIndex:
+    # SQLite index in ``directory`` that processes on one host read and update concurrently.
+    schema = ""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.sqlite"
+        self._local = threading.local()
+        self._connect().executescript(self.schema)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread and process; connections are not shared across fork.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connect()
+        # Take the write lock up front so concurrent read-then-write sequences serialize.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+class SharedDatasetStore(SharedIndex):
+    """
+    Datasets and workspace slots shared by all processes on a host.
+
+    Each dataset is one Arrow IPC file in ``directory``, written once and then only
+    memory-mapped; the slot assignments, reference state and idle times live in a
+    SQLite index next to them, which is the only state processes synchronize on.
+    Files are removed when their dataset is dropped; processes that still map one
+    keep reading it until they let go.
+
+    Nothing is loaded when a store is opened: a directory that outlives the server
+    (``TSEAPY_WORKSPACE_DIR``) restores every workspace after a restart, and each
+    dataset is only mapped, and its artifacts read, when a request uses it.
+    """
+
+    schema = _SCHEMA
+
+    def __init__(self, directory):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("The shared dataset store requires pyarrow: pip install tseapy[fast]") from None
+        super().__init__(directory)
+
+    def path(self, dataset_id: str) -> Path:
+        return self.directory / f"{dataset_id}.arrow"
+
+    def reference(self, dataset_id: str) -> DatasetRef:
+        return DatasetRef(self.path(dataset_id), dataset_id)
+
+    def artifact_path(self, dataset_id: str, name: str) -> Path:
+        return self.directory / "artifacts" / f"{dataset_id}.{name}.pkl"
+
+    def save_artifact(self, dataset_id: str, name: str, value):
+        """Keep a value derived from a dataset (its profile, zoom pyramids) next to it, atomically."""
+        path = self.artifact_path(dataset_id, name)
+        path.parent.mkdir(exist_ok=True)
+        partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+        try:
+            with open(partial, "wb") as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def load_artifact(self, dataset_id: str, name: str):
+        """Return the artifact saved by :meth:`save_artifact`, or ``None``."""
+        try:
+            with open(self.artifact_path(dataset_id, name), "rb") as handle:
+                return pickle.load(handle)
+        except FileNotFoundError:
+            return None
+
+    def contains(self, dataset_id: str) -> bool:
+        row = self._connect().execute("SELECT 1 FROM datasets WHERE dataset_id = ?", (dataset_id,)).fetchone()
+        return row is not None
+
+    def add(self, dataset_id: str, frame: pd.DataFrame, nbytes: int, content_addressed: bool):
+        """Store ``frame`` as ``dataset_id`` unless another process already stored it."""
+        if self.contains(dataset_id):
+            return
+        write_frame(self.path(dataset_id), frame)
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO datasets (dataset_id, nbytes, content_addressed, released) "
+                "VALUES (?, ?, ?, ?)",
+                (dataset_id, nbytes, int(content_addressed), time.time()),
+            )
+
+    def link(self, workspace_id: str, slot: str, dataset_id: str) -> bool:
+        """Point a slot at a stored dataset; returns ``False`` if the dataset is not stored."""
+        with self._transaction() as connection:
+            if connection.execute("SELECT 1 FROM datasets WHERE dataset_id = ?", (dataset_id,)).fetchone() is None:
+                return False
+            previous = self._slot(connection, workspace_id, slot)
+            connection.execute(
+                "INSERT OR REPLACE INTO slots (workspace_id, slot, dataset_id) VALUES (?, ?, ?)",
+                (workspace_id, slot, dataset_id),
+            )
+            connection.execute("UPDATE datasets SET released = NULL WHERE dataset_id = ?", (dataset_id,))
+            self._touch(connection, workspace_id)
+            if previous is not None and previous != dataset_id:
+                self._release(connection, previous)
+        return True
+
+    def resolve(self, workspace_id: str, slot: str) -> str | None:
+        """Return the dataset id in a slot and mark the workspace as used."""
+        connection = self._connect()
+        dataset_id = self._slot(connection, workspace_id, slot)
+        if dataset_id is not None:
+            with self._transaction() as connection:
+                self._touch(connection, workspace_id)
+        return dataset_id
+
+    def unlink(self, workspace_id: str, slot: str):
+        with self._transaction() as connection:
+            dataset_id = self._slot(connection, workspace_id, slot)
+            if dataset_id is None:
+                return
+            connection.execute("DELETE FROM slots WHERE workspace_id = ? AND slot = ?", (workspace_id, slot))
+            if connection.execute("SELECT 1 FROM slots WHERE workspace_id = ?", (workspace_id,)).fetchone() is None:
+                connection.execute("DELETE FROM workspaces WHERE workspace_id = ?", (workspace_id,))
+            self._release(connection, dataset_id)
+
+    def expire(self, ttl: float):
+        """Drop workspaces idle for ``ttl`` seconds and shared datasets unreferenced for as long."""
+        deadline = time.time() - ttl
+        with self._transaction() as connection:
+            idle = [row[0] for row in connection.execute(
+                "SELECT workspace_id FROM workspaces WHERE touched < ?", (deadline,)
+            )]
+            for workspace_id in idle:
+                released = [row[0] for row in connection.execute(
+                    "SELECT dataset_id FROM slots WHERE workspace_id = ?", (workspace_id,)
+                )]
+                connection.execute("DELETE FROM slots WHERE workspace_id = ?", (workspace_id,))
+                connection.execute("DELETE FROM workspaces WHERE workspace_id = ?", (workspace_id,))
+                for dataset_id in released:
+                    self._release(connection, dataset_id)
+            stale = [row[0] for row in connection.execute(
+                "SELECT dataset_id FROM datasets WHERE released IS NOT NULL AND released < ?", (deadline,)
+            )]
+            for dataset_id in stale:
+                self._delete(connection, dataset_id)
+
+    def clear(self):
+        with self._transaction() as connection:
+            for (dataset_id,) in connection.execute("SELECT dataset_id FROM datasets").fetchall():
+                self._delete(connection, dataset_id)
+            connection.execute("DELETE FROM slots")
+            connection.execute("DELETE FROM workspaces")
+
+    def stats(self) -> dict:
+        connection = self._connect()
+        workspaces, = connection.execute("SELECT COUNT(*) FROM workspaces").fetchone()
+        datasets, stored_bytes = connection.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM datasets").fetchone()
+        unreferenced, = connection.execute(
+            "SELECT COUNT(*) FROM datasets WHERE dataset_id NOT IN (SELECT dataset_id FROM slots)"
+        ).fetchone()
+        return {"workspaces": workspaces, "datasets": datasets, "unreferenced": unreferenced,
+                "stored_bytes": stored_bytes}
+
+    @staticmethod
+    def _slot(connection, workspace_id: str, slot: str) -> str | None:
+        row = connection.execute(
+            "SELECT dataset_id FROM slots WHERE workspace_id = ? AND slot = ?", (workspace_id, slot)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _touch(connection, workspace_id: str):
+        connection.execute(
+            "INSERT OR REPLACE INTO workspaces (workspace_id, touched) VALUES (?, ?)", (workspace_id, time.time())
+        )
+
+    def _release(self, connection, dataset_id: str):
+        if connection.execute("SELECT 1 FROM slots WHERE dataset_id = ?", (dataset_id,)).fetchone() is not None:
+            return
+        row = connection.execute("SELECT content_addressed FROM datasets WHERE dataset_id = ?", (dataset_id,)).fetchone()
+        if row is None:
+            return
+        if row[0]:
+            # Shared content stays cached until it has been unreferenced for the TTL.
+            connection.execute("UPDATE datasets SET released = ? WHERE dataset_id = ?", (time.time(), dataset_id))
+        else:
+            self._delete(connection, dataset_id)
+
+    def _delete(self, connection, dataset_id: str):
+        connection.execute("DELETE FROM datasets WHERE dataset_id = ?", (dataset_id,))
+        self.path(dataset_id).unlink(missing_ok=True)
+        for path in (self.directory / "artifacts").glob(f"{dataset_id}.*.pkl"):
+            path.unlink(missing_ok=True)
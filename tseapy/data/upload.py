@@ -1,31 +1,205 @@
+import bz2
+import codecs
+import csv
+import gzip
+import hashlib
 import io
+import mmap
+import os
+import tempfile
 
 import pandas as pd
 from charset_normalizer import from_bytes
 from pandas.errors import EmptyDataError, ParserError
 from werkzeug.datastructures import FileStorage
 
+#: Bytes inspected to detect the encoding, delimiter and column types.
+SNIFF_BYTES = 256 * 1024
+#: Payloads at least this large are parsed with the multi-threaded pyarrow engine when it is installed.
+PYARROW_MIN_BYTES = 16 * 1024 * 1024
+#: Uploaded files are read and decompressed in chunks of this size.
+CHUNK_BYTES = 1024 * 1024
+#: Supported file name suffixes mapped to ``(format, compression)``.
+UPLOAD_FORMATS = {
+    ".csv": ("csv", None),
+    ".csv.gz": ("csv", "gzip"),
+    ".csv.bz2": ("csv", "bz2"),
+    ".csv.zst": ("csv", "zstd"),
+    ".parquet": ("parquet", None),
+    ".feather": ("arrow", None),
+    ".arrow": ("arrow", None),
+}
+_DELIMITERS = ",;\t|"
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
 
-class CSVUploadError(ValueError):
+
+class UploadError(ValueError):
+    """Raised when uploaded content cannot be read safely."""
+
+
+class CSVUploadError(UploadError):
     """Raised when uploaded CSV content cannot be parsed safely."""
 
 
-def parse_csv_upload(file_storage: FileStorage) -> pd.DataFrame:
-    raw = file_storage.read()
-    if not raw:
-        raise CSVUploadError("The uploaded file is empty.")
+def upload_format(filename: str):
+    """Return ``(format, compression)`` for a supported file name, or ``None``."""
+    lowered = (filename or "").lower()
+    for suffix in sorted(UPLOAD_FORMATS, key=len, reverse=True):
+        if lowered.endswith(suffix) and len(lowered) > len(suffix):
+            return UPLOAD_FORMATS[suffix]
+    return None
+
+
+def content_digest(source) -> str:
+    """
+    Return a BLAKE2b hex digest of an upload's bytes, read in :data:`CHUNK_BYTES` pieces.
+
+    ``source`` is a path or a seekable binary stream, which is rewound afterwards.
+    Identical uploads get the same digest, so it serves as their dataset id.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as handle:
+            for piece in iter(lambda: handle.read(CHUNK_BYTES), b""):
+                digest.update(piece)
+        return digest.hexdigest()
+    for piece in iter(lambda: source.read(CHUNK_BYTES), b""):
+        digest.update(piece)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+def _prefix(raw: bytes) -> bytes:
+    """Return the leading complete lines of ``raw``, at most :data:`SNIFF_BYTES` long."""
+    if len(raw) <= SNIFF_BYTES:
+        return raw
+    head = raw[:SNIFF_BYTES]
+    cut = head.rfind(b"\n")
+    return head[:cut + 1] if cut > 0 else head
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Detect the text encoding from a sample: byte order mark, then strict UTF-8, then charset detection."""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    best_match = from_bytes(sample).best()
+    return best_match.encoding if best_match and best_match.encoding else "utf-8"
+
+
+def detect_delimiter(text: str) -> str:
+    """Return the delimiter of a CSV sample, raising ``csv.Error`` when it is ambiguous."""
+    lines = [line for line in text.splitlines() if line.strip()][:50]
+    if not lines:
+        raise csv.Error("No rows to sniff")
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=_DELIMITERS).delimiter
+    except csv.Error:
+        pass
+    # The sniffer gives up on quoted or ragged samples; fall back to the candidate
+    # that splits the header into the most fields and appears on every line.
+    counts = {d: lines[0].count(d) for d in _DELIMITERS if all(d in line for line in lines)}
+    if not counts or max(counts.values()) == 0:
+        raise csv.Error("Could not determine delimiter")
+    return max(counts, key=counts.get)
+
+
+def _prefix_dtypes(sample: pd.DataFrame) -> dict:
+    """
+    Pin float columns seen in the sample to ``float64`` and text columns to ``object``.
 
-    best_match = from_bytes(raw).best()
+    Integer columns are left to the parser so that they stay integers unless the
+    full file contains missing values. Columns that are empty in the sample are
+    not pinned.
+    """
+    dtypes = {}
+    for column in sample.columns:
+        series = sample[column]
+        if series.isna().all():
+            continue
+        if pd.api.types.is_float_dtype(series):
+            dtypes[column] = "float64"
+        elif pd.api.types.is_object_dtype(series):
+            dtypes[column] = "object"
+    return dtypes
+
+
+def _choose_engine(engine: str, size: int) -> str:
+    if engine != "auto":
+        return engine
+    if size >= PYARROW_MIN_BYTES:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return "c"
+        return "pyarrow"
+    return "c"
+
+
+def _source(content):
+    """Return something ``pd.read_csv`` can read: a buffer over bytes, or the path itself."""
+    return io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+
+
+def _read_fast(content, sample: bytes, size: int, engine: str) -> pd.DataFrame:
+    """
+    Parse with the C or pyarrow engine using settings detected from a bounded prefix.
+
+    Raises whatever the parser raises; the caller falls back to the tolerant path.
+    """
+    encoding = detect_encoding(sample)
+    delimiter = detect_delimiter(sample.decode(encoding, errors="replace"))
+    sample_frame = pd.read_csv(io.BytesIO(sample), sep=delimiter, engine="c", encoding=encoding)
+    if len(sample_frame.columns) < 2 and size > len(sample):
+        raise csv.Error("Sample parsed into a single column")
+    options = {
+        "sep": delimiter,
+        "encoding": encoding,
+        "on_bad_lines": "skip",
+    }
+    engine = _choose_engine(engine, size)
+    if engine == "c":
+        options["dtype"] = _prefix_dtypes(sample_frame)
+        options["low_memory"] = False
+    return pd.read_csv(_source(content), engine=engine, **options)
+
+
+def _read_tolerant(content, detection_sample: bytes) -> pd.DataFrame:
+    best_match = from_bytes(detection_sample).best()
     encoding = best_match.encoding if best_match and best_match.encoding else "utf-8"
+    return pd.read_csv(
+        _source(content),
+        sep=None,
+        engine="python",
+        on_bad_lines="skip",
+        encoding=encoding
+    )
+
+
+def _parse_csv(content, sample: bytes, size: int, engine: str, detection_sample: bytes) -> pd.DataFrame:
+    if size == 0:
+        raise CSVUploadError("The uploaded file is empty.")
 
     try:
-        dataframe = pd.read_csv(
-            io.BytesIO(raw),
-            sep=None,
-            engine="python",
-            on_bad_lines="skip",
-            encoding=encoding
-        )
+        try:
+            if engine == "python":
+                raise ValueError("tolerant parsing requested")
+            dataframe = _read_fast(content, sample, size, engine)
+        except MemoryError:
+            raise
+        except (ValueError, ParserError, EmptyDataError, UnicodeError, csv.Error, TypeError):
+            dataframe = _read_tolerant(content, detection_sample)
     except ParserError as exc:
         raise CSVUploadError("Could not parse this CSV file. Please check delimiter and row format.") from exc
     except UnicodeDecodeError as exc:
@@ -39,3 +213,203 @@ def parse_csv_upload(file_storage: FileStorage) -> pd.DataFrame:
         raise CSVUploadError("The uploaded CSV does not contain tabular data.")
 
     return dataframe
+
+
+def parse_csv_upload(file_storage: FileStorage, engine: str = "auto") -> pd.DataFrame:
+    """Parse an uploaded, uncompressed CSV file into a DataFrame (see :func:`parse_csv_bytes`)."""
+    return parse_csv_bytes(file_storage.read(), engine=engine)
+
+
+def parse_csv_bytes(raw: bytes, engine: str = "auto") -> pd.DataFrame:
+    """
+    Parse CSV content into a DataFrame.
+
+    Encoding, delimiter and column types are detected from the first
+    :data:`SNIFF_BYTES` and the file is parsed with the C engine, or with pyarrow
+    for large files when it is installed (``engine="auto"``). If that fails, for
+    example because a later row does not match the sampled types or encoding, the
+    file is parsed again with full-payload charset detection and the python
+    engine's delimiter sniffing. ``engine="python"`` always uses this tolerant path.
+    """
+    return _parse_csv(raw, _prefix(raw), len(raw), engine, detection_sample=raw)
+
+
+def parse_csv_file(path, engine: str = "auto") -> pd.DataFrame:
+    """
+    Parse a CSV file on disk like :func:`parse_csv_bytes` without reading it into memory first.
+
+    The parsers stream from the file, and the tolerant fallback detects the
+    charset from the prefix only, so memory use is bounded by the resulting frame.
+    """
+    with open(path, "rb") as handle:
+        sample = _prefix(handle.read(SNIFF_BYTES + 1))
+    return _parse_csv(str(path), sample, os.path.getsize(path), engine, detection_sample=sample)
+
+
+def _decompressor(stream, compression: str):
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(stream, mode="rb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise UploadError("Reading .zst files requires the optional 'zstandard' package.") from exc
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    raise UploadError(f"Unsupported compression: {compression}")
+
+
+def _decompress_into(stream, compression: str, sink, max_bytes: int | None):
+    written = 0
+    try:
+        with _decompressor(stream, compression) as reader:
+            while True:
+                chunk = reader.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                sink.write(chunk)
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise UploadError(
+                        f"The decompressed file exceeds the limit of {max_bytes // (1024 * 1024)} MB."
+                    )
+    except (OSError, EOFError, ValueError) as exc:
+        if isinstance(exc, UploadError):
+            raise
+        raise UploadError("Could not decompress this file. Please check that it is not corrupted.") from exc
+
+
+def decompress_upload(stream, compression: str, max_bytes: int | None = None) -> bytes:
+    """
+    Decompress ``stream`` chunk by chunk, refusing output larger than ``max_bytes``.
+
+    Oversized archives are rejected as soon as the limit is crossed rather than
+    after inflating them completely.
+    """
+    output = io.BytesIO()
+    _decompress_into(stream, compression, output, max_bytes)
+    return output.getvalue()
+
+
+def decompress_to_file(path, compression: str, target, max_bytes: int | None = None):
+    """Decompress the file at ``path`` into ``target`` chunk by chunk (see :func:`decompress_upload`)."""
+    with open(path, "rb") as source, open(target, "wb") as sink:
+        _decompress_into(source, compression, sink, max_bytes)
+
+
+def _arrow_source(stream):
+    """
+    Return a pyarrow input for an uploaded file.
+
+    Uploads spooled to a temporary file are memory-mapped, so Arrow reads column
+    buffers straight from the page cache; in-memory uploads are wrapped without
+    copying. A spooled upload still held in memory is rolled over to its file
+    first, which only happens for uploads below the spooling threshold.
+    """
+    import pyarrow as pa
+
+    if isinstance(stream, tempfile.SpooledTemporaryFile):
+        stream.rollover()
+    fileno = None
+    if not isinstance(stream, io.BytesIO):
+        try:
+            stream.flush()
+            fileno = stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            fileno = None
+    if fileno is not None:
+        try:
+            return pa.BufferReader(pa.py_buffer(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)))
+        except (OSError, ValueError):
+            pass
+    stream.seek(0)
+    if isinstance(stream, io.BytesIO):
+        return pa.BufferReader(pa.py_buffer(stream.getbuffer()))
+    return pa.BufferReader(stream.read())
+
+
+def read_columnar_upload(stream, file_format: str) -> pd.DataFrame:
+    """
+    Load a Parquet or Arrow IPC (Feather) upload without any text parsing.
+
+    ``stream`` is an uploaded file object, or the path of a file on disk which is
+    memory-mapped. A stored pandas index (e.g. a ``DatetimeIndex`` written by
+    ``to_parquet``) is turned back into a regular column so it can be picked as the
+    time column.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise UploadError(
+            "Reading Parquet and Arrow files requires the optional 'pyarrow' package."
+        ) from exc
+
+    try:
+        if isinstance(stream, (str, os.PathLike)):
+            source = pa.memory_map(str(stream))
+        else:
+            source = _arrow_source(stream)
+        if file_format == "parquet":
+            table = pq.read_table(source)
+        else:
+            table = feather.read_table(source)
+        dataframe = table.to_pandas()
+    except (pa.ArrowException, OSError, ValueError) as exc:
+        raise UploadError(f"Could not read this {file_format} file: {exc}") from exc
+    except MemoryError as exc:
+        raise UploadError("The file is too large to load in memory.") from exc
+
+    if not isinstance(dataframe.index, pd.RangeIndex):
+        dataframe = dataframe.reset_index()
+    if dataframe.empty and len(dataframe.columns) == 0:
+        raise UploadError("The uploaded file does not contain tabular data.")
+    return dataframe
+
+
+def parse_upload(file_storage: FileStorage, engine: str = "auto", max_decompressed_bytes: int | None = None):
+    """
+    Parse any supported upload (see :data:`UPLOAD_FORMATS`) into a DataFrame.
+
+    Raises :class:`UploadError` (or its subclass :class:`CSVUploadError`) when the
+    file type is unsupported or the content cannot be read.
+    """
+    detected = upload_format(file_storage.filename)
+    if detected is None:
+        raise UploadError("Unsupported file type.")
+    file_format, compression = detected
+    if file_format != "csv":
+        return read_columnar_upload(file_storage.stream, file_format)
+    if compression is None:
+        return parse_csv_upload(file_storage, engine=engine)
+    return parse_csv_bytes(
+        decompress_upload(file_storage.stream, compression, max_bytes=max_decompressed_bytes),
+        engine=engine,
+    )
+
+
+def parse_upload_file(path, filename: str, engine: str = "auto", max_decompressed_bytes: int | None = None):
+    """
+    Parse a supported file already stored at ``path`` (e.g. a completed chunked upload).
+
+    Columnar files are memory-mapped, CSV files are parsed straight from disk and
+    compressed CSV files are first decompressed next to ``path``, so the raw
+    payload is never held in memory as a whole.
+    """
+    detected = upload_format(filename)
+    if detected is None:
+        raise UploadError("Unsupported file type.")
+    file_format, compression = detected
+    if file_format != "csv":
+        return read_columnar_upload(path, file_format)
+    if compression is None:
+        return parse_csv_file(path, engine=engine)
+    decompressed = f"{path}.csv"
+    try:
+        decompress_to_file(path, compression, decompressed, max_bytes=max_decompressed_bytes)
+        return parse_csv_file(decompressed, engine=engine)
+    finally:
+        if os.path.exists(decompressed):
+            os.unlink(decompressed)
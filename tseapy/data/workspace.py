@@ -0,0 +1,51 @@
+import os
+import secrets
+from pathlib import Path
+
+#: Sub-directories of a workspace directory and the settings they provide a default for.
+WORKSPACE_LAYOUT = {
+    "DATASET_STORE_DIR": "datasets",
+    "RESULT_CACHE_DIR": "results",
+    "JIT_CACHE_DIR": "jit",
+    "CHUNKED_UPLOAD_DIR": "uploads",
+}
+SECRET_KEY_FILE = "secret_key"
+
+
+def workspace_config(directory) -> dict:
+    """
+    Return the storage settings of a persistent workspace directory.
+
+    Datasets with their artifacts, the result cache's disk tier, compiled numba
+    kernels and chunked uploads in progress are all kept under ``directory``, so a
+    restarted server picks up where it stopped. Settings given explicitly take precedence over these defaults.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    config = {key: str(directory / name) for key, name in WORKSPACE_LAYOUT.items()}
+    config["SECRET_KEY"] = load_secret_key(directory)
+    return config
+
+
+def load_secret_key(directory) -> str:
+    """
+    Return the session secret kept in ``directory``, creating it on first use.
+
+    Sessions name their workspace in a signed cookie, so restored workspaces are
+    only reachable when the key survives the restart. The file is created
+    atomically: processes starting together all read the same key.
+    """
+    path = Path(directory) / SECRET_KEY_FILE
+    if not path.exists():
+        partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="ascii") as handle:
+            handle.write(secrets.token_hex(32))
+        try:
+            # Unlike a rename, a hard link fails if another process created the key first.
+            os.link(partial, path)
+        except FileExistsError:
+            pass
+        finally:
+            partial.unlink(missing_ok=True)
+    return path.read_text(encoding="ascii").strip()
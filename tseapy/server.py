@@ -0,0 +1,149 @@
+import importlib
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def server_options(host: str, port: int, workers: int = 2, threads: int = 4, preload: bool = True,
+                   max_requests: int = 1000, max_requests_jitter: int = 100, timeout: int = 120,
+                   graceful_timeout: int = 30) -> dict:
+    """
+    Return gunicorn settings for serving tseapy.
+
+    Workers use gunicorn's threaded worker when ``threads`` is above one. Each worker
+    is replaced after ``max_requests`` requests (plus up to ``max_requests_jitter``, so
+    they do not all restart together) to release memory that long forecasting runs
+    leave fragmented.
+    """
+    return {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "threads": threads,
+        "worker_class": "gthread" if threads > 1 else "sync",
+        "preload_app": preload,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests_jitter if max_requests else 0,
+        "timeout": timeout,
+        "graceful_timeout": graceful_timeout,
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+    }
+
+
+def import_backend_modules(registry):
+    """Import the libraries every registered backend loads on first use; missing ones are skipped."""
+    for task in registry.iter_tasks():
+        for backend in task.analysis_backend_factory.iter_backends():
+            for module_name in backend.requires:
+                try:
+                    importlib.import_module(module_name)
+                except ImportError:
+                    logger.info("Backend %s/%s: %s is not installed", task.name, backend.name, module_name)
+
+
+def preload():
+    """
+    Load the app in the server's master process, ahead of forking the workers.
+
+    Besides the app, this imports the backends' libraries and parses and profiles
+    the demo dataset, all of which the workers then share copy-on-write. With
+    ``TSEAPY_WARMUP`` the numba kernels are compiled into the JIT cache by a
+    subprocess: running them here would start numba's thread pool, which is not
+    safe to fork, so each worker instead loads the compiled kernels from the cache
+    during its own warm-up.
+    """
+    import app as app_module
+    from tseapy.core.warmup import warm_up_subprocess
+
+    import_backend_modules(app_module.tasks)
+    app_module.preload_demo_dataset()
+    if app_module.warmup.enabled:
+        warm_up_subprocess()
+        logger.info("Compiled analysis kernels into %s", os.environ.get("NUMBA_CACHE_DIR"))
+    return app_module.app
+
+
+def post_fork(server, worker):
+    import app as app_module
+
+    app_module.warmup.start(app_module.tasks)
+
+
+def worker_exit(server, worker):
+    import app as app_module
+
+    app_module.jobs.shutdown()
+
+
+def serve(options: dict, warmup: bool | None = None) -> int:
+    """
+    Run tseapy under gunicorn with ``options`` from :func:`server_options`.
+
+    ``warmup`` overrides ``TSEAPY_WARMUP``. With warm-up and no ``TSEAPY_JIT_CACHE_DIR``,
+    a temporary JIT cache directory is used so the workers share the kernels compiled
+    once for the server. Likewise, with several workers and no ``TSEAPY_DATASET_STORE_DIR``
+    datasets are kept in a temporary shared store, so a session finds its data whichever
+    worker serves it; without pyarrow, which the store needs, a single worker is started.
+    Chunked uploads are spooled to a shared temporary directory too, unless
+    ``TSEAPY_CHUNKED_UPLOAD_DIR`` is set, so their chunks may reach any worker.
+    The temporary directories are removed when the master exits, and
+    ``TSEAPY_WORKSPACE_DIR`` replaces them with persistent ones. Sending ``SIGHUP`` to the master restarts the workers
+    gracefully; with ``preload_app`` the app code itself is only reloaded by a full restart.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise RuntimeError("tseapy serve requires gunicorn: pip install tseapy[server]") from None
+
+    persistent = bool(os.getenv("TSEAPY_WORKSPACE_DIR"))
+    temporary = []
+    if not persistent:
+        # Every worker must sign and read the same session cookies; a workspace directory keeps its own key.
+        os.environ.setdefault("TSEAPY_SECRET_KEY", secrets.token_hex())
+    if options.get("workers", 1) > 1 and not persistent and not os.getenv("TSEAPY_DATASET_STORE_DIR"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            # Workers without a shared store would each miss the sessions stored by the others.
+            logger.warning("pyarrow is not installed, so workers cannot share datasets: starting one worker "
+                           "(pip install tseapy[fast])")
+            options = dict(options, workers=1)
+        else:
+            temporary.append(tempfile.mkdtemp(prefix="tseapy-datasets-"))
+            os.environ["TSEAPY_DATASET_STORE_DIR"] = temporary[-1]
+    if options.get("workers", 1) > 1 and not persistent and not os.getenv("TSEAPY_CHUNKED_UPLOAD_DIR"):
+        temporary.append(tempfile.mkdtemp(prefix="tseapy-uploads-"))
+        os.environ["TSEAPY_CHUNKED_UPLOAD_DIR"] = temporary[-1]
+
+    if warmup is not None:
+        os.environ["TSEAPY_WARMUP"] = "1" if warmup else "0"
+    if os.getenv("TSEAPY_WARMUP", "").strip().lower() in {"1", "true", "yes", "on"}:
+        if not persistent and not os.getenv("TSEAPY_JIT_CACHE_DIR"):
+            temporary.append(tempfile.mkdtemp(prefix="tseapy-jit-"))
+            os.environ["TSEAPY_JIT_CACHE_DIR"] = temporary[-1]
+
+    class TseapyApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            if self.cfg.preload_app:
+                return preload()
+            from app import app
+
+            return app
+
+    master = os.getpid()
+    try:
+        TseapyApplication().run()
+    finally:
+        # Forked workers leave through here too, while the master still uses the directories.
+        if os.getpid() == master:
+            for path in temporary:
+                shutil.rmtree(path, ignore_errors=True)
+    return 0
@@ -1,11 +1,11 @@
-import ruptures as rpt
-
 from tseapy.core import create_callback_url
 from tseapy.core.parameters import NumberParameter
 from tseapy.tasks.change_in_mean import ChangeInMeanBackend
 
 
 class PeltL2(ChangeInMeanBackend):
+    requires = ("ruptures",)
+
     def __init__(self):
         short_description = ""
         long_description = """
@@ -52,9 +52,12 @@ class PeltL2(ChangeInMeanBackend):
             ])
 
     def do_analysis(self, data, feature, **kwargs):
+        import ruptures as rpt
+
         pen = float(kwargs['penalty'])
         min_size = int(kwargs['min_size'])
         jump = int(kwargs['jump'])
-        algo = rpt.Pelt(model='l2', jump=jump, min_size=min_size).fit(data[feature].values)
+        series = data[feature].dropna()
+        algo = rpt.Pelt(model='l2', jump=jump, min_size=min_size).fit(series.values)
         changepoints = algo.predict(pen)
-        return data.index[changepoints[:-1]]
+        return series.index[changepoints[:-1]]
@@ -1,5 +1,3 @@
-import ruptures as rpt
-
 from tseapy.core import create_callback_url
 from tseapy.core.analysis_backends import AnalysisBackend
 from tseapy.core.parameters import NumberParameter
@@ -7,6 +5,8 @@ from tseapy.tasks.change_in_mean import ChangeInMeanBackend
 
 
 class SlidingWindowL2(ChangeInMeanBackend):
+    requires = ("ruptures",)
+
     def __init__(self):
         short_description = ""
         long_description = """
@@ -64,10 +64,13 @@ class SlidingWindowL2(ChangeInMeanBackend):
             ])
 
     def do_analysis(self, data, feature, **kwargs):
+        import ruptures as rpt
+
         penalty = float(kwargs['penalty'])
         width = int(kwargs['width'])
         min_size = int(kwargs['min_size'])
         jump = int(kwargs['jump'])
-        algo = rpt.Window(model='l2', width=width, jump=jump, min_size=min_size).fit(data[feature].values)
+        series = data[feature].dropna()
+        algo = rpt.Window(model='l2', width=width, jump=jump, min_size=min_size).fit(series.values)
         changepoints = algo.predict(pen=penalty)
-        return data.index[changepoints[:-1]]
+        return series.index[changepoints[:-1]]
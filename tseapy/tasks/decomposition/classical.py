@@ -6,6 +6,8 @@ from tseapy.tasks.decomposition import DecompositionBackend
 
 
 class ClassicalDecompositionBackend(DecompositionBackend):
+    requires = ("statsmodels.tsa.seasonal",)
+
     def __init__(self):
         short_description = "Classical additive/multiplicative decomposition."
         long_description = ""
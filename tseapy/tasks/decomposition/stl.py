@@ -6,6 +6,8 @@ from tseapy.tasks.decomposition import DecompositionBackend
 
 
 class STLBackend(DecompositionBackend):
+    requires = ("statsmodels.tsa.seasonal",)
+
     def __init__(self):
         short_description = "STL decomposition using LOESS smoothing."
         long_description = ""
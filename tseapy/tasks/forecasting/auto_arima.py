@@ -6,6 +6,8 @@ from tseapy.tasks.forecasting import ForecastingBackend
 
 
 class AutoArimaBackend(ForecastingBackend):
+    requires = ("statsforecast",)
+
     def __init__(self):
         short_description = "Automatic ARIMA model selection and forecasting."
         long_description = ""
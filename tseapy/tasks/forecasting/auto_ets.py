@@ -6,6 +6,8 @@ from tseapy.tasks.forecasting import ForecastingBackend
 
 
 class AutoEtsBackend(ForecastingBackend):
+    requires = ("statsforecast",)
+
     def __init__(self):
         short_description = "Automatic Exponential Smoothing model selection and forecasting."
         long_description = ""
@@ -6,6 +6,8 @@ from tseapy.tasks.forecasting import ForecastingBackend
 
 
 class AutoThetaBackend(ForecastingBackend):
+    requires = ("statsforecast",)
+
     def __init__(self):
         short_description = "Automatic Theta method for forecasting."
         long_description = ""
@@ -15,6 +15,8 @@ from tseapy.tasks.forecasting.common import parse_bool, point_metrics
 
 
 class ForecastComparisonBackend(ForecastingBackend):
+    requires = ("statsforecast", "lightgbm", "mlforecast", "xgboost")
+
     def __init__(self):
         short_description = "Compare multiple forecasting methods side-by-side with error metrics."
         long_description = ""
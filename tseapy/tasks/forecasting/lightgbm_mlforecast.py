@@ -7,6 +7,8 @@ from tseapy.tasks.forecasting.common import infer_series_freq, make_result_frame
 
 
 class LightGBMMLForecastBackend(ForecastingBackend):
+    requires = ("lightgbm", "mlforecast")
+
     def __init__(self):
         short_description = "MLForecast with LightGBM and auto-generated lag/date features."
         long_description = ""
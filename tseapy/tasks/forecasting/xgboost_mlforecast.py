@@ -7,6 +7,8 @@ from tseapy.tasks.forecasting.common import infer_series_freq, make_result_frame
 
 
 class XGBoostMLForecastBackend(ForecastingBackend):
+    requires = ("mlforecast", "xgboost")
+
     def __init__(self):
         short_description = "MLForecast with XGBoost and auto-generated lag/date features."
         long_description = ""
@@ -7,6 +7,8 @@ from tseapy.tasks.frequency_analysis import FrequencyAnalysisBackend
 
 
 class LombScargleBackend(FrequencyAnalysisBackend):
+    requires = ("scipy.signal",)
+
     def __init__(self):
         short_description = "Lomb-Scargle periodogram for uneven sampling."
         long_description = ""
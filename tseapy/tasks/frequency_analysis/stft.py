@@ -7,6 +7,8 @@ from tseapy.tasks.frequency_analysis import FrequencyAnalysisBackend
 
 
 class STFTBackend(FrequencyAnalysisBackend):
+    requires = ("scipy.signal",)
+
     def __init__(self):
         short_description = "Short-time Fourier transform spectrogram."
         long_description = ""
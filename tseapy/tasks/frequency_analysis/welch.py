@@ -7,6 +7,8 @@ from tseapy.tasks.frequency_analysis import FrequencyAnalysisBackend
 
 
 class WelchBackend(FrequencyAnalysisBackend):
+    requires = ("scipy.signal",)
+
     def __init__(self):
         short_description = "Welch power spectral density estimation."
         long_description = ""
@@ -1,5 +1,3 @@
-import stumpy
-from sklearn.preprocessing import minmax_scale
 import numpy as np
 
 import plotly.express as px
@@ -11,6 +9,8 @@ from tseapy.tasks.motif_detection import MotifDetectionBackend
 
 
 class Matrixprofile(MotifDetectionBackend):
+    requires = ("stumpy", "sklearn.preprocessing")
+
     def __init__(self):
         short_description = ""
         long_description = """
@@ -46,6 +46,9 @@ class Matrixprofile(MotifDetectionBackend):
             ])
 
     def do_analysis(self, data, feature, **kwargs):
+        import stumpy
+        from sklearn.preprocessing import minmax_scale
+
         penalty = float(kwargs['penalty'])
         width = int(kwargs['width'])
         series = data[feature].astype(np.float64)
@@ -1,4 +1,3 @@
-import stumpy
 import numpy as np
 
 from tseapy.core import create_callback_url
@@ -8,6 +7,8 @@ from tseapy.tasks.motif_detection import MotifDetectionBackend
 
 
 class PanMatrixprofile(MotifDetectionBackend):
+    requires = ("stumpy",)
+
     def __init__(self):
         short_description = ""
         long_description = """
@@ -65,6 +66,8 @@ class PanMatrixprofile(MotifDetectionBackend):
             ])
 
     def do_analysis(self, data, feature, **kwargs):
+        import stumpy
+
         penalty = float(kwargs['penalty'])
         min_width = int(kwargs['minimum_width'])
         max_width = int(kwargs['maximum_width'])
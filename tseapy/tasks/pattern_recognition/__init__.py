@@ -1,5 +1,6 @@
 import abc
 
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
@@ -10,6 +11,17 @@ from typing import List
 from tseapy.core.analysis_backends import AnalysisBackend
 from tseapy.core.tasks import Task
 from tseapy.core.parameters import AnalysisBackendParameter, NumberParameter
+from tseapy.tasks.pattern_recognition.matches import top_k_matches
+
+#: Queries accepted by one batched pattern search.
+MAX_BATCH_QUERIES = 100
+
+
+def _index_label(value):
+    """Return an index label in a JSON-ready form: ISO 8601 for timestamps, plain numbers otherwise."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value.item() if hasattr(value, 'item') else value
 
 
 class PatternRecognition(Task):
@@ -86,12 +98,14 @@ class PatternRecognition(Task):
         html = f'<div id="selectedPattern" class="col"></div>'
         return html
 
-    def get_analysis_results(self, data, feature, algo, **kwargs):
-        if feature not in data.columns:
-            raise ValueError("Unknown feature column")
-        # check parameters
-        start_raw = kwargs['start']
-        end_raw = kwargs['end']
+    def get_warmup_arguments(self, data, feature) -> dict:
+        # A pattern of a tenth of the series, taken from its start.
+        end = data.index[max(len(data) // 10, 2) - 1]
+        return {'start': data.index[0].isoformat(), 'end': end.isoformat()}
+
+    @staticmethod
+    def get_pattern(data, feature, start_raw, end_raw):
+        """Return the values of ``feature`` between the selected ``start_raw`` and ``end_raw`` dates."""
         invalid_tokens = {"", "0", "null", "undefined", "none"}
         if str(start_raw).lower() in invalid_tokens or str(end_raw).lower() in invalid_tokens:
             raise ValueError("Select a date range on the main chart before running pattern recognition.")
@@ -105,10 +119,17 @@ class PatternRecognition(Task):
             start = end
             end = tmp
             del tmp
-        nb_similar_patterns = int(kwargs.pop('nb_similar_patterns'))
         pattern = data.loc[start:end, feature]
         if pattern.empty:
             raise ValueError("Selected range is empty. Please select a valid interval on the chart.")
+        return pattern
+
+    def get_analysis_results(self, data, feature, algo, **kwargs):
+        if feature not in data.columns:
+            raise ValueError("Unknown feature column")
+        # check parameters
+        pattern = self.get_pattern(data, feature, kwargs['start'], kwargs['end'])
+        nb_similar_patterns = int(kwargs.pop('nb_similar_patterns'))
         a = self.analysis_backend_factory.get_analysis_backend(algo=algo)
         similar_patterns = a.do_analysis(data, feature, pattern=pattern, nb_similar_patterns=nb_similar_patterns,
                                          **kwargs)
@@ -157,6 +178,62 @@ class PatternRecognition(Task):
         fig.update_layout(height=800)
         return fig
 
+    def get_batch_results(self, data, feature, algo, queries: list, **kwargs) -> dict:
+        """
+        Find the similar patterns of every query in one pass over the series.
+
+        Each query is either a selected range, ``{"start": ..., "end": ...}``, or the
+        values of a pattern kept by the client, ``{"values": [...]}``. The backend
+        computes all distance profiles together (see
+        :meth:`PatternRecognitionBackend.distance_profiles`); matches are reported per
+        query, in the order of ``queries``, with their distances.
+        """
+        if feature not in data.columns:
+            raise ValueError("Unknown feature column")
+        if not queries:
+            raise ValueError("At least one query is required.")
+        if len(queries) > MAX_BATCH_QUERIES:
+            raise ValueError(f"At most {MAX_BATCH_QUERIES} queries can be searched at once.")
+        nb_similar_patterns = int(kwargs.pop('nb_similar_patterns'))
+        max_distance = float(kwargs.pop('max_distance', 0))
+        a = self.analysis_backend_factory.get_analysis_backend(algo=algo)
+
+        patterns = []
+        query_indexes = []
+        results = []
+        for query in queries:
+            if not isinstance(query, dict):
+                raise ValueError('Each query must be an object with "start" and "end", or "values".')
+            if 'values' in query:
+                try:
+                    pattern = np.asarray(query['values'], dtype=np.float64)
+                except (TypeError, ValueError):
+                    raise ValueError('Query "values" must be a list of numbers.') from None
+                if pattern.ndim != 1 or len(pattern) == 0:
+                    raise ValueError('Query "values" must be a non-empty list of numbers.')
+                query_indexes.append(None)
+                results.append({'length': len(pattern)})
+            else:
+                pattern = self.get_pattern(data, feature, query.get('start'), query.get('end'))
+                query_indexes.append(int(data.index.searchsorted(pattern.index[0])))
+                results.append({'start': _index_label(pattern.index[0]), 'end': _index_label(pattern.index[-1]),
+                                'length': len(pattern)})
+            patterns.append(pattern)
+
+        index = data.index
+        for position, distance_profile in a.distance_profiles(data, feature, patterns,
+                                                              nb_similar_patterns=nb_similar_patterns,
+                                                              max_distance=max_distance, **kwargs):
+            m = len(patterns[position])
+            starts = a.match_positions(distance_profile, m, nb_similar_patterns, max_distance,
+                                       query_index=query_indexes[position])
+            results[position]['matches'] = [
+                {'start': _index_label(index[start]), 'end': _index_label(index[start + m - 1]),
+                 'distance': float(distance_profile[start])}
+                for start in starts.tolist()
+            ]
+        return {'feature': feature, 'algo': algo, 'results': results}
+
 
 class PatternRecognitionBackend(AnalysisBackend):
     def __init__(self, name: str, short_description: str, long_description: str, callback_url: str,
@@ -174,6 +251,21 @@ class PatternRecognitionBackend(AnalysisBackend):
                 disabled=False
             )
         )
+        parameters.append(
+            NumberParameter(
+                name='max_distance',
+                label='Maximum distance',
+                description="Only report matches at most this far from the selected pattern; 0 reports the closest "
+                            "ones whatever their distance.",
+                minimum=0,
+                maximum=1000,
+                step=0.01,
+                default=0,
+                onclick="",
+                disabled=False,
+                required=False,
+            )
+        )
         super().__init__(
             name = name,
             short_description = short_description,
@@ -186,3 +278,43 @@ class PatternRecognitionBackend(AnalysisBackend):
     @abc.abstractmethod
     def do_analysis(self, data, feature, pattern=None, nb_similar_patterns=5, **kwargs):
         pass
+
+    def distance_profiles(self, data, feature, patterns: list, nb_similar_patterns=5, max_distance=0, **kwargs):
+        """
+        Return an iterator of ``(position, distance profile)`` for each of ``patterns`` against ``data[feature]``.
+
+        ``position`` is the pattern's index in ``patterns``; profiles may come in any
+        order, so backends can group queries that share work. A profile may be ``inf``
+        wherever a window cannot be among the ``nb_similar_patterns`` matches
+        :meth:`match_positions` selects. Backends without batched queries raise ``ValueError``.
+        """
+        raise ValueError(f'Algorithm "{self.name}" does not support batched queries')
+
+    @staticmethod
+    def match_positions(distance_profile, m: int, nb_similar_patterns, max_distance=0, query_index=None):
+        """
+        Return the start rows of the ``nb_similar_patterns`` best non-overlapping matches, closest first.
+
+        ``query_index`` is the row the pattern was taken from, if any; matches do not
+        overlap it. A positive ``max_distance`` drops matches further than that.
+        """
+        max_distance = float(max_distance)
+        if max_distance < 0:
+            raise ValueError("max_distance must be at least 0.")
+        return top_k_matches(distance_profile, int(nb_similar_patterns), exclusion_zone=m,
+                             excluded=[] if query_index is None else [query_index],
+                             max_distance=max_distance if max_distance > 0 else None)
+
+    @classmethod
+    def select_matches(cls, data, feature, pattern, distance_profile, nb_similar_patterns, max_distance=0):
+        """
+        Return the ``nb_similar_patterns`` closest windows of ``data[feature]`` as series, closest first.
+
+        ``distance_profile[i]`` is the distance of ``pattern`` to the window starting at
+        row ``i``. Matches neither overlap each other nor the pattern itself.
+        """
+        m = len(pattern)
+        query_index = int(data.index.searchsorted(pattern.index[0]))
+        starts = cls.match_positions(distance_profile, m, nb_similar_patterns, max_distance, query_index=query_index)
+        values = data[feature]
+        return [values.iloc[start:start + m] for start in starts]
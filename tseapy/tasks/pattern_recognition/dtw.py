@@ -0,0 +1,86 @@
+import numpy as np
+
+from tseapy.core import create_callback_url
+from tseapy.core.parameters import NumberParameter, BooleanParameter
+from tseapy.tasks.pattern_recognition import PatternRecognitionBackend
+
+
+class Dtw(PatternRecognitionBackend):
+    requires = ("numba", "stumpy")
+
+    def __init__(self):
+        short_description = "Finds the closest patterns under dynamic time warping, pruned as in the UCR suite."
+        long_description = """
+        Finds the patterns closest to the selection under dynamic time warping (DTW),
+        so matches that are slightly stretched or shifted in time are still found.
+        Warping is limited to a Sakoe-Chiba band of a fraction of the pattern length.
+
+        Most windows are ruled out by cheap lower bounds (LB_Kim, then LB_Keogh against
+        the pattern's and the window's envelopes) before any DTW is computed, and DTW
+        stops as soon as a window cannot be among the closest ones. The kernels are
+        compiled with numba.
+
+        References:
+        - Searching and mining trillions of time series subsequences under dynamic time warping. Rakthanmanon, T., Campana, B., Mueen, A., Batista, G., Westover, B., Zhu, Q., Zakaria, J., & Keogh, E. ACM SIGKDD, 2012.
+        """
+        super().__init__(
+            name='dtw',
+            short_description=short_description,
+            long_description=long_description,
+            callback_url=create_callback_url('pattern-recognition', 'dtw'),
+            required_query_params=['start', 'end'],
+            parameters=[
+                NumberParameter(
+                    name='window',
+                    label='Warping window',
+                    description='Sakoe-Chiba band as a fraction of the pattern length: 0 compares points one to one '
+                                '(Euclidean distance), larger values allow more warping but search more slowly.',
+                    minimum=0,
+                    maximum=1,
+                    step=0.01,
+                    default=0.1,
+                    onclick="",
+                    disabled=False,
+                ),
+                BooleanParameter(
+                    name='normalize',
+                    label='normalize',
+                    description='Compare z-normalized windows, so matches may differ in offset and scale',
+                    default=True,
+                    onclick="",
+                    disabled=False,
+                ),
+            ])
+
+    def do_analysis(self, data, feature, pattern=None, nb_similar_patterns=5, max_distance=0, **kwargs):
+        if pattern is None or len(pattern) == 0:
+            raise ValueError("Selected range is empty. Please select a valid interval on the chart.")
+        _, distance_profile = next(self.distance_profiles(data, feature, [pattern], nb_similar_patterns,
+                                                          max_distance, **kwargs))
+        return self.select_matches(data, feature, pattern, distance_profile, nb_similar_patterns, max_distance)
+
+    def distance_profiles(self, data, feature, patterns: list, nb_similar_patterns=5, max_distance=0, **kwargs):
+        from tseapy.tasks.pattern_recognition.mass_index import column_key
+        from tseapy.tasks.pattern_recognition.ucr_dtw import dtw_search
+
+        normalize = str(kwargs['normalize']).lower()
+        if normalize not in ['true', 'false']:
+            raise ValueError("normalize must be true or false.")
+        normalize = normalize == 'true'
+        window = float(kwargs['window'])
+        k = int(nb_similar_patterns)
+        max_distance = float(max_distance)
+        if max_distance < 0:
+            raise ValueError("max_distance must be at least 0.")
+
+        data_series = data[feature].to_numpy(dtype=np.float64)
+        key = column_key(data, feature)
+
+        def profiles():
+            for position, pattern in enumerate(patterns):
+                # Windows overlapping the selection itself are never matches and are not searched.
+                query_index = int(data.index.searchsorted(pattern.index[0])) if hasattr(pattern, 'index') else None
+                yield position, dtw_search(np.asarray(pattern, dtype=np.float64), data_series, k, window=window,
+                                           normalize=normalize, query_index=query_index,
+                                           max_distance=max_distance if max_distance > 0 else None, key=key)
+        return profiles()
@@ -1,4 +1,3 @@
-import stumpy
 import numpy as np
 
 from tseapy.core import create_callback_url
@@ -7,6 +6,7 @@ from tseapy.tasks.pattern_recognition import PatternRecognitionBackend
 
 
 class Mass(PatternRecognitionBackend):
+    requires = ("stumpy",)
 
     def __init__(self):
         short_description = "Computes the distance profile using the stumpy implementation of the MASS algorithm."
@@ -45,27 +45,23 @@ class Mass(PatternRecognitionBackend):
                 )
             ])
 
-    def do_analysis(self, data, feature, pattern=None, nb_similar_patterns=5, **kwargs):
-        normalize = kwargs['normalize']
-        if str(normalize).lower() not in ['true', 'false']:
-            raise ValueError("normalize must be true or false.")
-        normalize = normalize.lower() == 'true'
-        p = float(kwargs['p'])
+    def do_analysis(self, data, feature, pattern=None, nb_similar_patterns=5, max_distance=0, **kwargs):
         if pattern is None or len(pattern) == 0:
             raise ValueError("Selected range is empty. Please select a valid interval on the chart.")
+        _, distance_profile = next(self.distance_profiles(data, feature, [pattern], **kwargs))
+        return self.select_matches(data, feature, pattern, distance_profile, nb_similar_patterns, max_distance)
 
-        data_series = data[feature].astype(np.float64)
-        pattern_series = pattern.astype(np.float64)
+    def distance_profiles(self, data, feature, patterns: list, **kwargs):
+        from tseapy.tasks.pattern_recognition.mass_index import column_key, mass_batch
 
-        # compute distance profile
-        distance_profile = stumpy.mass(pattern_series, data_series, normalize=normalize, p=p)
-        # get the indices (sorted) of the similar patterns
-        idxs = np.argpartition(distance_profile, nb_similar_patterns+1)[:nb_similar_patterns+1]
-        idxs = idxs[np.argsort(distance_profile[idxs])]
-        # return similar patterns
-        similar_patterns = [
-            data.iloc[idx:idx + len(pattern), :][feature]
-            for idx in idxs[1:]
-        ]
+        normalize = str(kwargs['normalize']).lower()
+        if normalize not in ['true', 'false']:
+            raise ValueError("normalize must be true or false.")
+        normalize = normalize == 'true'
+        p = float(kwargs['p'])
 
-        return similar_patterns
+        # Registry columns are already float64 and are used without a copy.
+        data_series = data[feature].to_numpy(dtype=np.float64)
+        queries = [np.asarray(pattern, dtype=np.float64) for pattern in patterns]
+        # Queries of one length share a batched FFT; the series side is cached across requests.
+        return mass_batch(queries, data_series, normalize=normalize, p=p, key=column_key(data, feature))
@@ -0,0 +1,334 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+from scipy import fft
+from stumpy import config, core
+
+#: Memory the series indexes of each process may use, least recently used dropped first.
+MAX_INDEX_BYTES = 256 * 1024 * 1024
+#: Query lengths whose rolling statistics each index keeps.
+MAX_LENGTHS = 4
+#: Approximate memory a batch of same-length queries may use for its FFTs.
+BATCH_BYTES = 64 * 1024 * 1024
+
+
+_frame_keys = {}
+
+
+def series_key(T: np.ndarray) -> str:
+    """Return a content hash of a series, so equal data finds its index whichever frame it came from."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{T.dtype.str}{T.shape}".encode("ascii"))
+    digest.update(memoryview(np.ascontiguousarray(T)).cast("B"))
+    return digest.hexdigest()
+
+
+def column_key(data, feature) -> str:
+    """
+    Return the :func:`series_key` of column ``feature`` of the frame ``data``.
+
+    Registry frames are read-only and the same object serves every request while the
+    dataset stays resident, so their column hashes are computed once per frame
+    (``to_numpy()`` returns a new array object on every call, the frame does not).
+    """
+    values = data[feature].to_numpy(dtype=np.float64)
+    if values.flags.writeable:
+        return series_key(values)
+    identity = id(data)
+    known = _frame_keys.get(identity)
+    if known is None or known[0]() is not data:
+        known = (weakref.ref(data, lambda _, identity=identity: _frame_keys.pop(identity, None)), {})
+        _frame_keys[identity] = known
+    key = known[1].get(feature)
+    if key is None:
+        key = known[1][feature] = series_key(values)
+    return key
+
+
+class _Statistics:
+    """
+    Series-side terms of MASS for one query length ``m``, computed on first use.
+
+    ``T`` is one series, or a 2-D array with one channel per row.
+    """
+
+    def __init__(self, T: np.ndarray, m: int):
+        self.m = m
+        # Same preprocessing as stumpy.mass: rolling mean (inf for windows with
+        # missing values), rolling standard deviation and constant-window flags.
+        _, self.M_T, self.Σ_T, self.T_subseq_isconstant = core.preprocess(T, m)
+        self._squared_sums = None
+
+    def squared_sums(self, T: np.ndarray) -> np.ndarray:
+        """Rolling sums of squares of ``T``, ``inf`` for windows with missing values."""
+        if self._squared_sums is None:
+            finite = np.isfinite(T)
+            start = np.zeros(T.shape[:-1] + (1,))
+            squares = np.concatenate((start, np.cumsum(np.where(finite, T, 0.0) ** 2, axis=-1)), axis=-1)
+            missing = np.concatenate((start, np.cumsum(~finite, axis=-1)), axis=-1)
+            sums = squares[..., self.m:] - squares[..., :-self.m]
+            sums[missing[..., self.m:] - missing[..., :-self.m] > 0] = np.inf
+            self._squared_sums = np.maximum(sums, 0.0)
+        return self._squared_sums
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.M_T, self.Σ_T, self.T_subseq_isconstant, self._squared_sums)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+
+class _SeriesIndex:
+    """The series' FFT and per-length statistics shared by :class:`MassIndex` and :class:`MultiMassIndex`."""
+
+    def __init__(self, T: np.ndarray):
+        self.n = T.shape[-1]
+        self.fft_size = fft.next_fast_len(self.n, real=True)
+        self.T_fft = fft.rfft(np.where(np.isfinite(T), T, 0.0), self.fft_size, axis=-1)
+        self._lock = threading.Lock()
+        self._statistics = OrderedDict()
+
+    def statistics(self, T: np.ndarray, m: int) -> _Statistics:
+        """Return the statistics of ``T`` (the indexed series) for windows of length ``m``."""
+        with self._lock:
+            statistics = self._statistics.get(m)
+            if statistics is not None:
+                self._statistics.move_to_end(m)
+                return statistics
+        statistics = _Statistics(T, m)
+        with self._lock:
+            self._statistics[m] = statistics
+            while len(self._statistics) > MAX_LENGTHS:
+                self._statistics.popitem(last=False)
+        _trim_indexes()
+        return statistics
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the series' FFT and the cached statistics."""
+        with self._lock:
+            statistics = list(self._statistics.values())
+        return self.T_fft.nbytes + sum(entry.nbytes for entry in statistics)
+
+    def _check_length(self, m: int):
+        if m > self.n:
+            raise ValueError(f"The pattern ({m} points) is longer than the series ({self.n} points).")
+        core.check_window_size(m, max_size=self.n)
+
+
+class MassIndex(_SeriesIndex):
+    """
+    Reusable series side of MASS (Mueen's Algorithm for Similarity Search) for one series.
+
+    The series' FFT is computed once, and the rolling statistics once per query
+    length (for the :data:`MAX_LENGTHS` most recent lengths), so each query only
+    pays for transforming the query and one inverse FFT. Distances follow
+    :func:`stumpy.mass`, including its handling of missing values and constant windows.
+    """
+
+    def __init__(self, T: np.ndarray):
+        super().__init__(np.asarray(T, dtype=np.float64))
+
+    def sliding_dot_products(self, queries: np.ndarray) -> np.ndarray:
+        """Return the sliding dot products of each row of ``queries`` (all of one length) with the series."""
+        # Circular convolution over ``fft_size >= n`` points only wraps into the first
+        # m - 1 outputs, which are not valid alignments anyway.
+        m = queries.shape[1]
+        products = fft.irfft(fft.rfft(queries[:, ::-1], self.fft_size, axis=1) * self.T_fft, self.fft_size, axis=1)
+        return products[:, m - 1:self.n]
+
+    def distance_profile(self, Q: np.ndarray, T: np.ndarray, normalize: bool = True, p: float = 2.0) -> np.ndarray:
+        """Return the distance of ``Q`` to every window of ``T``, the series this index was built for."""
+        Q = np.asarray(Q, dtype=np.float64)
+        return next(self.distance_profiles(Q[np.newaxis, :], T, normalize=normalize, p=p))
+
+    def distance_profiles(self, queries: np.ndarray, T: np.ndarray, normalize: bool = True, p: float = 2.0):
+        """
+        Yield the distance profile of each row of ``queries``, a 2-D array of same-length queries.
+
+        The queries' FFTs are computed together, in batches of up to :data:`BATCH_BYTES`,
+        and share the series' FFT and rolling statistics.
+        """
+        queries = np.asarray(queries, dtype=np.float64)
+        T = np.asarray(T, dtype=np.float64)
+        m = queries.shape[1]
+        self._check_length(m)
+        if not normalize and p != 2.0:
+            import stumpy
+
+            for Q in queries:
+                yield stumpy.mass(Q, T, normalize=False, p=p)
+            return
+
+        statistics = self.statistics(T, m)
+        batch = max(1, BATCH_BYTES // (self.fft_size * 32))
+        for offset in range(0, len(queries), batch):
+            chunk = queries[offset:offset + batch]
+            finite = np.isfinite(chunk).all(axis=1)
+            # Queries with missing values match nothing, as in stumpy.mass.
+            products = self.sliding_dot_products(np.where(finite[:, np.newaxis], chunk, 0.0))
+            for Q, QT, is_finite in zip(chunk, products, finite):
+                if not is_finite:
+                    yield np.full(self.n - m + 1, np.inf)
+                elif not normalize:
+                    yield np.sqrt(np.maximum(np.dot(Q, Q) + statistics.squared_sums(T) - 2 * QT, 0.0))
+                else:
+                    Q, μ_Q, σ_Q, Q_subseq_isconstant = core.preprocess(Q, m)
+                    yield core.calculate_distance_profile(
+                        m, QT, μ_Q[0], σ_Q[0], statistics.M_T, statistics.Σ_T, Q_subseq_isconstant[0],
+                        statistics.T_subseq_isconstant,
+                    )
+
+
+class MultiMassIndex(_SeriesIndex):
+    """
+    Series side of multidimensional MASS for a 2-D array ``T`` with one channel per row.
+
+    Every step runs on all channels at once: one 2-D FFT of the series, one of the
+    multi-channel query, and array arithmetic over channels for the distances.
+    The index keeps ``T`` itself (read-only) as :attr:`T`, so callers that stacked
+    it from separate columns do not stack them again for every query.
+    """
+
+    def __init__(self, T: np.ndarray):
+        T = np.asarray(T, dtype=np.float64)
+        if T.ndim != 2:
+            raise ValueError("A multidimensional series needs one channel per row.")
+        super().__init__(T)
+        self.k = T.shape[0]
+        self.T = T if not T.flags.writeable else T.copy()
+        self.T.flags.writeable = False
+
+    @property
+    def nbytes(self) -> int:
+        return super().nbytes + self.T.nbytes
+
+    def distance_profiles(self, Q: np.ndarray, T: np.ndarray, normalize: bool = True) -> np.ndarray:
+        """
+        Return the per-channel distance profiles of ``Q`` against ``T``, both with one channel per row.
+
+        Row ``j`` of the result is what :func:`stumpy.mass` returns for channel ``j``.
+        """
+        Q = np.asarray(Q, dtype=np.float64)
+        T = np.asarray(T, dtype=np.float64)
+        if Q.ndim != 2 or Q.shape[0] != self.k:
+            raise ValueError(f"The pattern must have one row for each of the {self.k} channels.")
+        m = Q.shape[1]
+        self._check_length(m)
+        statistics = self.statistics(T, m)
+        finite = np.isfinite(Q).all(axis=1)
+        Q = np.where(finite[:, np.newaxis], Q, 0.0)
+        QT = fft.irfft(fft.rfft(Q[:, ::-1], self.fft_size, axis=1) * self.T_fft, self.fft_size, axis=1)[:, m - 1:self.n]
+
+        if not normalize:
+            squared = np.einsum('ij,ij->i', Q, Q)[:, np.newaxis] + statistics.squared_sums(T) - 2 * QT
+            distances = np.sqrt(np.maximum(squared, 0.0))
+        else:
+            _, μ_Q, σ_Q, Q_isconstant = core.preprocess(Q, m)
+            μ_Q, σ_Q, Q_isconstant = μ_Q[:, :1], σ_Q[:, :1], Q_isconstant[:, :1]
+            # Vectorized form of stumpy's per-window squared distance, constant windows included.
+            with np.errstate(divide='ignore', invalid='ignore'):
+                denom = np.maximum(σ_Q * statistics.Σ_T * m, config.STUMPY_DENOM_THRESHOLD)
+                ρ = np.minimum((QT - μ_Q * statistics.M_T * m) / denom, 1.0)
+                squared = np.abs(2 * m * (1.0 - ρ))
+            T_isconstant = statistics.T_subseq_isconstant
+            squared = np.where(Q_isconstant & T_isconstant, 0.0,
+                               np.where(Q_isconstant | T_isconstant, float(m), squared))
+            squared[np.isinf(statistics.M_T)] = np.inf
+            distances = np.sqrt(squared)
+        distances[~finite] = np.inf
+        return distances
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _cached_index(key: str, build):
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = build()
+    with _indexes_lock:
+        _indexes[key] = index
+    _trim_indexes()
+    return index
+
+
+def _trim_indexes():
+    # Indexes grow as query lengths are added, so sizes are re-read on every trim.
+    # The most recent index is kept even when it alone exceeds the budget.
+    with _indexes_lock:
+        sizes = {key: index.nbytes for key, index in _indexes.items()}
+        total = sum(sizes.values())
+        while len(_indexes) > 1 and total > MAX_INDEX_BYTES:
+            key, _ = _indexes.popitem(last=False)
+            total -= sizes[key]
+
+
+def get_mass_index(T: np.ndarray, key: str | None = None) -> MassIndex:
+    """
+    Return the :class:`MassIndex` of ``T``, built on the first query against this data.
+
+    ``key``, the :func:`series_key` of ``T`` when already known (see :func:`column_key`),
+    avoids hashing ``T`` again.
+    """
+    return _cached_index(key or series_key(T), lambda: MassIndex(T))
+
+
+def get_multi_mass_index(T, channel_keys=None) -> MultiMassIndex:
+    """
+    Return the :class:`MultiMassIndex` of ``T``, built on the first query against this data.
+
+    ``T`` is a 2-D array or a sequence of channels. With ``channel_keys``, the
+    :func:`series_key` of each channel, the index is found without hashing the data,
+    and separate channels are only stacked when the index is built.
+    """
+    if channel_keys is None:
+        T = np.stack(T) if not isinstance(T, np.ndarray) else T
+        key = "multi:" + series_key(T)
+    else:
+        key = "multi:" + "+".join(channel_keys)
+    return _cached_index(key, lambda: MultiMassIndex(_read_only_stack(T)))
+
+
+def _read_only_stack(channels) -> np.ndarray:
+    # A fresh read-only array, which MultiMassIndex keeps without copying it again.
+    T = np.stack(channels).astype(np.float64, copy=False)
+    T.flags.writeable = False
+    return T
+
+
+def mass(Q, T, normalize: bool = True, p: float = 2.0) -> np.ndarray:
+    """Drop-in for :func:`stumpy.mass` that reuses the series side across queries on the same ``T``."""
+    T = np.asarray(T, dtype=np.float64)
+    return get_mass_index(T).distance_profile(Q, T, normalize=normalize, p=p)
+
+
+def multi_mass(Q, T, normalize: bool = True, channel_keys=None) -> np.ndarray:
+    """Return the per-channel distance profiles of the multi-channel query ``Q`` against ``T`` (see :class:`MultiMassIndex`)."""
+    index = get_multi_mass_index(T, channel_keys)
+    return index.distance_profiles(Q, index.T, normalize=normalize)
+
+
+def mass_batch(queries, T, normalize: bool = True, p: float = 2.0, key: str | None = None):
+    """
+    Yield ``(position, distance profile)`` for every query in ``queries`` against ``T``.
+
+    Queries are grouped by length and each group is computed in one batched pass
+    (see :meth:`MassIndex.distance_profiles`), so profiles come grouped rather than
+    in input order; ``position`` is the query's index in ``queries``. ``key`` is
+    passed on to :func:`get_mass_index`.
+    """
+    T = np.asarray(T, dtype=np.float64)
+    index = get_mass_index(T, key)
+    groups = {}
+    for position, Q in enumerate(queries):
+        groups.setdefault(len(Q), []).append(position)
+    for positions in groups.values():
+        group = np.stack([np.asarray(queries[position], dtype=np.float64) for position in positions])
+        yield from zip(positions, index.distance_profiles(group, T, normalize=normalize, p=p))
@@ -0,0 +1,42 @@
+import bisect
+
+import numpy as np
+
+
+def top_k_matches(distance_profile, k: int, exclusion_zone: int, excluded=(), max_distance: float | None = None
+                  ) -> np.ndarray:
+    """
+    Return the start positions of the ``k`` best matches in ``distance_profile``, best first.
+
+    Matches are taken in order of increasing distance, skipping every position closer
+    than ``exclusion_zone`` to an accepted match or to a position in ``excluded``
+    (e.g. where the query itself was taken from). With ``exclusion_zone`` equal to the
+    pattern length the matches do not overlap. Positions with an infinite distance, or
+    one above ``max_distance``, are never matches, so fewer than ``k`` may be returned.
+    """
+    profile = np.asarray(distance_profile, dtype=np.float64)
+    exclusion_zone = max(int(exclusion_zone), 1)
+    eligible = np.isfinite(profile)
+    if max_distance is not None:
+        eligible &= profile <= max_distance
+    candidates = np.flatnonzero(eligible)
+    # Every accepted or excluded position rules out fewer than 2 * exclusion_zone
+    # others, so the greedy scan never gets past this many of the best candidates.
+    pool = (k + len(excluded)) * 2 * exclusion_zone + k
+    if pool < len(candidates):
+        candidates = candidates[np.argpartition(profile[candidates], pool)[:pool]]
+    candidates = candidates[np.argsort(profile[candidates], kind="stable")]
+
+    blocked = sorted(int(position) for position in excluded)
+    matches = []
+    for position in candidates.tolist():
+        if len(matches) == k:
+            break
+        after = bisect.bisect_left(blocked, position)
+        if after < len(blocked) and blocked[after] - position < exclusion_zone:
+            continue
+        if after > 0 and position - blocked[after - 1] < exclusion_zone:
+            continue
+        matches.append(position)
+        bisect.insort(blocked, position)
+    return np.asarray(matches, dtype=np.int64)
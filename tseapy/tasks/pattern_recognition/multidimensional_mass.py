@@ -0,0 +1,120 @@
+import numpy as np
+
+from tseapy.core import create_callback_url
+from tseapy.core.parameters import BooleanParameter, ListParameter, NumberParameter
+from tseapy.tasks.pattern_recognition import PatternRecognitionBackend
+
+
+def combine_profiles(distance_profiles: np.ndarray, dimensions: int = 0) -> np.ndarray:
+    """
+    Combine per-channel distance profiles (one channel per row) into one profile.
+
+    Each window scores the sum of its ``dimensions`` smallest channel distances, so a
+    match only has to resemble the query on that many channels, whichever they are.
+    ``0``, or at least the number of channels, sums every channel.
+    """
+    k = distance_profiles.shape[0]
+    if dimensions <= 0 or dimensions >= k:
+        return distance_profiles.sum(axis=0)
+    return np.partition(distance_profiles, dimensions - 1, axis=0)[:dimensions].sum(axis=0)
+
+
+class MultidimensionalMass(PatternRecognitionBackend):
+    requires = ("stumpy",)
+
+    def __init__(self):
+        short_description = "Finds windows where several columns jointly resemble the selected pattern."
+        long_description = """
+        Searches the selected range on several columns at once. The distance profile of
+        every column is computed with MASS, all columns in one vectorized pass, and the
+        profiles are added up, either over every column or over the d closest columns of
+        each window (best d of k).
+
+        References:
+        - Matrix Profile VI: Meaningful Multidimensional Motif Discovery. Yeh, C. M., Kavantzas, N., & Keogh, E. IEEE ICDM, 2017.
+        - https://stumpy.readthedocs.io/en/latest/api.html#stumpy.mass
+        """
+        super().__init__(
+            name='multidimensional-mass',
+            short_description=short_description,
+            long_description=long_description,
+            callback_url=create_callback_url('pattern-recognition', 'multidimensional-mass'),
+            required_query_params=['start', 'end'],
+            parameters=[
+                ListParameter(
+                    name='columns',
+                    label='Columns',
+                    description='Comma-separated columns to search jointly; empty searches every numeric column.',
+                    values=[],
+                    onclick='',
+                    disabled=False,
+                ),
+                NumberParameter(
+                    name='dimensions',
+                    label='Matching columns (d)',
+                    description='Score each window by its d closest columns; 0 adds up every column.',
+                    minimum=0,
+                    maximum=100,
+                    step=1,
+                    default=0,
+                    onclick='',
+                    disabled=False,
+                    required=False,
+                ),
+                BooleanParameter(
+                    name='normalize',
+                    label='normalize',
+                    description='Compare z-normalized windows, as stumpy.mass does with normalize=True',
+                    default=True,
+                    onclick='',
+                    disabled=False,
+                ),
+            ])
+
+    @staticmethod
+    def get_columns(data, feature, columns=''):
+        """Return the columns named in ``columns``, or every numeric column, always including ``feature``."""
+        names = [name.strip() for name in str(columns or '').split(',') if name.strip()]
+        if not names:
+            names = [name for name in data.columns if np.issubdtype(data[name].dtype, np.number)]
+        unknown = [name for name in names if name not in data.columns]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+        if feature not in names:
+            names.insert(0, feature)
+        return list(dict.fromkeys(names))
+
+    def do_analysis(self, data, feature, pattern=None, nb_similar_patterns=5, max_distance=0, **kwargs):
+        if pattern is None or len(pattern) == 0:
+            raise ValueError("Selected range is empty. Please select a valid interval on the chart.")
+        _, distance_profile = next(self.distance_profiles(data, feature, [pattern], **kwargs))
+        return self.select_matches(data, feature, pattern, distance_profile, nb_similar_patterns, max_distance)
+
+    def distance_profiles(self, data, feature, patterns: list, **kwargs):
+        from tseapy.tasks.pattern_recognition.mass_index import column_key, get_multi_mass_index
+
+        normalize = str(kwargs.get('normalize', 'true')).lower()
+        if normalize not in ['true', 'false']:
+            raise ValueError("normalize must be true or false.")
+        normalize = normalize == 'true'
+        dimensions = int(float(kwargs.get('dimensions', 0)))
+        if dimensions < 0:
+            raise ValueError("dimensions must be at least 0.")
+        names = self.get_columns(data, feature, kwargs.get('columns', ''))
+
+        # The index is found from the columns' keys, memoized per registry frame, and
+        # the columns are only stacked when it is built.
+        channels = [data[name].to_numpy(dtype=np.float64) for name in names]
+        index = get_multi_mass_index(channels, [column_key(data, name) for name in names])
+        starts = []
+        for pattern in patterns:
+            if not hasattr(pattern, 'index'):
+                raise ValueError(f'Algorithm "{self.name}" searches selected ranges, not pattern values.')
+            starts.append(int(data.index.searchsorted(pattern.index[0])))
+
+        def profiles():
+            for position, (start, pattern) in enumerate(zip(starts, patterns)):
+                Q = index.T[:, start:start + len(pattern)]
+                yield position, combine_profiles(index.distance_profiles(Q, index.T, normalize=normalize),
+                                                 dimensions)
+        return profiles()
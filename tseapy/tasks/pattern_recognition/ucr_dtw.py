@@ -0,0 +1,344 @@
+import numpy as np
+from numba import njit
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from stumpy import core
+
+from tseapy.tasks.pattern_recognition.matches import top_k_matches
+
+#: Standard deviation below which a window is constant and only centred, not scaled.
+_CONSTANT_STD = 1e-8
+#: Windows after which the running window statistics are recomputed from scratch.
+_STATISTICS_EPOCH = 4096
+
+
+@njit(cache=True)
+def _rolling_mean_std(T, m):
+    """
+    Mean and standard deviation of every window of ``m`` points in O(n), the mean ``inf`` for windows with missing values.
+
+    Sliding updates of the mean and of the sum of squared deviations (Welford), restarted
+    every :data:`_STATISTICS_EPOCH` windows so rounding errors cannot build up.
+    """
+    count = len(T) - m + 1
+    means = np.empty(count)
+    stds = np.empty(count)
+    missing = 0
+    for j in range(m):
+        if not np.isfinite(T[j]):
+            missing += 1
+    mean = 0.0
+    squares = 0.0
+    for i in range(count):
+        if i > 0:
+            if not np.isfinite(T[i - 1]):
+                missing -= 1
+            if not np.isfinite(T[i + m - 1]):
+                missing += 1
+        if i % _STATISTICS_EPOCH == 0:
+            mean = 0.0
+            squares = 0.0
+            for j in range(m):
+                x = T[i + j] if np.isfinite(T[i + j]) else 0.0
+                delta = x - mean
+                mean += delta / (j + 1)
+                squares += delta * (x - mean)
+        else:
+            x_out = T[i - 1] if np.isfinite(T[i - 1]) else 0.0
+            x_in = T[i + m - 1] if np.isfinite(T[i + m - 1]) else 0.0
+            previous = mean
+            mean += (x_in - x_out) / m
+            squares += (x_in - x_out) * (x_in - mean + x_out - previous)
+        means[i] = mean if missing == 0 else np.inf
+        stds[i] = np.sqrt(max(squares, 0.0) / m)
+    return means, stds
+
+
+@njit(cache=True)
+def _lb_kim(T, i, mean, std, q, bsf):
+    """LB_Kim hierarchy of the UCR suite: the first and last three points of the path, cheapest first."""
+    m = len(q)
+    x0 = (T[i] - mean) / std
+    y0 = (T[i + m - 1] - mean) / std
+    lb = (x0 - q[0]) ** 2 + (y0 - q[m - 1]) ** 2
+    if lb >= bsf or m < 6:
+        return lb
+
+    x1 = (T[i + 1] - mean) / std
+    lb += min((x1 - q[0]) ** 2, (x0 - q[1]) ** 2, (x1 - q[1]) ** 2)
+    if lb >= bsf:
+        return lb
+    y1 = (T[i + m - 2] - mean) / std
+    lb += min((y1 - q[m - 1]) ** 2, (y0 - q[m - 2]) ** 2, (y1 - q[m - 2]) ** 2)
+    if lb >= bsf:
+        return lb
+
+    x2 = (T[i + 2] - mean) / std
+    lb += min((x0 - q[2]) ** 2, (x1 - q[2]) ** 2, (x2 - q[2]) ** 2, (x2 - q[1]) ** 2, (x2 - q[0]) ** 2)
+    if lb >= bsf:
+        return lb
+    y2 = (T[i + m - 3] - mean) / std
+    lb += min((y0 - q[m - 3]) ** 2, (y1 - q[m - 3]) ** 2, (y2 - q[m - 3]) ** 2, (y2 - q[m - 2]) ** 2,
+              (y2 - q[m - 1]) ** 2)
+    return lb
+
+
+@njit(cache=True)
+def _dtw(t, q, cb, r, bsf, prev, curr):
+    """
+    Squared DTW distance of ``t`` and ``q`` within a Sakoe-Chiba band of ``r`` points.
+
+    Abandons once a row's cheapest cell plus ``cb`` (the cumulative lower bound of the
+    points still to align) reaches ``bsf``, returning that lower bound instead.
+    Returns ``(distance or lower bound, exact)``.
+
+    ``prev`` and ``curr`` hold ``m + 1`` cells: cell ``j + 1`` is column ``j`` and the
+    cells around the band are kept at ``inf``, so the inner loop has no branches.
+    """
+    m = len(q)
+    prev[:] = np.inf
+    prev[0] = 0.0
+    for i in range(m):
+        lo = max(0, i - r)
+        hi = min(m - 1, i + r)
+        curr[lo] = np.inf
+        row_min = np.inf
+        for j in range(lo, hi + 1):
+            cost = min(prev[j + 1], prev[j], curr[j]) + (t[i] - q[j]) ** 2
+            curr[j + 1] = cost
+            if cost < row_min:
+                row_min = cost
+        if hi + 2 <= m:
+            curr[hi + 2] = np.inf
+        bound = row_min + cb[i + r + 1] if i + r + 1 < m else row_min
+        if bound >= bsf:
+            return bound, False
+        prev, curr = curr, prev
+    return prev[m], True
+
+
+@njit(cache=True)
+def _candidate(T, i, mean, std, upper_T, lower_T, q, upper_q, lower_q, order, r, bsf, t, cb1, cb2, cb, prev, curr):
+    """Return ``(squared distance or lower bound, exact)`` of the window at ``i``, pruning at ``bsf``."""
+    m = len(q)
+    lb = _lb_kim(T, i, mean, std, q, bsf)
+    if lb >= bsf:
+        return lb, False
+
+    # LB_Keogh of the candidate against the query's envelope, normalized on the fly,
+    # visiting the query's largest values first as they tend to add up fastest.
+    lb_eq = 0.0
+    for jj in range(m):
+        j = order[jj]
+        x = (T[i + j] - mean) / std
+        d = 0.0
+        if x > upper_q[j]:
+            d = (x - upper_q[j]) ** 2
+        elif x < lower_q[j]:
+            d = (x - lower_q[j]) ** 2
+        cb1[j] = d
+        lb_eq += d
+        if lb_eq >= bsf:
+            return max(lb, lb_eq), False
+
+    # LB_Keogh of the query against the candidate's envelope.
+    lb_ec = 0.0
+    for jj in range(m):
+        j = order[jj]
+        u = (upper_T[i + j] - mean) / std
+        lo = (lower_T[i + j] - mean) / std
+        d = 0.0
+        if q[j] > u:
+            d = (q[j] - u) ** 2
+        elif q[j] < lo:
+            d = (q[j] - lo) ** 2
+        cb2[j] = d
+        lb_ec += d
+        if lb_ec >= bsf:
+            return max(lb, lb_eq, lb_ec), False
+
+    tight = cb1 if lb_eq > lb_ec else cb2
+    total = 0.0
+    for j in range(m - 1, -1, -1):
+        total += tight[j]
+        cb[j] = total
+    for j in range(m):
+        t[j] = (T[i + j] - mean) / std
+    return _dtw(t, q, cb, r, bsf, prev, curr)
+
+
+@njit(cache=True)
+def _scan(T, M_T, S_T, upper_T, lower_T, q, upper_q, lower_q, order, r, k, exclusion_zone, query_index,
+          threshold, profile, lower):
+    """
+    Visit every window of ``T`` once, keeping the ``k`` best non-overlapping distances seen as the pruning bound.
+
+    Writes exact squared distances to ``profile`` and, for pruned windows, the lower
+    bound that ruled them out to ``lower``.
+    """
+    m = len(q)
+    t = np.empty(m)
+    cb1 = np.empty(m)
+    cb2 = np.empty(m)
+    cb = np.empty(m)
+    prev = np.empty(m + 1)
+    curr = np.empty(m + 1)
+    best = np.full(k, np.inf)
+    best_positions = np.full(k, -1)
+    last_position = -exclusion_zone
+    last_distance = np.inf
+    for i in range(len(profile)):
+        if np.isinf(M_T[i]) or (query_index >= 0 and abs(i - query_index) < exclusion_zone):
+            continue
+        bsf = min(threshold, best[k - 1])
+        value, exact = _candidate(T, i, M_T[i], S_T[i], upper_T, lower_T, q, upper_q, lower_q, order, r, bsf,
+                                  t, cb1, cb2, cb, prev, curr)
+        lower[i] = value
+        if not exact:
+            continue
+        profile[i] = value
+        if value >= best[k - 1]:
+            continue
+        # Windows are visited left to right, so a new window can only overlap the
+        # last one kept; the closer of the two stays.
+        if i - last_position < exclusion_zone:
+            if value >= last_distance:
+                continue
+            for slot in range(k):
+                if best_positions[slot] == last_position:
+                    for s in range(slot, k - 1):
+                        best[s] = best[s + 1]
+                        best_positions[s] = best_positions[s + 1]
+                    best[k - 1] = np.inf
+                    best_positions[k - 1] = -1
+                    break
+        slot = k - 1
+        while slot > 0 and best[slot - 1] > value:
+            best[slot] = best[slot - 1]
+            best_positions[slot] = best_positions[slot - 1]
+            slot -= 1
+        best[slot] = value
+        best_positions[slot] = i
+        last_position = i
+        last_distance = value
+
+
+@njit(cache=True)
+def _refine(positions, T, M_T, S_T, upper_T, lower_T, q, upper_q, lower_q, order, r, bsf, profile, lower):
+    """Evaluate the windows at ``positions`` again, pruning at the fixed bound ``bsf``."""
+    m = len(q)
+    t = np.empty(m)
+    cb1 = np.empty(m)
+    cb2 = np.empty(m)
+    cb = np.empty(m)
+    prev = np.empty(m + 1)
+    curr = np.empty(m + 1)
+    for i in positions:
+        value, exact = _candidate(T, i, M_T[i], S_T[i], upper_T, lower_T, q, upper_q, lower_q, order, r, bsf,
+                                  t, cb1, cb2, cb, prev, curr)
+        lower[i] = value
+        if exact:
+            profile[i] = value
+
+
+def _envelope(values: np.ndarray, r: int):
+    """Running maximum and minimum of ``values`` over ``[j - r, j + r]``."""
+    size = 2 * r + 1
+    return maximum_filter1d(values, size, mode="nearest"), minimum_filter1d(values, size, mode="nearest")
+
+
+def _euclidean_profile(q, T, M_T, S_T, stds, normalize: bool, key: str | None = None):
+    """
+    Squared Euclidean distances of ``q`` (normalized like the windows) to every window, by FFT.
+
+    The diagonal is inside every Sakoe-Chiba band, so these bound the DTW distances from above.
+    """
+    from tseapy.tasks.pattern_recognition.mass_index import get_mass_index
+
+    m = len(q)
+    QT = get_mass_index(T, key).sliding_dot_products(q[np.newaxis, :])[0]
+    if normalize:
+        with np.errstate(invalid="ignore"):
+            squared = np.dot(q, q) + m * (stds / S_T) ** 2 - 2 * (QT - M_T * q.sum()) / S_T
+    else:
+        squares = np.concatenate(([0.0], np.cumsum(np.where(np.isfinite(T), T, 0.0) ** 2)))
+        squared = np.dot(q, q) + squares[m:] - squares[:-m] - 2 * QT
+    squared[np.isinf(M_T)] = np.inf
+    return np.maximum(squared, 0.0)
+
+
+def dtw_search(Q, T, k: int, window: float = 0.1, normalize: bool = True, exclusion_zone: int | None = None,
+               query_index: int | None = None, max_distance: float | None = None, key: str | None = None) -> np.ndarray:
+    """
+    Return a DTW distance profile of ``Q`` against ``T`` with every window that cannot be a match left at ``inf``.
+
+    The profile holds exact distances for at least the windows that
+    :func:`~tseapy.tasks.pattern_recognition.matches.top_k_matches` picks with the
+    same ``k``, ``exclusion_zone``, ``query_index`` and ``max_distance``; its
+    selection is the one a full DTW scan would give. Windows are compared after
+    z-normalization (with ``normalize``) under a Sakoe-Chiba band of
+    ``window * len(Q)`` points, and pruned as in the UCR suite: LB_Kim, LB_Keogh
+    against the query's and the window's envelopes, then DTW abandoned once it
+    exceeds the ``k`` best distances found so far. Windows whose lower bound turns
+    out to be at most the final ``k``-th distance (or, with fewer than ``k`` matches,
+    within ``max_distance``) are evaluated again. ``key`` is the
+    :func:`~tseapy.tasks.pattern_recognition.mass_index.series_key` of ``T``, if known.
+    """
+    Q = np.asarray(Q, dtype=np.float64)
+    T = np.asarray(T, dtype=np.float64)
+    m = len(Q)
+    if m > len(T):
+        raise ValueError(f"The pattern ({m} points) is longer than the series ({len(T)} points).")
+    core.check_window_size(m, max_size=len(T))
+    if not 0 <= window <= 1:
+        raise ValueError("window must be between 0 and 1.")
+    if k < 1:
+        raise ValueError("At least one match must be requested.")
+    r = int(np.floor(window * m))
+    exclusion_zone = max(int(exclusion_zone if exclusion_zone is not None else m), 1)
+    query_index = -1 if query_index is None else int(query_index)
+    # Windows are pruned once their bound reaches the limit, so the limit is nudged up
+    # to keep windows at exactly ``max_distance``, as top_k_matches does: every squared
+    # distance whose square root rounds to at most ``max_distance`` stays below it.
+    limit = np.inf if max_distance is None else np.nextafter(float(max_distance), np.inf) ** 2
+
+    # Windows with missing values get an infinite mean and are skipped, as in stumpy.mass.
+    M_T, stds = _rolling_mean_std(T, m)
+    if normalize:
+        S_T = np.where(stds < _CONSTANT_STD, 1.0, stds)
+    else:
+        M_T = np.where(np.isinf(M_T), np.inf, 0.0)
+        S_T = np.ones_like(stds)
+    profile = np.full(len(M_T), np.inf)
+    if not np.all(np.isfinite(Q)):
+        return profile
+    q = Q
+    if normalize:
+        std = Q.std()
+        q = (Q - Q.mean()) / (std if std >= _CONSTANT_STD else 1.0)
+    upper_q, lower_q = _envelope(q, r)
+    upper_T, lower_T = _envelope(np.where(np.isfinite(T), T, 0.0), r)
+    order = np.argsort(-np.abs(q), kind="stable")
+    lower = np.full(len(M_T), np.inf)
+    excluded = [] if query_index < 0 else [query_index]
+
+    # The best Euclidean matches give k non-overlapping windows whose DTW distances
+    # make pruning tight from the first window on. They only guide pruning: the
+    # greedy selection can pick windows that rule out two of them, so its k-th
+    # distance may end up above this bound.
+    seeds = top_k_matches(_euclidean_profile(q, T, M_T, S_T, stds, normalize, key), k, exclusion_zone, excluded=excluded)
+    _refine(seeds, T, M_T, S_T, upper_T, lower_T, q, upper_q, lower_q, order, r, np.inf, profile, lower)
+    threshold = limit
+    if len(seeds) == k:
+        threshold = min(limit, np.nextafter(profile[seeds].max(), np.inf))
+    _scan(T, M_T, S_T, upper_T, lower_T, q, upper_q, lower_q, order, r, k, exclusion_zone, query_index,
+          threshold, profile, lower)
+    while True:
+        starts = top_k_matches(profile, k, exclusion_zone, excluded=excluded,
+                               max_distance=None if max_distance is None else limit)
+        bound = np.nextafter(profile[starts[-1]], np.inf) if len(starts) == k else limit
+        pending = np.flatnonzero(np.isinf(profile) & (lower < bound))
+        if not len(pending):
+            break
+        # Pruned again, these windows get a lower bound of at least the current bound.
+        _refine(pending, T, M_T, S_T, upper_T, lower_T, q, upper_q, lower_q, order, r, bound, profile, lower)
+    return np.sqrt(profile)
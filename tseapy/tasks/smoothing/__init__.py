@@ -23,7 +23,7 @@ class Smoothing(Task):
         backend = self.analysis_backend_factory.get_analysis_backend(algo=algo)
         smoothed = backend.do_analysis(data, feature, **kwargs)
         fig = px.line(x=data.index, y=data[feature], markers=True)
-        fig.add_scatter(x=data.index, y=smoothed, name='smoothed')
+        fig.add_scatter(x=smoothed.index, y=smoothed, name='smoothed')
         fig.update_yaxes(title={'text': feature})
         return fig
 
@@ -31,4 +31,4 @@ class MovingAverage(SmoothingBackend):
 
     def do_analysis(self, data: pd.DataFrame, feature: str, **kwargs):
         window = int(kwargs['window'])
-        return data[feature].rolling(window=window, min_periods=1).mean()
+        return data[feature].dropna().rolling(window=window, min_periods=1).mean()
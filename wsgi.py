@@ -1 +1,3 @@
-from app import app
+from app import app, tasks, warmup
+
+warmup.start(tasks)